@@ -6,11 +6,40 @@
 
 本程序受版权法保护，未经授权禁止复制、修改、分发或用于商业用途。
 """
-import pygame
-from src.game import Game
+import time
+
+START_TIME = time.perf_counter()  # 启动时间线的起点（导入游戏模块之前）
+
+import argparse
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="果香蛇踪")
+    parser.add_argument('--soak', action='store_true', help="运行自动驾驶压力测试")
+    parser.add_argument('--mode', choices=['infinite', 'level'], default='infinite', help="压力测试的游戏模式")
+    parser.add_argument('--minutes', type=float, default=60.0, help="压力测试时长（分钟）")
+    parser.add_argument('--report-interval', type=float, default=60.0, help="统计间隔（秒）")
+    parser.add_argument('--level', default='level_01', help="闯关模式的起始关卡")
+    parser.add_argument('--difficulty', default=None, help="无尽模式的难度名称")
+    parser.add_argument('--headless', action='store_true', help="不显示窗口、不输出声音")
+    parser.add_argument('--report', default=None, help="压力测试结果 JSON 的保存路径")
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+    if args.soak:
+        from src.soak_test import run_soak_test
+        run_soak_test(args.mode, args.minutes, args.report_interval, args.level, args.difficulty,
+                      args.headless, args.report)
+        return
+
+    from src.utils.startup_timeline import get_startup_timeline
+    timeline = get_startup_timeline()
+    timeline.begin(START_TIME)
+    from src.game import Game
+    timeline.mark("import")
     game = Game()
     game.run()
 
@@ -0,0 +1,92 @@
+"""
+自动驾驶 - 沿寻路距离场驾驶蛇吃食物
+输出与 pygame.key.get_pressed() 相同用法的按键状态，直接交给 Snake.handle_input，
+用于主菜单的演示模式和长时间无人值守的压力测试
+"""
+import math
+from typing import Iterable, Optional, Tuple
+import pygame
+
+
+class AutopilotKeys:
+    """模拟的按键状态 - 只有自动驾驶选择的方向键为按下状态"""
+
+    def __init__(self, pressed: Iterable[int] = ()):
+        """
+        :param pressed: 按下的键（pygame 键值）
+        """
+        self._pressed = frozenset(pressed)
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self._pressed
+
+
+class Autopilot:
+    """自动驾驶 - 每帧选择一个路点，按方向键转向路点"""
+
+    DEADZONE = 4.0  # 路点与蛇头在某个轴上的距离小于该值时不按这个轴的方向键（像素）
+    LOOKAHEAD_STEPS = 2  # 沿距离场向前看的格子数，转弯更平滑
+
+    def __init__(self):
+        self.last_step: Optional[Tuple[float, float]] = None  # 最近一次的下一步（提示箭头复用）
+        self.planned_frames = 0  # 找到可达食物的帧数
+        self.fallback_frames = 0  # 没有可达食物、只能躲避的帧数
+
+    def get_keys(self, pathfinder, snake, targets: Iterable[Tuple[float, float]]) -> AutopilotKeys:
+        """
+        计算本帧的按键状态
+        :param pathfinder: 寻路网格（GridPathfinder）
+        :param snake: 蛇
+        :param targets: 目标位置（食物位置）
+        :return: 交给 Snake.handle_input 的按键状态
+        """
+        head = (snake.position[0], snake.position[1])
+        pathfinder.update(head, snake.body_segments, targets)
+        step = pathfinder.next_step(head)
+        self.last_step = step
+
+        if step is None:
+            self.fallback_frames += 1
+            waypoint = self._escape_step(pathfinder, head, snake.angle)
+            if waypoint is None:
+                return AutopilotKeys()
+        else:
+            self.planned_frames += 1
+            waypoint = step
+            for _ in range(self.LOOKAHEAD_STEPS - 1):
+                following = pathfinder.next_step(waypoint)
+                if following is None:
+                    break
+                waypoint = following
+        return self._keys_towards(head, waypoint)
+
+    def _escape_step(self, pathfinder, head: Tuple[float, float], angle: float) -> Optional[Tuple[float, float]]:
+        """没有可达食物时选择一个空的相邻格子，优先保持当前方向"""
+        grid_size = pathfinder.grid_size
+        angle_rad = math.radians(angle)
+        heading = (math.cos(angle_rad), math.sin(angle_rad))
+        best = None
+        best_score = -2.0
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            position = (head[0] + dx * grid_size, head[1] + dy * grid_size)
+            if pathfinder.is_blocked(position):
+                continue
+            score = dx * heading[0] + dy * heading[1]
+            if score > best_score:
+                best, best_score = position, score
+        return best
+
+    def _keys_towards(self, head: Tuple[float, float], waypoint: Tuple[float, float]) -> AutopilotKeys:
+        """按下朝向路点的方向键（可以同时按下两个方向键斜向移动）"""
+        dx = waypoint[0] - head[0]
+        dy = waypoint[1] - head[1]
+        pressed = []
+        if dx < -self.DEADZONE:
+            pressed.append(pygame.K_LEFT)
+        elif dx > self.DEADZONE:
+            pressed.append(pygame.K_RIGHT)
+        if dy < -self.DEADZONE:
+            pressed.append(pygame.K_UP)
+        elif dy > self.DEADZONE:
+            pressed.append(pygame.K_DOWN)
+        return AutopilotKeys(pressed)
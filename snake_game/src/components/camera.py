@@ -0,0 +1,81 @@
+"""
+摄像机 - 世界坐标与屏幕坐标的转换
+地图大于屏幕时跟随蛇头滚动，地图不大于屏幕时固定在原点
+"""
+from typing import Tuple
+import pygame
+
+
+class Camera:
+    """摄像机 - 视口在世界中的位置"""
+
+    def __init__(self, view_width: int, view_height: int, world_width: int = None, world_height: int = None):
+        """
+        创建摄像机
+        :param view_width: 视口宽度（屏幕宽度）
+        :param view_height: 视口高度（屏幕高度）
+        :param world_width: 世界宽度，默认与视口相同
+        :param world_height: 世界高度，默认与视口相同
+        """
+        self.view_width = view_width
+        self.view_height = view_height
+        self.world_width = view_width
+        self.world_height = view_height
+        self.x = 0
+        self.y = 0
+        self.set_world_size(world_width or view_width, world_height or view_height)
+
+    def set_world_size(self, world_width: int, world_height: int) -> None:
+        """
+        设置世界大小（不小于视口）
+        :param world_width: 世界宽度
+        :param world_height: 世界高度
+        """
+        self.world_width = max(int(world_width), self.view_width)
+        self.world_height = max(int(world_height), self.view_height)
+        self._clamp()
+
+    @property
+    def is_scrolling(self) -> bool:
+        """世界是否大于视口（需要滚动）"""
+        return self.world_width > self.view_width or self.world_height > self.view_height
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        """视口左上角的世界坐标，绘制时从世界坐标中减去"""
+        return (self.x, self.y)
+
+    @property
+    def view_rect(self) -> pygame.Rect:
+        """视口覆盖的世界区域"""
+        return pygame.Rect(self.x, self.y, self.view_width, self.view_height)
+
+    def center_on(self, position: Tuple[float, float]) -> None:
+        """
+        将视口中心移动到指定位置（不超出世界边界）
+        :param position: 世界坐标
+        """
+        self.x = int(position[0]) - self.view_width // 2
+        self.y = int(position[1]) - self.view_height // 2
+        self._clamp()
+
+    def world_to_screen(self, position: Tuple[float, float]) -> Tuple[int, int]:
+        """
+        世界坐标转换为屏幕坐标
+        :param position: 世界坐标
+        :return: 屏幕坐标
+        """
+        return (int(position[0]) - self.x, int(position[1]) - self.y)
+
+    def screen_to_world(self, position: Tuple[float, float]) -> Tuple[int, int]:
+        """
+        屏幕坐标转换为世界坐标
+        :param position: 屏幕坐标
+        :return: 世界坐标
+        """
+        return (int(position[0]) + self.x, int(position[1]) + self.y)
+
+    def _clamp(self) -> None:
+        """限制视口在世界范围内"""
+        self.x = max(0, min(self.x, self.world_width - self.view_width))
+        self.y = max(0, min(self.y, self.world_height - self.view_height))
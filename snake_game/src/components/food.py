@@ -6,330 +6,404 @@
 
 本程序受版权法保护，未经授权禁止复制、修改、分发或用于商业用途。
 """
-import os
-import random
 import pygame
-import math
-from typing import Tuple, List, Optional
-from ..utils import tools
+import numpy as np
+from typing import Dict, List, Optional, Set, Tuple, Union
 from ..configs.config import Config
 from ..configs.game_balance import GameBalance
 from ..utils.image_manager import get_image_manager
+from ..utils.connectivity import FreeSpaceComponents
+from ..utils.logger import get_logger
 
+logger = get_logger(__name__)
 
-class Food(pygame.sprite.Sprite):
-    """食物类 - 针对顺滑移动优化"""
+
+class FoodManager:
+    """
+    食物管理器 - 以类型化数组保存全部食物，支持同时存在大量食物
+    每个食物槽位保存位置、类型、碰撞半径和分数；蛇头只检查空间索引中附近格子的食物，
+    同一帧吃掉的多个食物一次性批量重新生成
+    """
 
     # 类级别的调试开关
     DEBUG_COLLISION = False
 
-    def __init__(self, food_name: str = None, size: int = None, wall_manager=None):
-        pygame.sprite.Sprite.__init__(self)
-
-        # 随机选择食物类型或使用指定的类型
-        self.food_name = food_name if food_name else GameBalance.get_random_food_type()
-
-        # 获取食物配置
-        food_config = GameBalance.get_food_config(self.food_name)
+    # 各食物类型共享的图片缓存：类型名称 -> 图片
+    _type_images: Dict[str, pygame.Surface] = {}
 
-        self.size = size if size is not None else food_config["size"]
+    def __init__(self, max_food_count: int = 1, wall_manager=None, world_size: Optional[Tuple[int, int]] = None):
+        self.max_food_count = max(int(max_food_count), 0)
+        self.score = 0
+        self.wall_manager = wall_manager
         self.config = Config.get_instance()
-        self.wall_manager = wall_manager  # 墙壁管理器实例
-
-        # 食物属性（需要在位置生成前设置）
-        self.score_value = food_config["score_value"]
-        self.display_name = food_config["name"]
-        self.is_eaten = False
-
-        # 碰撞检测半径（圆形碰撞，更适合顺滑移动）
-        # 使用稍微大一点的碰撞半径，提高碰撞检测的容错性
-        self.collision_radius = self.size * 0.5  # 比图片半径稍大
-
-        # 加载食物图片
-        self._load_image()
-
-        # 初始化位置
-        self.rect = self.image.get_rect()
-        self.position = [0.0, 0.0]  # 使用浮点坐标支持顺滑移动
-        self.randomize_position()
-
-        print(
-            f"食物 {self.display_name}({self.food_name}) 创建完成，尺寸: {self.image.get_size()}，分数: {self.score_value}")
-
-    def _load_image(self) -> None:
-        """加载并处理食物图片"""
-        manager = get_image_manager()
-        # 从管理器获取食物图片（图片应该已经在游戏初始化时预加载了）
-        self.image = manager.get_food_image(self.food_name, self.size)
-
-    def randomize_position(self, avoid_positions: Optional[List[Tuple[float, float]]] = None) -> None:
-        """
-        随机生成食物位置 - 适配顺滑移动，不再依赖网格
-        :param avoid_positions: 要避免的位置列表（蛇的身体位置和墙壁位置）
-        """
-        if avoid_positions is None:
-            avoid_positions = []
-
-        max_attempts = 100
-        margin = GameBalance.FOOD_GENERATION_PIXEL
+        self.world_size = world_size or (self.config.SCREEN_W, self.config.SCREEN_H)
+        self._rng = np.random.default_rng()
+
+        # 食物类型表（按 FOOD_TYPES 顺序）：按类型预先算好分数、半径、图片，
+        # 类型选择使用缓存的别名表，生成食物时不再查询配置和图片管理器
+        self.type_names, self.type_table = GameBalance.get_food_type_table()
+        type_configs = [GameBalance.FOOD_TYPES[name] for name in self.type_names]
+        self.type_display_names = [config["name"] for config in type_configs]
+        self.type_scores = np.array([config["score_value"] for config in type_configs], dtype=np.int32)
+        self.type_radii = np.array([config["size"] * 0.5 for config in type_configs], dtype=np.float64)
+        self.max_radius = float(self.type_radii.max())
+        self.type_images = [self.get_type_image(name, config["size"])
+                            for name, config in zip(self.type_names, type_configs)]
+        self.type_half_sizes = [(image.get_width() // 2, image.get_height() // 2) for image in self.type_images]
+
+        # 食物槽位数组
+        count = self.max_food_count
+        self.positions = np.zeros((count, 2), dtype=np.float64)
+        self.types = np.zeros(count, dtype=np.int16)
+        self.radii = np.zeros(count, dtype=np.float64)
+        self.scores = np.zeros(count, dtype=np.int32)
+        self.active = np.zeros(count, dtype=bool)
+
+        # 空间索引：格子坐标 -> 该格内的食物槽位
+        self.cell_size = GameBalance.FOOD_INDEX_CELL_SIZE
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._slot_cells: List[Optional[Tuple[int, int]]] = [None] * count
+
+        # 空地连通性：食物只生成在蛇头能到达的区域内（首次生成食物时构建）
+        self.connectivity: Optional[FreeSpaceComponents] = None
+
+        # 生成食物用的暂存数组（候选位置、半径、安全距离、距离和检查结果），每轮采样原地填充；
+        # 候选位置到蛇身的距离矩阵随蛇变长倍增扩容
+        capacity = max(count, 1) * GameBalance.FOOD_SPAWN_OVERSAMPLE
+        self._spawn_points = np.empty((capacity, 2), dtype=np.float64)
+        self._spawn_radii = np.empty(capacity, dtype=np.float64)
+        self._spawn_safe = np.empty(capacity, dtype=np.float64)
+        self._spawn_safe_squared = np.empty(capacity, dtype=np.float64)
+        self._spawn_scratch = np.empty((2, capacity), dtype=np.float64)
+        self._spawn_valid = np.empty(capacity, dtype=bool)
+        self._spawn_flags = np.empty(capacity, dtype=bool)
+        self._body_scratch = np.empty((2, capacity * 64), dtype=np.float64)
 
-        # 计算有效生成区域（考虑食物大小和边距）
-        min_x = margin + self.collision_radius
-        max_x = self.config.SCREEN_W - margin - self.collision_radius
-        min_y = margin + self.collision_radius
-        max_y = self.config.SCREEN_H - margin - self.collision_radius
-
-        for _ in range(max_attempts):
-            # 随机生成浮点坐标位置
-            x = random.uniform(min_x, max_x)
-            y = random.uniform(min_y, max_y)
-            position = (x, y)
-
-            # 检查是否与避免位置冲突（包括蛇身体和墙壁）
-            if not self._is_position_occupied(position, avoid_positions):
-                self.position = [x, y]
-                self.rect.center = (int(x), int(y))
-                print(f"食物生成在位置: ({x:.1f}, {y:.1f}) - 安全位置")
-                return
+        # 创建初始食物
+        self._respawn(np.arange(count))
 
-        # 如果找不到合适位置，使用屏幕中心（确保中心位置安全）
-        center_x = self.config.SCREEN_W / 2
-        center_y = self.config.SCREEN_H / 2
-        if self._is_position_away_from_walls((center_x, center_y)):
-            self.position = [center_x, center_y]
-            self.rect.center = (int(center_x), int(center_y))
-            print(f"警告: 无法找到合适的食物位置，使用屏幕中心: ({center_x}, {center_y})")
-        else:
-            # 如果中心也不安全，强制使用安全位置
-            safe_x = max(min_x, min(max_x, center_x))
-            safe_y = max(min_y, min(max_y, center_y))
-            self.position = [safe_x, safe_y]
-            self.rect.center = (int(safe_x), int(safe_y))
-            print(f"警告: 强制使用安全位置: ({safe_x:.1f}, {safe_y:.1f})")
-
-    def _is_position_occupied(self, position: Tuple[float, float], avoid_positions: List[Tuple[float, float]]) -> bool:
+    @classmethod
+    def get_type_image(cls, food_name: str, size: int) -> pygame.Surface:
         """
-        检查位置是否被占用 - 使用圆形碰撞检测
-        :param position: 要检查的位置
-        :param avoid_positions: 要避免的位置列表（包含蛇身体和墙壁位置）
-        :return: 是否被占用
+        获取食物类型的共享图片（每种类型只向图片管理器查询一次）
+        :param food_name: 食物类型名称
+        :param size: 食物尺寸，缺少图片时用于绘制纯色圆形
+        :return: 食物图片
         """
-        # 使用更合理的安全距离，确保食物不会生成在蛇身上或墙壁上
-        safe_distance = GameBalance.SMOOTH_COLLISION_RADIUS + self.collision_radius + 10
-
-        # 检查避免位置列表（蛇身体和传入的墙壁位置）
-        for avoid_pos in avoid_positions:
-            distance = self._calculate_distance(position, avoid_pos)
-            if distance < safe_distance:
-                return True
-        
-        # 额外检查墙壁管理器中的墙壁位置
-        if self.wall_manager:
-            wall_positions = self.wall_manager.get_wall_positions()
-            for wall_pos in wall_positions:
-                distance = self._calculate_distance(position, wall_pos)
-                if distance < safe_distance:
-                    return True
-        
-        # 检查四周墙壁距离
-        return not self._is_position_away_from_walls(position)
-
-    def _is_position_away_from_walls(self, position: Tuple[float, float]) -> bool:
+        image = cls._type_images.get(food_name)
+        if image is None:
+            # 从管理器获取食物图片（图片应该已经在游戏初始化时预加载了）
+            image = get_image_manager().get_food_image(food_name, size)
+            if image is None:
+                image = pygame.Surface((size, size), pygame.SRCALPHA)
+                pygame.draw.circle(image, (220, 60, 60), (size // 2, size // 2), size // 2)
+            cls._type_images[food_name] = image
+        return image
+
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        """坐标所在的索引格子"""
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def _index_slot(self, slot: int) -> None:
+        """将槽位登记到空间索引（先移除旧位置）"""
+        self._unindex_slot(slot)
+        cell = self._cell_of(self.positions[slot, 0], self.positions[slot, 1])
+        self._cells.setdefault(cell, set()).add(slot)
+        self._slot_cells[slot] = cell
+
+    def _unindex_slot(self, slot: int) -> None:
+        """从空间索引中移除槽位"""
+        cell = self._slot_cells[slot]
+        if cell is None:
+            return
+        slots = self._cells.get(cell)
+        if slots is not None:
+            slots.discard(slot)
+            if not slots:
+                del self._cells[cell]
+        self._slot_cells[slot] = None
+
+    def query(self, position: Tuple[float, float], radius: float) -> List[int]:
         """
-        检查位置是否离墙壁足够远
-        :param position: 要检查的位置
-        :return: 是否离墙壁安全距离
+        获取可能与圆相交的食物槽位（只检查覆盖该圆的索引格子）
+        :param position: 圆心
+        :param radius: 半径（应包含食物自身的碰撞半径）
+        :return: 候选槽位列表
         """
         x, y = position
-        margin = GameBalance.FOOD_GENERATION_PIXEL
-        
-        # 检查距离四个墙壁的距离
-        distance_to_left = x
-        distance_to_right = self.config.SCREEN_W - x
-        distance_to_top = y
-        distance_to_bottom = self.config.SCREEN_H - y
-        
-        # 确保距离所有墙壁都大于边距
-        min_distance = min(distance_to_left, distance_to_right, distance_to_top, distance_to_bottom)
-        
-        # 返回是否满足最小安全距离要求
-        return min_distance >= margin
-
-    def _calculate_distance(self, pos1: Tuple[float, float], pos2: Tuple[float, float]) -> float:
-        """计算两点之间的距离"""
-        dx = pos1[0] - pos2[0]
-        dy = pos1[1] - pos2[1]
-        return math.sqrt(dx * dx + dy * dy)
-
-    def check_collision(self, snake_head_pos: Tuple[float, float], snake_head_radius: float = None) -> bool:
+        col0, row0 = self._cell_of(x - radius, y - radius)
+        col1, row1 = self._cell_of(x + radius, y + radius)
+        found = []
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                slots = self._cells.get((col, row))
+                if slots:
+                    found.extend(slots)
+        return found
+
+    def _choose_types(self, count: int) -> np.ndarray:
+        """按 FOOD_TYPES 的权重批量随机选择食物类型（别名表查表）"""
+        return self.type_table.sample_many(self._rng, count)
+
+    def _get_connectivity(self) -> Optional[FreeSpaceComponents]:
+        """获取空地连通性（没有墙管理器时为None）"""
+        if self.connectivity is None and self.wall_manager is not None:
+            self.connectivity = FreeSpaceComponents(self.wall_manager, self.world_size)
+        return self.connectivity
+
+    def _body_distance_buffers(self, rows: int, cols: int) -> Tuple[np.ndarray, np.ndarray]:
         """
-        检查是否与蛇头发生碰撞 - 使用圆形碰撞检测
-        :param snake_head_pos: 蛇头的中心位置
-        :param snake_head_radius: 蛇头的碰撞半径
-        :return: 是否发生碰撞
+        候选位置到蛇身距离矩阵的两块暂存区（容量不足时倍增扩容）
+        :param rows: 候选位置数量
+        :param cols: 蛇身位置数量
+        :return: 两个 (rows, cols) 的可写视图
         """
-        if snake_head_radius is None:
-            snake_head_radius = GameBalance.SMOOTH_COLLISION_RADIUS
-
-        distance = self._calculate_distance(self.position, snake_head_pos)
-        collision_threshold = self.collision_radius + snake_head_radius
-
-        # 调试信息
-        is_collision = distance <= collision_threshold
-        if Food.DEBUG_COLLISION:
-            if is_collision:
-                print(f"✅ 碰撞检测成功: 距离={distance:.2f}, 阈值={collision_threshold:.2f}")
-                print(
-                    f"   食物位置=({self.position[0]:.1f}, {self.position[1]:.1f}), 蛇头位置=({snake_head_pos[0]:.1f}, {snake_head_pos[1]:.1f})")
-            else:
-                # 只在距离很近但没有碰撞时输出调试信息
-                if distance < collision_threshold * 1.5:
-                    print(f"⚠️  接近但未碰撞: 距离={distance:.2f}, 阈值={collision_threshold:.2f}")
-
-        return is_collision
-
-    def get_eaten(self) -> int:
+        needed = rows * cols
+        if needed > self._body_scratch.shape[1]:
+            capacity = self._body_scratch.shape[1] * 2
+            while capacity < needed:
+                capacity *= 2
+            self._body_scratch = np.empty((2, capacity), dtype=np.float64)
+        return (self._body_scratch[0, :needed].reshape(rows, cols),
+                self._body_scratch[1, :needed].reshape(rows, cols))
+
+    def _valid_positions(self, points: np.ndarray, radii: np.ndarray,
+                         body_positions: Optional[np.ndarray] = None,
+                         head_position: Optional[Tuple[float, float]] = None) -> np.ndarray:
         """
-        食物被吃掉
-        :return: 获得的分数
+        批量检查候选位置：避开蛇头、蛇身和墙壁，并且在蛇头能到达的区域内
+        :param points: (K, 2) 候选位置（生成食物的暂存数组视图）
+        :param radii: (K,) 候选食物的碰撞半径
+        :param body_positions: (M, 2) 蛇身位置（直接使用蛇身体段的只读视图，不复制）
+        :param head_position: 蛇头位置
+        :return: (K,) bool 数组（暂存数组视图，下一轮采样前有效），可用的位置为True
         """
-        self.is_eaten = True
-        return self.score_value
-
-    def reset(self, avoid_positions: Optional[List[Tuple[int, int]]] = None) -> None:
-        """
-        重置食物状态，包括重新随机选择食物类型
-        :param avoid_positions: 要避免的位置列表
-        """
-        # 重新随机选择食物类型
-        self.food_name = GameBalance.get_random_food_type()
-        food_config = GameBalance.get_food_config(self.food_name)
-
-        # 更新食物属性
-        self.size = food_config["size"]
-        self.score_value = food_config["score_value"]
-        self.display_name = food_config["name"]
-
-        # 重新加载图片
-        self._load_image()
-
-        # 重置状态和位置
-        self.is_eaten = False
-        self.collision_radius = self.size * 0.5
-        self.rect = self.image.get_rect()
-        self.randomize_position(avoid_positions)
-
-        print(
-            f"食物重置为 {self.display_name}({self.food_name})，尺寸: {self.image.get_size()}，分数: {self.score_value}")
-
-    def set_wall_manager(self, wall_manager) -> None:
+        count = len(points)
+        safe_distance = np.add(radii, GameBalance.SMOOTH_COLLISION_RADIUS + 10, out=self._spawn_safe[:count])
+        safe_squared = np.multiply(safe_distance, safe_distance, out=self._spawn_safe_squared[:count])
+        valid = self._spawn_valid[:count]
+        valid.fill(True)
+        flags = self._spawn_flags[:count]
+        dx, dy = self._spawn_scratch[0, :count], self._spawn_scratch[1, :count]
+
+        if head_position is not None:
+            np.subtract(points[:, 0], head_position[0], out=dx)
+            np.subtract(points[:, 1], head_position[1], out=dy)
+            dx *= dx
+            dy *= dy
+            dx += dy
+            valid &= np.greater_equal(dx, safe_squared, out=flags)
+
+        if body_positions is not None and len(body_positions):
+            body_dx, body_dy = self._body_distance_buffers(count, len(body_positions))
+            np.subtract(points[:, 0, None], body_positions[None, :, 0], out=body_dx)
+            np.subtract(points[:, 1, None], body_positions[None, :, 1], out=body_dy)
+            body_dx *= body_dx
+            body_dy *= body_dy
+            body_dx += body_dy
+            np.min(body_dx, axis=1, out=dx)
+            valid &= np.greater_equal(dx, safe_squared, out=flags)
+
+        if self.wall_manager is not None:
+            valid &= ~self.wall_manager.near_wall_mask(points, safe_distance)
+
+        connectivity = self._get_connectivity()
+        if connectivity is not None and valid.any():
+            valid &= connectivity.reachable_mask(points)
+        return valid
+
+    def _overlaps_food(self, position: np.ndarray, radius: float) -> bool:
+        """位置是否与已存在的食物重叠（通过空间索引只检查附近的食物）"""
+        reach = radius + self.max_radius
+        nearby = self.query((position[0], position[1]), reach)
+        if not nearby:
+            return False
+        slots = np.array(nearby, dtype=np.intp)
+        dx = self.positions[slots, 0] - position[0]
+        dy = self.positions[slots, 1] - position[1]
+        gap = self.radii[slots] + radius
+        return bool(np.any(dx * dx + dy * dy < gap * gap))
+
+    def _respawn(self, slots: np.ndarray, body_positions: Optional[np.ndarray] = None,
+                 head_position: Optional[Tuple[float, float]] = None) -> None:
         """
-        设置墙壁管理器实例
-        :param wall_manager: 墙壁管理器实例
+        批量重新生成食物（槽位原地复用，重新选择类型和位置）
+        :param slots: 要重新生成的槽位
+        :param body_positions: (M, 2) 要避开的蛇身位置，None 表示不避让
+        :param head_position: 要避开的蛇头位置
         """
-        self.wall_manager = wall_manager
+        slots = np.asarray(slots, dtype=np.intp)
+        if len(slots) == 0:
+            return
 
-    def get_position(self) -> Tuple[float, float]:
-        """获取食物中心位置（浮点坐标）"""
-        return (self.position[0], self.position[1])
+        self.active[slots] = False
+        for slot in slots.tolist():
+            self._unindex_slot(slot)
 
-    def get_position_int(self) -> Tuple[int, int]:
-        """获取食物中心位置（整数坐标，用于绘制）"""
-        return (int(self.position[0]), int(self.position[1]))
-
-    def draw(self, surface: pygame.Surface, debug_collision: bool = False) -> None:
-        """
-        绘制食物
-        :param surface: 绘制表面
-        :param debug_collision: 是否绘制碰撞区域调试信息
-        """
-        if not self.is_eaten:
-            surface.blit(self.image, self.rect)
-
-            # 调试：绘制食物碰撞圆圈
-            if debug_collision:
-                pygame.draw.circle(surface, (0, 255, 0),
-                                   (int(self.position[0]), int(self.position[1])),
-                                   int(self.collision_radius), 2)
-
-    def update(self, dt: int) -> None:
-        """
-        更新食物状态（可以添加动画效果）
-        :param dt: 时间增量
-        """
-        # 这里可以添加食物的动画效果，比如闪烁、旋转等
-        pass
-
-
-class FoodManager:
-    """食物管理器 - 管理多个食物"""
-
-    def __init__(self, max_food_count: int = 1, wall_manager=None):
-        self.max_food_count = max_food_count
-        self.foods: List[Food] = []
-        self.score = 0
-        self.wall_manager = wall_manager
-
-        # 创建初始食物
-        for _ in range(self.max_food_count):
-            food = Food(wall_manager=self.wall_manager)
-            self.foods.append(food)
+        margin = GameBalance.FOOD_GENERATION_PIXEL
+        world_width, world_height = self.world_size
+        oversample = GameBalance.FOOD_SPAWN_OVERSAMPLE
+        remaining = slots
+        pending_types = self._choose_types(len(slots))
+        fallback: Dict[int, np.ndarray] = {}  # 只与其他食物重叠的备用位置（复制出暂存数组）
+
+        for _ in range(GameBalance.FOOD_SPAWN_ROUNDS):
+            # 每个待生成的槽位一次采样多个候选位置，候选 c 属于槽位 c % K；全部写入暂存数组
+            count = len(remaining)
+            total = count * oversample
+            radii = self._spawn_radii[:total]
+            np.take(self.type_radii, pending_types, out=radii[:count])
+            radii[count:].reshape(oversample - 1, count)[:] = radii[:count]
+
+            # 坐标 = 边距 + 半径 + 随机数 × (世界尺寸 - 2 × (边距 + 半径))
+            points = self._spawn_points[:total]
+            sample, span = self._spawn_scratch[0, :total], self._spawn_scratch[1, :total]
+            for axis, extent in enumerate((world_width, world_height)):
+                self._rng.random(out=sample)
+                np.multiply(radii, -2.0, out=span)
+                span += extent - 2 * margin
+                sample *= span
+                sample += radii
+                sample += margin
+                points[:, axis] = sample
+            valid = self._valid_positions(points, radii, body_positions, head_position)
+
+            # 逐个放置，已放置的食物（包括同一批内的）之间不能重叠
+            placed = np.zeros(count, dtype=bool)
+            for index in np.flatnonzero(valid).tolist():
+                owner = index % count
+                if placed[owner]:
+                    continue
+                if self._overlaps_food(points[index], radii[index]):
+                    if int(remaining[owner]) not in fallback:
+                        fallback[int(remaining[owner])] = points[index].copy()  # 暂存数组下一轮会被覆盖
+                    continue
+                self._place(int(remaining[owner]), int(pending_types[owner]), points[index])
+                fallback.pop(int(remaining[owner]), None)
+                placed[owner] = True
+
+            remaining = remaining[~placed]
+            pending_types = pending_types[~placed]
+            if len(remaining) == 0:
+                return
 
-    def update(self, dt: int, snake_head_pos: Tuple[float, float], snake_body_positions: List[Tuple[float, float]],
+        # 空间不足时允许与其他食物重叠，仍找不到位置的放在世界中心
+        center = np.array([world_width / 2, world_height / 2])
+        missing = 0
+        for slot, food_type in zip(remaining.tolist(), pending_types.tolist()):
+            position = fallback.get(slot)
+            if position is None:
+                position = center
+                missing += 1
+            self._place(slot, food_type, position)
+        if missing:
+            logger.warning("警告: 无法为 %s 个食物找到合适位置，使用世界中心", missing)
+
+    def _place(self, slot: int, food_type: int, position: np.ndarray) -> None:
+        """将食物放到槽位中并登记到空间索引"""
+        self.positions[slot] = position
+        self.types[slot] = food_type
+        self.radii[slot] = self.type_radii[food_type]
+        self.scores[slot] = self.type_scores[food_type]
+        self.active[slot] = True
+        self._index_slot(slot)
+
+    def update(self, dt: int, snake_head_pos: Tuple[float, float],
+               snake_body_positions: Union[np.ndarray, List[Tuple[float, float]]],
                snake_head_rect: pygame.Rect = None) -> int:
         """
         更新所有食物 - 支持顺滑移动
         :param dt: 时间增量
         :param snake_head_pos: 蛇头位置（浮点坐标）
-        :param snake_body_positions: 蛇身体位置列表（浮点坐标）
+        :param snake_body_positions: 蛇身体位置（浮点坐标），通常为蛇身体段的只读数组视图
         :param snake_head_rect: 蛇头矩形（向后兼容）
         :return: 本次更新获得的分数
         """
-        score_gained = 0
-
-        for food in self.foods:
-            if food.is_eaten:  # 跳过已经被吃掉的食物
-                continue
-
-            food.update(dt)
-
-            # 使用圆形碰撞检测（更精确）
-            collision_detected = False
-            if snake_head_pos:
-                collision_detected = food.check_collision(snake_head_pos)
-
-            if collision_detected and not food.is_eaten:  # 确保食物没有被重复吃掉
-                score_gained += food.get_eaten()
-                self.score += score_gained
-
-                # 重新生成食物位置，避开蛇的所有部分
-                avoid_positions = snake_body_positions.copy()
-                if snake_head_pos:
-                    avoid_positions.append(snake_head_pos)
-                food.reset(avoid_positions)
-
-                print(f"吃到{food.display_name}！获得 {food.score_value} 分，总分: {self.score}")
-
+        if not snake_head_pos:
+            return 0
+
+        # 蛇身跨过格子边界时增量更新蛇头所在的连通区域
+        if not isinstance(snake_body_positions, np.ndarray):
+            snake_body_positions = np.asarray(snake_body_positions, dtype=np.float64).reshape(-1, 2)
+        if self.connectivity is not None:
+            self.connectivity.update(snake_body_positions, snake_head_pos)
+
+        head_radius = GameBalance.SMOOTH_COLLISION_RADIUS
+        reach = head_radius + self.max_radius
+        candidates = self.query(snake_head_pos, reach)
+        if not candidates:
+            return 0
+
+        slots = np.array(candidates, dtype=np.intp)
+        dx = self.positions[slots, 0] - snake_head_pos[0]
+        dy = self.positions[slots, 1] - snake_head_pos[1]
+        threshold = self.radii[slots] + head_radius
+        eaten = slots[(dx * dx + dy * dy <= threshold * threshold) & self.active[slots]]
+        if len(eaten) == 0:
+            return 0
+
+        score_gained = int(self.scores[eaten].sum())
+        self.score += score_gained
+        if FoodManager.DEBUG_COLLISION:
+            for slot in eaten.tolist():
+                logger.info("✅ 吃到%s: 位置=(%.1f, %.1f), 蛇头位置=(%.1f, %.1f)",
+                            self.type_display_names[self.types[slot]], self.positions[slot, 0],
+                            self.positions[slot, 1], snake_head_pos[0], snake_head_pos[1])
+
+        # 本帧吃掉的食物一起重新生成，避开蛇的所有部分（直接使用身体段视图，不合并复制）
+        self._respawn(eaten, snake_body_positions, snake_head_pos)
+
+        logger.debug("吃到 %s 个食物！获得 %s 分，总分: %s", len(eaten), score_gained, self.score)
         return score_gained
 
-    def draw(self, surface: pygame.Surface, debug_collision: bool = False) -> None:
-        """绘制所有食物"""
-        for food in self.foods:
-            food.draw(surface, debug_collision)
+    def draw(self, surface: pygame.Surface, debug_collision: bool = False,
+             offset: Tuple[int, int] = (0, 0)) -> None:
+        """
+        绘制所有食物（只绘制与绘制表面相交的食物）
+        :param surface: 绘制表面
+        :param debug_collision: 是否绘制碰撞区域调试信息
+        :param offset: 绘制偏移（摄像机位置）
+        """
+        slots = np.flatnonzero(self.active)
+        if len(slots) == 0:
+            return
+
+        width, height = surface.get_size()
+        screen = self.positions[slots] - offset
+        margin = self.radii[slots] * 2
+        visible = ((screen[:, 0] > -margin) & (screen[:, 0] < width + margin) &
+                   (screen[:, 1] > -margin) & (screen[:, 1] < height + margin))
+
+        blit_list = []
+        for food_type, (x, y) in zip(self.types[slots[visible]].tolist(), screen[visible].astype(int).tolist()):
+            half_width, half_height = self.type_half_sizes[food_type]
+            blit_list.append((self.type_images[food_type], (x - half_width, y - half_height)))
+        surface.blits(blit_list, doreturn=False)
+
+        # 调试：绘制食物碰撞圆圈
+        if debug_collision:
+            for slot, (x, y) in zip(slots[visible].tolist(), screen[visible].astype(int).tolist()):
+                pygame.draw.circle(surface, (0, 255, 0), (x, y), int(self.radii[slot]), 2)
+
+    @property
+    def food_count(self) -> int:
+        """当前存在的食物数量"""
+        return int(np.count_nonzero(self.active))
 
     def get_food_positions(self) -> List[Tuple[float, float]]:
         """获取所有食物的位置（浮点坐标）"""
-        return [food.get_position() for food in self.foods if not food.is_eaten]
+        return [(x, y) for x, y in self.positions[self.active].tolist()]
 
     def get_food_positions_int(self) -> List[Tuple[int, int]]:
         """获取所有食物的位置（整数坐标，用于向后兼容）"""
-        return [food.get_position_int() for food in self.foods if not food.is_eaten]
+        return [(int(x), int(y)) for x, y in self.positions[self.active].tolist()]
 
     def reset(self) -> None:
         """重置所有食物"""
         self.score = 0
-        for food in self.foods:
-            food.reset()
+        if self.connectivity is not None:
+            self.connectivity.reset()
+        self._respawn(np.arange(self.max_food_count))
 
     def set_wall_manager(self, wall_manager) -> None:
         """
@@ -337,5 +411,4 @@ class FoodManager:
         :param wall_manager: 墙壁管理器实例
         """
         self.wall_manager = wall_manager
-        for food in self.foods:
-            food.set_wall_manager(wall_manager)
+        self.connectivity = None
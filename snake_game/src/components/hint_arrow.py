@@ -0,0 +1,56 @@
+"""
+提示箭头 - 在蛇头旁边指示沿寻路距离场走向最近食物的方向
+"""
+import math
+from typing import Dict, Optional, Tuple
+import pygame
+
+
+class HintArrow:
+    """提示箭头 - 四个方向的箭头图像预先渲染并共享"""
+
+    COLOR = (255, 230, 80)
+    SIZE = 16
+    DISTANCE = 28  # 箭头中心到蛇头中心的距离（像素）
+
+    _images: Dict[Tuple[int, int], pygame.Surface] = {}
+
+    @classmethod
+    def get_image(cls, direction: Tuple[int, int]) -> pygame.Surface:
+        """
+        获取指向某个方向的箭头图像
+        :param direction: 单位方向 (dx, dy)，取值为上下左右之一
+        :return: 箭头图像
+        """
+        image = cls._images.get(direction)
+        if image is None:
+            size = cls.SIZE
+            base = pygame.Surface((size, size), pygame.SRCALPHA)
+            # 基础箭头指向右侧
+            points = [(size - 1, size // 2), (2, 1), (size // 3, size // 2), (2, size - 2)]
+            pygame.draw.polygon(base, cls.COLOR + (220,), points)
+            pygame.draw.polygon(base, (60, 40, 0, 220), points, 1)
+            angle = -math.degrees(math.atan2(direction[1], direction[0]))
+            image = pygame.transform.rotate(base, angle)
+            cls._images[direction] = image
+        return image
+
+    def draw(self, surface: pygame.Surface, head_position: Tuple[float, float],
+             next_position: Optional[Tuple[float, float]], offset: Tuple[int, int] = (0, 0)) -> None:
+        """
+        绘制提示箭头
+        :param surface: 绘制表面
+        :param head_position: 蛇头世界坐标
+        :param next_position: 下一步要去的格子中心（None 表示没有提示）
+        :param offset: 摄像机偏移
+        """
+        if next_position is None:
+            return
+        dx = next_position[0] - head_position[0]
+        dy = next_position[1] - head_position[1]
+        # 按主要方向取整，保证只用到四张缓存图像
+        direction = ((1 if dx > 0 else -1), 0) if abs(dx) >= abs(dy) else (0, (1 if dy > 0 else -1))
+        image = self.get_image(direction)
+        center = (int(head_position[0] + direction[0] * self.DISTANCE) - offset[0],
+                  int(head_position[1] + direction[1] * self.DISTANCE) - offset[1])
+        surface.blit(image, image.get_rect(center=center))
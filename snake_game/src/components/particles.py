@@ -0,0 +1,138 @@
+"""
+粒子系统 - 菜单背景的装饰粒子
+位置、速度、寿命、大小保存在 NumPy 数组中按帧整体更新；
+绘制时按（半径, 透明度档位）选取预先渲染的带透明度的圆形贴图，用 Surface.blits 一次提交
+"""
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pygame
+
+
+class ParticleSystem:
+    """粒子系统 - 数组存储、向量化更新、贴图批量绘制"""
+
+    ALPHA_LEVELS = 16  # 透明度档位数量（每个半径预渲染这么多张贴图）
+
+    # 共享的粒子贴图 {(颜色, 半径): [各透明度档位的贴图]}
+    _sprites: Dict[Tuple[Tuple[int, int, int], int], List[pygame.Surface]] = {}
+
+    def __init__(self, count: int, area: Tuple[int, int], color: Tuple[int, int, int],
+                 spawn_rect: Optional[Tuple[float, float, float, float]] = None,
+                 size_range: Tuple[float, float] = (1.0, 4.0), speed: float = 0.5,
+                 life_range: Tuple[float, float] = (50.0, 150.0), alpha_range: Tuple[int, int] = (255, 255),
+                 fade_per_life: float = 0.0, drift_range: Tuple[float, float] = (1.0, 1.0),
+                 wrap: bool = False, seed: Optional[int] = None):
+        """
+        :param count: 粒子数量
+        :param area: 活动区域 (宽, 高)，离开区域的粒子重新生成（wrap 为 True 时从另一侧出现）
+        :param color: 粒子颜色 (r, g, b)
+        :param spawn_rect: 生成区域 (x, y, 宽, 高)，None 为整个活动区域
+        :param size_range: 半径范围（像素）
+        :param speed: 每帧在每个轴上的最大速度（像素）
+        :param life_range: 寿命范围（帧），寿命耗尽后重新生成
+        :param alpha_range: 透明度范围
+        :param fade_per_life: 大于 0 时透明度 = min(寿命 × 该值, 粒子透明度)，寿命将尽时逐渐消失
+        :param drift_range: 每个粒子受整体漂移影响的倍数范围（见 update）
+        :param wrap: 离开区域时是否从另一侧出现（不重新生成）
+        :param seed: 随机种子
+        """
+        self.count = count
+        self.area = area
+        self.color = tuple(color[:3])
+        self.spawn_rect = spawn_rect or (0.0, 0.0, float(area[0]), float(area[1]))
+        self.size_range = size_range
+        self.speed = speed
+        self.life_range = life_range
+        self.alpha_range = alpha_range
+        self.fade_per_life = fade_per_life
+        self.drift_range = drift_range
+        self.wrap = wrap
+        self.rng = np.random.default_rng(seed)
+
+        self.positions = np.zeros((count, 2), dtype=np.float32)
+        self.velocities = np.zeros((count, 2), dtype=np.float32)
+        self.life = np.zeros(count, dtype=np.float32)
+        self.radii = np.zeros(count, dtype=np.int32)
+        self.alphas = np.zeros(count, dtype=np.float32)
+        self.drift_scales = np.zeros((count, 1), dtype=np.float32)
+        self._respawn(np.arange(count))
+
+        # 贴图按 半径 × 透明度档位数 + 透明度档位 展开成一维，绘制时用下标数组一次取出
+        max_radius = max(1, int(round(size_range[1])))
+        sprite_table = [sprite for radius in range(max_radius + 1) for sprite in self.get_sprites(self.color, radius)]
+        self._sprite_table = np.empty(len(sprite_table), dtype=object)
+        self._sprite_table[:] = sprite_table
+
+    @classmethod
+    def get_sprites(cls, color: Tuple[int, int, int], radius: int) -> List[pygame.Surface]:
+        """
+        获取某个颜色和半径的圆形贴图（每个透明度档位一张）
+        :param color: 颜色 (r, g, b)
+        :param radius: 半径（像素），0 表示不绘制
+        :return: 贴图列表，下标为透明度档位
+        """
+        key = (color, radius)
+        sprites = cls._sprites.get(key)
+        if sprites is None:
+            size = max(1, radius * 2)
+            sprites = []
+            for level in range(cls.ALPHA_LEVELS):
+                sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+                alpha = 255 * level // (cls.ALPHA_LEVELS - 1)
+                if radius > 0 and alpha > 0:
+                    pygame.draw.circle(sprite, color + (alpha,), (radius, radius), radius)
+                sprites.append(sprite)
+            cls._sprites[key] = sprites
+        return sprites
+
+    def _respawn(self, indices: np.ndarray) -> None:
+        """在生成区域内重新生成一批粒子"""
+        n = len(indices)
+        if n == 0:
+            return
+        x, y, w, h = self.spawn_rect
+        rng = self.rng
+        self.positions[indices, 0] = rng.uniform(x, x + w, n)
+        self.positions[indices, 1] = rng.uniform(y, y + h, n)
+        self.velocities[indices] = rng.uniform(-self.speed, self.speed, (n, 2))
+        self.life[indices] = rng.uniform(*self.life_range, n)
+        self.radii[indices] = np.rint(rng.uniform(*self.size_range, n)).astype(np.int32)
+        self.alphas[indices] = rng.uniform(*self.alpha_range, n)
+        self.drift_scales[indices, 0] = rng.uniform(*self.drift_range, n)
+
+    def update(self, drift: Tuple[float, float] = (0.0, 0.0)) -> None:
+        """
+        更新一帧
+        :param drift: 整体漂移（像素/帧，乘以每个粒子的漂移倍数，用于整体飘动的效果）
+        """
+        positions = self.positions
+        positions += self.velocities
+        if drift[0] or drift[1]:
+            positions += self.drift_scales * np.array(drift, dtype=np.float32)
+        self.life -= 1.0
+
+        width, height = self.area
+        if self.wrap:
+            np.mod(positions[:, 0], width, out=positions[:, 0])
+            np.mod(positions[:, 1], height, out=positions[:, 1])
+            dead = self.life <= 0
+            self.life[dead] = self.rng.uniform(*self.life_range, int(dead.sum()))
+        else:
+            dead = ((self.life <= 0) | (positions[:, 0] < 0) | (positions[:, 0] > width)
+                    | (positions[:, 1] < 0) | (positions[:, 1] > height))
+            self._respawn(np.flatnonzero(dead))
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """批量绘制所有粒子"""
+        alphas = self.alphas
+        if self.fade_per_life > 0:
+            alphas = np.minimum(self.life * self.fade_per_life, alphas)
+        levels = np.clip(alphas * ((self.ALPHA_LEVELS - 1) / 255.0), 0, self.ALPHA_LEVELS - 1).astype(np.int32)
+        visible = (levels > 0) & (self.radii > 0)
+        if not visible.any():
+            return
+
+        radii = self.radii[visible]
+        corners = (self.positions[visible] - radii[:, None]).astype(np.int32).tolist()
+        sprites = self._sprite_table[radii * self.ALPHA_LEVELS + levels[visible]]
+        surface.blits(zip(sprites, corners), doreturn=False)
@@ -13,6 +13,7 @@ from enum import Enum
 
 import pygame
 import math
+import numpy as np
 from ..utils import tools
 from ..utils.grid_utils import GridUtils
 from ..configs.config import Config
@@ -20,6 +21,9 @@ from ..configs.game_balance import GameBalance
 from ..configs.skin_config import get_snake_colors, get_snake_color_config
 from ..utils.image_manager import get_image_manager
 from ..utils.sound_manager import SoundManager
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class SnakeConfig:
@@ -43,6 +47,141 @@ class SnakeConfig:
         self.boost_multiplier = GameBalance.SMOOTH_BOOST_MULTIPLIER
 
 
+class SegmentBuffer:
+    """
+    身体段存储 - 结构化数组（SoA）
+    所有身体段坐标保存在一块连续的 float64 数组中（形状为 capacity×2），
+    容量不足时倍增扩容，对外只暴露零拷贝的只读视图
+    """
+
+    def __init__(self, capacity: int = 16):
+        self._data = np.zeros((max(1, capacity), 2), dtype=np.float64)
+        self._count = 0
+        self._view: Optional[np.ndarray] = None  # 只读视图缓存，容量或长度变化时失效
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        """当前已分配的容量"""
+        return self._data.shape[0]
+
+    def grow(self, min_capacity: int = 0) -> None:
+        """
+        倍增扩容（摊还 O(1) 追加）
+        :param min_capacity: 扩容后至少需要的容量
+        """
+        new_capacity = self.capacity * 2
+        while new_capacity < min_capacity:
+            new_capacity *= 2
+
+        new_data = np.zeros((new_capacity, 2), dtype=np.float64)
+        new_data[:self._count] = self._data[:self._count]
+        self._data = new_data
+        self._view = None
+
+    def resize(self, count: int) -> None:
+        """
+        设置身体段数量（不足时扩容），新增部分的坐标由调用方负责写入
+        :param count: 身体段数量
+        """
+        if count > self.capacity:
+            self.grow(count)
+        if count != self._count:
+            self._count = count
+            self._view = None
+
+    def append(self, x: float, y: float) -> None:
+        """在尾部追加一个身体段"""
+        if self._count >= self.capacity:
+            self.grow()
+        self._data[self._count, 0] = x
+        self._data[self._count, 1] = y
+        self._count += 1
+        self._view = None
+
+    def clear(self) -> None:
+        """清空身体段（保留已分配的容量）"""
+        self._count = 0
+        self._view = None
+
+    def writable(self) -> np.ndarray:
+        """获取可写视图（仅供蛇内部更新位置使用）"""
+        return self._data[:self._count]
+
+    def view(self) -> np.ndarray:
+        """获取只读视图（零拷贝，坐标原地更新后视图内容同步变化）"""
+        if self._view is None:
+            view = self._data[:self._count]
+            view.flags.writeable = False
+            self._view = view
+        return self._view
+
+
+class PathBuffer:
+    """
+    蛇头轨迹存储 - 滑动窗口
+    轨迹点的坐标和累积距离保存在一块连续的 float64 数组中（形状为 capacity×3），
+    新点追加在尾部，过旧的点通过移动起点丢弃；尾部写满时把有效部分移回开头，
+    有效部分超过一半容量时倍增扩容，因此有效部分始终连续，可直接交给 np.interp
+    """
+
+    def __init__(self, capacity: int = 64):
+        self._data = np.zeros((max(2, capacity), 3), dtype=np.float64)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def capacity(self) -> int:
+        """当前已分配的容量"""
+        return self._data.shape[0]
+
+    def append(self, x: float, y: float, distance: float) -> None:
+        """
+        在尾部追加一个轨迹点（摊还 O(1)）
+        :param x: 横坐标
+        :param y: 纵坐标
+        :param distance: 该点的累积路径距离（必须单调递增）
+        """
+        if self._end >= self.capacity:
+            count = len(self)
+            if count * 2 > self.capacity:
+                data = np.zeros((self.capacity * 2, 3), dtype=np.float64)
+            else:
+                data = self._data
+            data[:count] = self._data[self._start:self._end]
+            self._data = data
+            self._start = 0
+            self._end = count
+        self._data[self._end] = (x, y, distance)
+        self._end += 1
+
+    def trim_before(self, min_distance: float) -> None:
+        """
+        丢弃累积距离小于 min_distance 的轨迹点
+        :param min_distance: 保留的最小累积距离
+        """
+        distances = self._data[self._start:self._end, 2]
+        self._start += int(np.searchsorted(distances, min_distance, side='left'))
+
+    def clear(self) -> None:
+        """清空轨迹（保留已分配的容量）"""
+        self._start = 0
+        self._end = 0
+
+    def points(self) -> np.ndarray:
+        """轨迹点坐标视图，形状为 (N, 2)"""
+        return self._data[self._start:self._end, :2]
+
+    def distances(self) -> np.ndarray:
+        """轨迹点累积距离视图，形状为 (N,)"""
+        return self._data[self._start:self._end, 2]
+
+
 class Snake(pygame.sprite.Sprite):
     """优化后的蛇类"""
 
@@ -61,7 +200,7 @@ class Snake(pygame.sprite.Sprite):
         # 初始化身体段
         self._setup_body_segments()
 
-        print(f"蛇 {self.name} 初始化完成，皮肤ID: {self.skin_id}")
+        logger.info("蛇 %s 初始化完成，皮肤ID: %s", self.name, self.skin_id)
 
     def _load_config(self) -> SnakeConfig:
         """加载蛇的配置"""
@@ -84,14 +223,14 @@ class Snake(pygame.sprite.Sprite):
                 body_img = manager.get_snake_image(self.skin_id, f"body{i}")
                 if body_img:
                     self.body_images[i] = body_img
-                    print(f"加载蛇身图片: snake{self.skin_id}_body{i}")
+                    logger.info("加载蛇身图片: snake%s_body%s", self.skin_id, i)
                 else:
                     break
         else:
-            print(f"蛇 skin{self.skin_id} 没有身体图片，将使用默认绘制")
+            logger.info("蛇 skin%s 没有身体图片，将使用默认绘制", self.skin_id)
 
         if original_head is None:
-            print(f"警告: 无法加载蛇 skin{self.skin_id} 的头部图片，使用默认图片")
+            logger.warning("警告: 无法加载蛇 skin%s 的头部图片，使用默认图片", self.skin_id)
             # 使用备用方案
             original_head = tools.create_default_image(self.config.head_size, (0, 255, 0))
 
@@ -142,28 +281,43 @@ class Snake(pygame.sprite.Sprite):
         # 输入状态
         self.input_direction = [0, 0]  # [x, y] 输入方向
 
-        print(f"蛇头初始位置: {initial_pos}")
+        logger.info("蛇头初始位置: %s", initial_pos)
 
     def _get_runtime_segment_distance(self) -> float:
         """获取运行时使用的身体段间距，确保所有地方使用相同的计算方式"""
         return self.body_radius * 1.6
 
+    def _get_segment_offsets(self) -> np.ndarray:
+        """获取每个身体段距蛇头的路径距离 (i + 1) * 段间距，按身体段数量缓存"""
+        count = len(self.segments)
+        if len(self._segment_offsets) != count:
+            self._segment_offsets = np.arange(1, count + 1, dtype=np.float64) * self._get_runtime_segment_distance()
+        return self._segment_offsets
+
+    @property
+    def body_segments(self) -> np.ndarray:
+        """身体段位置的只读视图，形状为 (N, 2)，零拷贝"""
+        return self.segments.view()
+
     def _setup_body_segments(self) -> None:
         """初始化身体段"""
-        self.body_segments: List[List[float]] = []  # 身体段位置 [x, y]
+        # 身体段位置存储在连续数组中，重置时复用已分配的容量
+        if not hasattr(self, 'segments'):
+            self.segments = SegmentBuffer()
+        self._segment_offsets = np.zeros(0, dtype=np.float64)  # 各身体段距蛇头的路径距离缓存
 
         # 根据初始位置和段间距离创建身体段
         # 使用与运行时相同的间距计算方式，确保一致性
-        runtime_segment_distance = self._get_runtime_segment_distance()
-
-        for i in range(self.config.initial_body_segments):
-            segment_x = self.position[0] - (i + 1) * runtime_segment_distance
-            segment_y = self.position[1]
-            self.body_segments.append([segment_x, segment_y])
-
-        # 路径追踪 - 记录蛇头的移动轨迹供身体段跟随
-        self.path_points: List[Tuple[float, float]] = []
-        self.path_distances: List[float] = []  # 累积距离
+        self.segments.resize(self.config.initial_body_segments)
+        offsets = self._get_segment_offsets()
+        segments = self.segments.writable()
+        segments[:, 0] = self.position[0] - offsets
+        segments[:, 1] = self.position[1]
+
+        # 路径追踪 - 记录蛇头的移动轨迹（坐标和累积距离）供身体段跟随
+        if not hasattr(self, 'path'):
+            self.path = PathBuffer()
+        self.path.clear()
         self.total_path_length = 0.0
 
     def handle_input(self, keys: pygame.key.ScancodeWrapper) -> None:
@@ -289,16 +443,12 @@ class Snake(pygame.sprite.Sprite):
 
         if distance > 0.5:  # 只有移动距离足够大时才记录
             # 添加新的路径点
-            self.path_points.append((self.position[0], self.position[1]))
             self.total_path_length += distance
-            self.path_distances.append(self.total_path_length)
+            self.path.append(self.position[0], self.position[1], self.total_path_length)
 
             # 限制路径点数量，避免内存过度使用
-            max_path_length = len(self.body_segments) * self._get_runtime_segment_distance() * 2
-            while (self.path_distances and
-                   self.total_path_length - self.path_distances[0] > max_path_length):
-                self.path_points.pop(0)
-                self.path_distances.pop(0)
+            max_path_length = len(self.segments) * self._get_runtime_segment_distance() * 2
+            self.path.trim_before(self.total_path_length - max_path_length)
 
     def _update_head_image(self) -> None:
         """根据当前角度更新头部图片"""
@@ -311,73 +461,40 @@ class Snake(pygame.sprite.Sprite):
 
     def _update_body_segments_smooth(self) -> None:
         """更新身体段位置（完全顺滑模式）- 优化连续性"""
-        if not self.body_segments:
+        if not len(self.segments):
             return
 
+        segments = self.segments.writable()
+        # 使用更紧密的间距确保连续性（约1.6倍半径）
+        offsets = self._get_segment_offsets()
+
         # 如果路径点不足，使用简单跟随
-        if len(self.path_points) < 2:
-            # 简单的直线跟随 - 使用更紧密的间距
-            runtime_segment_distance = self._get_runtime_segment_distance()
-            for i, segment in enumerate(self.body_segments):
-                # 使用稍小的间距确保连续性
-                distance = (i + 1) * runtime_segment_distance  # 约1.6倍半径的间距
-                angle_rad = math.radians(self.angle + 180)  # 反向
-                segment[0] = self.position[0] + math.cos(angle_rad) * distance
-                segment[1] = self.position[1] + math.sin(angle_rad) * distance
+        if len(self.path) < 2:
+            # 简单的直线跟随
+            angle_rad = math.radians(self.angle + 180)  # 反向
+            segments[:, 0] = self.position[0] + math.cos(angle_rad) * offsets
+            segments[:, 1] = self.position[1] + math.sin(angle_rad) * offsets
             return
 
-        # 为每个身体段计算在路径上的位置 - 使用优化的间距
-        runtime_segment_distance = self._get_runtime_segment_distance()
-        for i, segment in enumerate(self.body_segments):
-            # 使用更紧密的间距确保连续性
-            target_distance = (i + 1) * runtime_segment_distance
-
-            # 在路径上找到对应距离的位置
-            segment_pos = self._get_position_on_path(target_distance)
-            if segment_pos:
-                segment[0] = segment_pos[0]
-                segment[1] = segment_pos[1]
-
-    def _get_position_on_path(self, distance_from_head: float) -> Optional[Tuple[float, float]]:
-        """在路径上获取距离头部指定距离的位置"""
-        if not self.path_points or not self.path_distances:
-            return None
-
-        target_distance = self.total_path_length - distance_from_head
-
-        if target_distance <= 0:
-            # 距离太远，返回路径起点
-            return self.path_points[0] if self.path_points else None
-
-        # 在路径距离数组中查找位置
-        for i in range(len(self.path_distances) - 1):
-            if self.path_distances[i] <= target_distance <= self.path_distances[i + 1]:
-                # 在两个点之间插值
-                t = ((target_distance - self.path_distances[i]) /
-                     (self.path_distances[i + 1] - self.path_distances[i]))
-
-                p1 = self.path_points[i]
-                p2 = self.path_points[i + 1]
-
-                return (
-                    p1[0] + (p2[0] - p1[0]) * t,
-                    p1[1] + (p2[1] - p1[1]) * t
-                )
-
-        # 如果没找到，返回最后一个点
-        return self.path_points[-1] if self.path_points else None
+        # 为每个身体段计算在路径上的位置：按累积距离批量线性插值
+        # 比最早的轨迹点更远的身体段停在轨迹起点（np.interp 在端点处截断）
+        target_distances = self.total_path_length - offsets
+        points = self.path.points()
+        distances = self.path.distances()
+        segments[:, 0] = np.interp(target_distances, distances, points[:, 0])
+        segments[:, 1] = np.interp(target_distances, distances, points[:, 1])
 
     def grow(self) -> None:
         """增长蛇的身体"""
-        if self.body_segments:
+        if len(self.segments):
             # 在尾部添加新段
-            tail = self.body_segments[-1]
-            self.body_segments.append([tail[0], tail[1]])
+            tail = self.segments.view()[-1]
+            self.segments.append(tail[0], tail[1])
         else:
             # 如果没有身体段，在头部后面添加
             new_x = self.position[0] - self._get_runtime_segment_distance()
             new_y = self.position[1]
-            self.body_segments.append([new_x, new_y])
+            self.segments.append(new_x, new_y)
 
     def check_self_collision(self) -> bool:
         """检查是否撞到自己"""
@@ -385,22 +502,16 @@ class Snake(pygame.sprite.Sprite):
         if not self.is_moving:
             return False
 
-        if len(self.body_segments) < 4:  # 至少需要4个身体段才可能撞到自己
+        if len(self.segments) < 4:  # 至少需要4个身体段才可能撞到自己
             return False
 
-        head_center = (self.position[0], self.position[1])
         collision_threshold = self.config.collision_radius
 
         # 从第四节开始检查（跳过紧邻头部的前三节，避免误判）
-        for segment in self.body_segments[3:]:
-            segment_pos = (segment[0], segment[1])
-            dx = head_center[0] - segment_pos[0]
-            dy = head_center[1] - segment_pos[1]
-            distance = (dx * dx + dy * dy) ** 0.5
-
-            if distance < collision_threshold:
-                return True
-        return False
+        tail = self.segments.view()[3:]
+        dx = tail[:, 0] - self.position[0]
+        dy = tail[:, 1] - self.position[1]
+        return bool(np.any(dx * dx + dy * dy < collision_threshold * collision_threshold))
 
     def check_boundary_collision(self, screen_width: int, screen_height: int) -> bool:
         """检查是否撞到边界"""
@@ -416,19 +527,19 @@ class Snake(pygame.sprite.Sprite):
     def die(self) -> None:
         """蛇死亡"""
         self.is_dead = True
-        print(f"蛇 {self.name} 死亡")
+        logger.info("蛇 %s 死亡", self.name)
 
     def get_head_position(self) -> Tuple[int, int]:
         """获取头部位置"""
         return (int(self.position[0]), int(self.position[1]))
 
-    def get_body_segments(self) -> List[Tuple[int, int]]:
-        """获取身体段位置列表"""
-        return [(int(seg[0]), int(seg[1])) for seg in self.body_segments]
+    def get_body_segments(self) -> np.ndarray:
+        """获取身体段位置（只读视图，形状为 (N, 2)）"""
+        return self.segments.view()
 
     def get_length(self) -> int:
         """获取蛇的长度（包括头部）"""
-        return len(self.body_segments) + 1
+        return len(self.segments) + 1
 
     def is_boost_active(self) -> bool:
         """获取当前是否正在加速"""
@@ -524,22 +635,31 @@ class Snake(pygame.sprite.Sprite):
             glow_color = (255, 255, 0, 80)  # 半透明黄色
             pygame.draw.circle(surface, glow_color[:3], pos, glow_radius, 1)
 
-    def draw(self, surface: pygame.Surface, debug_collision: bool = False) -> None:
-        """绘制蛇"""
+    def draw(self, surface: pygame.Surface, debug_collision: bool = False,
+             offset: Tuple[int, int] = (0, 0)) -> None:
+        """
+        绘制蛇
+        :param surface: 绘制表面
+        :param debug_collision: 是否绘制碰撞区域调试信息
+        :param offset: 绘制偏移（摄像机位置）
+        """
         # 根据加速状态选择颜色
         colors = self.body_colors['boost'] if self.is_boosting else self.body_colors['normal']
+        offset_x, offset_y = offset
 
         # 绘制身体段（圆形）- 固定大小确保连续性
-        for i, segment in enumerate(self.body_segments):
-            pos = (int(segment[0]), int(segment[1]))
+        segments = self.segments.view()
+        prev_pos = None
+        for i in range(len(segments)):
+            pos = (int(segments[i, 0]) - offset_x, int(segments[i, 1]) - offset_y)
 
             # 使用统一大小确保完美连续性
             radius = self.body_radius
 
             # 绘制连接线段（在圆圈之前绘制，避免覆盖）
-            if self.use_connections and i > 0:
-                prev_pos = (int(self.body_segments[i - 1][0]), int(self.body_segments[i - 1][1]))
+            if self.use_connections and prev_pos is not None:
                 self._draw_connection(surface, prev_pos, pos, colors, radius)
+            prev_pos = pos
 
             # 绘制圆形身体段
             self._draw_body_circle(surface, pos, colors, radius, i)
@@ -551,13 +671,12 @@ class Snake(pygame.sprite.Sprite):
 
         # 绘制头部
         head_rect = self.head_image.get_rect()
-        head_rect.center = (int(self.position[0]), int(self.position[1]))
+        head_rect.center = (int(self.position[0]) - offset_x, int(self.position[1]) - offset_y)
         surface.blit(self.head_image, head_rect)
 
         # 调试：绘制蛇头碰撞圆圈
         if debug_collision:
-            pygame.draw.circle(surface, (255, 0, 0),
-                               (int(self.position[0]), int(self.position[1])),
+            pygame.draw.circle(surface, (255, 0, 0), head_rect.center,
                                int(self.config.collision_radius), 3)
 
     def _get_skin_colors(self, skin_id: int) -> dict:
@@ -587,7 +706,7 @@ class Snake(pygame.sprite.Sprite):
         self.body_colors = self._get_skin_colors(new_skin_id)
         # 重新加载图片
         self._load_images()
-        print(f"蛇 {self.name} 皮肤已更改为: snake{new_skin_id}")
+        logger.info("蛇 %s 皮肤已更改为: snake%s", self.name, new_skin_id)
 
     def get_skin_id(self) -> int:
         """获取当前皮肤ID"""
@@ -602,4 +721,4 @@ class Snake(pygame.sprite.Sprite):
         self._setup_initial_state(initial_pos)
         self._setup_body_segments()
         self.animation_time = 0.0  # 重置动画时间
-        print(f"蛇 {self.name} 已重置到位置: {initial_pos}")
+        logger.info("蛇 %s 已重置到位置: %s", self.name, initial_pos)
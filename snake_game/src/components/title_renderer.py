@@ -0,0 +1,92 @@
+"""
+标题渲染器 - 逐字渐变色、带发光效果的标题
+每个字符连同发光层只渲染一次，字符位置用前缀和一次算好；每帧只按浮动偏移移动字符
+"""
+from itertools import accumulate
+from typing import List, Optional, Sequence, Tuple
+import pygame
+
+
+class TitleRenderer:
+    """标题渲染器"""
+
+    GLOW_OFFSETS = ((2, 2), (-2, -2), (2, -2), (-2, 2), (0, 3), (0, -3))  # 内发光（字符本色）
+    OUTER_GLOW_OFFSETS = ((3, 3), (-3, -3), (3, -3), (-3, 3))  # 外发光
+    OUTER_GLOW_COLOR = (255, 255, 200)
+    PADDING = 3  # 发光层超出字符的最大距离
+
+    def __init__(self, text: str, font: pygame.font.Font, start_color: Tuple[int, int, int],
+                 end_color: Tuple[int, int, int], width: int, spacing: int = 15):
+        """
+        :param text: 标题文字
+        :param font: 字体
+        :param start_color: 第一个字符的颜色
+        :param end_color: 最后一个字符的颜色
+        :param width: 居中区域的宽度
+        :param spacing: 字符间距
+        """
+        self.text = text
+        self.glyphs: List[pygame.Surface] = []
+        widths = []
+        last = max(1, len(text) - 1)
+        for i, char in enumerate(text):
+            ratio = i / last if len(text) > 1 else 0
+            color = tuple(int(start * (1 - ratio) + end * ratio) for start, end in zip(start_color, end_color))
+            glyph = self._render_glyph(font, char, color)
+            self.glyphs.append(glyph)
+            widths.append(glyph.get_width() - self.PADDING * 2)
+
+        # 字符横坐标：居中起点 + 前面字符宽度的前缀和 + 间距
+        start_x = (width - sum(widths) - (len(text) - 1) * spacing) // 2
+        prefix = [0] + list(accumulate(widths))[:-1]
+        self.x_positions = [start_x + prefix[i] + i * spacing - self.PADDING for i in range(len(text))]
+
+        # 背景光晕（半径变化时才重画）
+        self._halo: Optional[pygame.Surface] = None
+        self._halo_radius = None
+
+    def _render_glyph(self, font: pygame.font.Font, char: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """
+        渲染一个字符及其发光层
+        :return: 四周留出 PADDING 的字符图片
+        """
+        char_surface = font.render(char, True, color)
+        outer_glow = font.render(char, True, self.OUTER_GLOW_COLOR)
+        pad = self.PADDING
+        glyph = pygame.Surface((char_surface.get_width() + pad * 2, char_surface.get_height() + pad * 2), pygame.SRCALPHA)
+        for dx, dy in self.GLOW_OFFSETS:
+            glyph.blit(char_surface, (pad + dx, pad + dy))
+        for dx, dy in self.OUTER_GLOW_OFFSETS:
+            glyph.blit(outer_glow, (pad + dx, pad + dy))
+        glyph.blit(char_surface, (pad, pad))
+        return glyph
+
+    def draw_halo(self, surface: pygame.Surface, radius: int, center: Tuple[int, int],
+                  color: Tuple[int, int, int, int] = (255, 200, 100, 30)) -> None:
+        """
+        绘制标题背景光晕
+        :param surface: 绘制表面
+        :param radius: 光晕半径
+        :param center: 光晕中心
+        :param color: 光晕颜色（带透明度）
+        """
+        if radius != self._halo_radius:
+            size = radius * 2
+            if self._halo is None or self._halo.get_width() < size:
+                self._halo = pygame.Surface((size, size), pygame.SRCALPHA)
+            self._halo.fill((0, 0, 0, 0))
+            pygame.draw.circle(self._halo, color, (radius, radius), radius)
+            self._halo_radius = radius
+        size = radius * 2
+        surface.blit(self._halo, (center[0] - radius, center[1] - radius), (0, 0, size, size))
+
+    def draw(self, surface: pygame.Surface, top: int, float_offsets: Sequence[float]) -> None:
+        """
+        绘制标题
+        :param surface: 绘制表面
+        :param top: 字符顶部的纵坐标
+        :param float_offsets: 每个字符的纵向浮动偏移
+        """
+        pad = self.PADDING
+        surface.blits([(glyph, (x, int(top + offset) - pad))
+                       for glyph, x, offset in zip(self.glyphs, self.x_positions, float_offsets)], doreturn=False)
@@ -5,18 +5,46 @@ import pygame
 import math
 import json
 import os
+import threading
+import numpy as np
 from typing import List, Tuple, Optional, Dict, Any
 from ..configs.config import Config
 from ..configs.game_balance import GameBalance
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class Wall(pygame.sprite.Sprite):
     """墙类 - 单个墙块"""
 
-    def __init__(self, position: Tuple[float, float], size: int = 30):
+    # 墙块颜色配置（用于阴影和发光效果）
+    EFFECT_COLORS = {
+        'shadow': (20, 30, 50, 120),     # 半透明深蓝阴影
+        'glow': (80, 100, 140, 60),      # 半透明蓝光效果
+        'highlight': (140, 160, 180, 80) # 高光效果
+    }
+
+    # 砖块纹理主题
+    THEMES = {
+        'default': {  # 现代配色方案 - 深蓝灰色系
+            'brick': (70, 80, 100),        # 主砖块颜色 - 深蓝灰
+            'mortar': (50, 60, 80),        # 砖缝颜色 - 更深蓝灰
+            'highlight': (120, 140, 160),  # 高光颜色 - 浅蓝灰
+            'shadow': (30, 40, 60),        # 阴影颜色 - 深蓝黑
+        },
+    }
+
+    # 所有墙块共享的纹理和特效图层，(大小, 主题) -> Surface；后台加载线程也会创建墙块
+    _texture_cache: Dict[Tuple[int, str], pygame.Surface] = {}
+    _effect_cache: Dict[int, Tuple[pygame.Surface, pygame.Surface, pygame.Surface]] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, position: Tuple[float, float], size: int = 30, theme: str = 'default'):
         pygame.sprite.Sprite.__init__(self)
         self.position = [float(position[0]), float(position[1])]  # 使用浮点坐标
         self.grid_size = size  # 墙块大小
+        self.theme = theme
         self.collision_radius = size * 0.4  # 碰撞半径，稍小于视觉大小
 
         # 创建墙块图像
@@ -27,68 +55,125 @@ class Wall(pygame.sprite.Sprite):
         self.rect.center = (int(self.position[0]), int(self.position[1]))
 
         # 墙块颜色配置（用于阴影和发光效果）
-        self.colors = {
-            'shadow': (20, 30, 50, 120),     # 半透明深蓝阴影
-            'glow': (80, 100, 140, 60),      # 半透明蓝光效果
-            'highlight': (140, 160, 180, 80) # 高光效果
-        }
+        self.colors = dict(Wall.EFFECT_COLORS)
 
     def _create_image(self) -> None:
-        """创建墙块图像"""
-        self.image = pygame.Surface((self.grid_size, self.grid_size), pygame.SRCALPHA)
+        """获取墙块图像（同大小、同主题的墙块共享同一张纹理）"""
+        self.image = Wall.get_texture(self.grid_size, self.theme)
+
+    @classmethod
+    def get_texture(cls, size: int, theme: str = 'default') -> pygame.Surface:
+        """
+        获取共享的墙格纹理，首次使用时绘制
+        共享纹理只读，不要在返回的 Surface 上绘制
+        :param size: 墙格大小
+        :param theme: 纹理主题
+        :return: 墙格图像
+        """
+        key = (size, theme)
+        with cls._cache_lock:
+            texture = cls._texture_cache.get(key)
+            if texture is None:
+                texture = cls.render_cell_image(size, theme)
+                cls._texture_cache[key] = texture
+            return texture
+
+    @classmethod
+    def get_effect_surfaces(cls, size: int) -> Tuple[pygame.Surface, pygame.Surface, pygame.Surface]:
+        """
+        获取共享的阴影、外层发光和内层高光图层
+        :param size: 墙格大小
+        :return: (阴影, 外层发光, 内层高光)
+        """
+        with cls._cache_lock:
+            effects = cls._effect_cache.get(size)
+            if effects is None:
+                shadow = pygame.Surface((size, size), pygame.SRCALPHA)
+                pygame.draw.rect(shadow, cls.EFFECT_COLORS['shadow'], (0, 0, size, size), border_radius=3)
+
+                outer_glow = pygame.Surface((size + 8, size + 8), pygame.SRCALPHA)
+                pygame.draw.rect(outer_glow, cls.EFFECT_COLORS['glow'], (0, 0, size + 8, size + 8),
+                                 border_radius=7, width=3)
+
+                inner_highlight = pygame.Surface((size + 2, size + 2), pygame.SRCALPHA)
+                pygame.draw.rect(inner_highlight, cls.EFFECT_COLORS['highlight'], (0, 0, size + 2, size + 2),
+                                 border_radius=4, width=1)
+
+                effects = (shadow, outer_glow, inner_highlight)
+                cls._effect_cache[size] = effects
+            return effects
+
+    @classmethod
+    def clear_texture_cache(cls) -> None:
+        """清空共享纹理缓存（修改主题配色后调用）"""
+        with cls._cache_lock:
+            cls._texture_cache.clear()
+            cls._effect_cache.clear()
+
+    @classmethod
+    def render_cell_image(cls, size: int, theme: str = 'default') -> pygame.Surface:
+        """
+        绘制单个墙格的砖块纹理
+        :param size: 墙格大小
+        :param theme: 纹理主题，未知主题使用默认配色
+        :return: 墙格图像
+        """
+        image = pygame.Surface((size, size), pygame.SRCALPHA)
         
-        # 现代配色方案 - 深蓝灰色系
-        brick_color = (70, 80, 100)        # 主砖块颜色 - 深蓝灰
-        mortar_color = (50, 60, 80)        # 砖缝颜色 - 更深蓝灰
-        highlight_color = (120, 140, 160)   # 高光颜色 - 浅蓝灰
-        shadow_color = (30, 40, 60)        # 阴影颜色 - 深蓝黑
+        palette = cls.THEMES.get(theme, cls.THEMES['default'])
+        brick_color = palette['brick']
+        mortar_color = palette['mortar']
+        highlight_color = palette['highlight']
+        shadow_color = palette['shadow']
         
         # 创建渐变背景效果
-        for y in range(self.grid_size):
+        for y in range(size):
             # 从顶部到底部的渐变
-            factor = y / self.grid_size
+            factor = y / size
             r = int(brick_color[0] * (1 - factor * 0.3))
             g = int(brick_color[1] * (1 - factor * 0.3))
             b = int(brick_color[2] * (1 - factor * 0.3))
-            pygame.draw.line(self.image, (r, g, b), (0, y), (self.grid_size, y))
+            pygame.draw.line(image, (r, g, b), (0, y), (size, y))
         
         # 添加砖块纹理效果
         # 水平分割线
-        pygame.draw.line(self.image, mortar_color, (0, self.grid_size//2), 
-                         (self.grid_size, self.grid_size//2), 2)
+        pygame.draw.line(image, mortar_color, (0, size//2), 
+                         (size, size//2), 2)
         
         # 垂直分割线（交错排列，更自然的砖墙效果）
-        if self.grid_size >= 30:
+        if size >= 30:
             # 第一行砖块
-            pygame.draw.line(self.image, mortar_color, (self.grid_size//3, 0), 
-                             (self.grid_size//3, self.grid_size//2), 2)
-            pygame.draw.line(self.image, mortar_color, (2*self.grid_size//3, 0), 
-                             (2*self.grid_size//3, self.grid_size//2), 2)
+            pygame.draw.line(image, mortar_color, (size//3, 0), 
+                             (size//3, size//2), 2)
+            pygame.draw.line(image, mortar_color, (2*size//3, 0), 
+                             (2*size//3, size//2), 2)
             
             # 第二行砖块（交错排列）
-            pygame.draw.line(self.image, mortar_color, (self.grid_size//6, self.grid_size//2), 
-                             (self.grid_size//6, self.grid_size), 2)
-            pygame.draw.line(self.image, mortar_color, (self.grid_size//2, self.grid_size//2), 
-                             (self.grid_size//2, self.grid_size), 2)
-            pygame.draw.line(self.image, mortar_color, (5*self.grid_size//6, self.grid_size//2), 
-                             (5*self.grid_size//6, self.grid_size), 2)
+            pygame.draw.line(image, mortar_color, (size//6, size//2), 
+                             (size//6, size), 2)
+            pygame.draw.line(image, mortar_color, (size//2, size//2), 
+                             (size//2, size), 2)
+            pygame.draw.line(image, mortar_color, (5*size//6, size//2), 
+                             (5*size//6, size), 2)
         
         # 增强3D立体效果
         # 左上角高光（更柔和）
         for i in range(3):
             alpha = 100 - i * 30
             highlight = (highlight_color[0], highlight_color[1], highlight_color[2], alpha)
-            pygame.draw.line(self.image, highlight, (i, i), (self.grid_size-i, i), 1)
-            pygame.draw.line(self.image, highlight, (i, i), (i, self.grid_size-i), 1)
+            pygame.draw.line(image, highlight, (i, i), (size-i, i), 1)
+            pygame.draw.line(image, highlight, (i, i), (i, size-i), 1)
         
         # 右下角阴影（更柔和）
         for i in range(3):
             alpha = 100 - i * 30
             shadow = (shadow_color[0], shadow_color[1], shadow_color[2], alpha)
-            pygame.draw.line(self.image, shadow, (self.grid_size-1-i, i), 
-                             (self.grid_size-1-i, self.grid_size-i), 1)
-            pygame.draw.line(self.image, shadow, (i, self.grid_size-1-i), 
-                             (self.grid_size-i, self.grid_size-1-i), 1)
+            pygame.draw.line(image, shadow, (size-1-i, i), 
+                             (size-1-i, size-i), 1)
+            pygame.draw.line(image, shadow, (i, size-1-i), 
+                             (size-i, size-1-i), 1)
+
+        return image
 
     def check_collision(self, position: Tuple[float, float], radius: float) -> bool:
         """
@@ -110,53 +195,143 @@ class Wall(pygame.sprite.Sprite):
         """获取墙块位置"""
         return (self.position[0], self.position[1])
 
-    def draw(self, surface: pygame.Surface, debug_collision: bool = False) -> None:
+    def draw(self, surface: pygame.Surface, debug_collision: bool = False,
+             offset: Tuple[int, int] = (0, 0)) -> None:
         """
         绘制墙块
         :param surface: 绘制表面
         :param debug_collision: 是否绘制碰撞区域调试信息
+        :param offset: 绘制偏移（摄像机或区块左上角的世界坐标）
         """
+        shadow_surface, outer_glow, inner_highlight = Wall.get_effect_surfaces(self.grid_size)
+        x = self.position[0] - offset[0]
+        y = self.position[1] - offset[1]
+
         # 绘制柔和阴影效果
-        shadow_surface = pygame.Surface((self.grid_size, self.grid_size), pygame.SRCALPHA)
-        shadow_color = self.colors['shadow']
-        pygame.draw.rect(shadow_surface, shadow_color, 
-                         (0, 0, self.grid_size, self.grid_size), border_radius=3)
-        
-        shadow_pos = (int(self.position[0] - self.grid_size // 2 + 3),
-                      int(self.position[1] - self.grid_size // 2 + 3))
+        shadow_pos = (int(x - self.grid_size // 2 + 3),
+                      int(y - self.grid_size // 2 + 3))
         surface.blit(shadow_surface, shadow_pos)
 
         # 绘制主体墙块
-        surface.blit(self.image, self.rect)
+        surface.blit(self.image, self.rect.move(-offset[0], -offset[1]))
 
         # 添加多层发光边框效果
         # 外层发光（柔和蓝色光晕）
-        outer_glow = pygame.Surface((self.grid_size + 8, self.grid_size + 8), pygame.SRCALPHA)
-        pygame.draw.rect(outer_glow, self.colors['glow'], 
-                         (0, 0, self.grid_size + 8, self.grid_size + 8), 
-                         border_radius=7, width=3)
-        
-        outer_pos = (int(self.position[0] - (self.grid_size + 8) // 2),
-                     int(self.position[1] - (self.grid_size + 8) // 2))
+        outer_pos = (int(x - (self.grid_size + 8) // 2),
+                     int(y - (self.grid_size + 8) // 2))
         surface.blit(outer_glow, outer_pos)
         
         # 内层高光（精致边框）
-        inner_highlight = pygame.Surface((self.grid_size + 2, self.grid_size + 2), pygame.SRCALPHA)
-        pygame.draw.rect(inner_highlight, self.colors['highlight'], 
-                         (0, 0, self.grid_size + 2, self.grid_size + 2), 
-                         border_radius=4, width=1)
-        
-        inner_pos = (int(self.position[0] - (self.grid_size + 2) // 2),
-                     int(self.position[1] - (self.grid_size + 2) // 2))
+        inner_pos = (int(x - (self.grid_size + 2) // 2),
+                     int(y - (self.grid_size + 2) // 2))
         surface.blit(inner_highlight, inner_pos)
 
         # 调试：绘制碰撞圆圈
         if debug_collision:
-            pygame.draw.circle(surface, (255, 0, 255),
-                               (int(self.position[0]), int(self.position[1])),
+            pygame.draw.circle(surface, (255, 0, 255), (int(x), int(y)),
                                int(self.collision_radius), 2)
 
 
+class WallRect:
+    """
+    合并墙体 - 由相邻墙格合并成的矩形，按圆与轴对齐矩形检测碰撞
+    只保存矩形几何和共享的墙格纹理，不预渲染整块图像；绘制时只平铺与目标区域相交的部分
+    （分块静态图层构建区块时调用），内存不随墙体面积增长
+    """
+
+    PADDING = 4  # 发光边框和阴影超出矩形的像素
+
+    def __init__(self, col: int, row: int, width: int, height: int, grid_size: int,
+                 cell_image: pygame.Surface):
+        """
+        创建合并墙体
+        :param col: 起始列
+        :param row: 起始行
+        :param width: 宽度（格）
+        :param height: 高度（格）
+        :param grid_size: 网格单元大小
+        :param cell_image: 单个墙格的共享图像，绘制时平铺到矩形内
+        """
+        self.grid_size = grid_size
+        self.cell_count = width * height
+        self.cell_image = cell_image
+        self.rect = pygame.Rect(col * grid_size, row * grid_size, width * grid_size, height * grid_size)
+
+        # 碰撞范围：每个墙格向内收缩到 0.4 格，与单个墙块的碰撞半径一致
+        inset = grid_size * 0.1
+        self.bounds = (self.rect.left + inset, self.rect.top + inset,
+                       self.rect.right - inset, self.rect.bottom - inset)
+
+        # 绘制覆盖的世界区域（含发光边框和阴影）
+        self.image_rect = self.rect.inflate(self.PADDING * 2, self.PADDING * 2)
+
+    def _render_area(self, area: pygame.Rect) -> pygame.Surface:
+        """
+        渲染墙体在世界区域 area 内的部分：阴影、平铺砖块、外层发光和内层高光
+        :param area: 世界区域（已裁剪到 image_rect 内）
+        :return: 与 area 同大小的图像
+        """
+        colors = Wall.EFFECT_COLORS
+        rect = self.rect.move(-area.x, -area.y)  # 矩形在局部坐标中的位置
+        image = pygame.Surface(area.size, pygame.SRCALPHA)
+        layer = pygame.Surface(area.size, pygame.SRCALPHA)
+
+        pygame.draw.rect(layer, colors['shadow'], rect.move(3, 3), border_radius=3)
+        image.blit(layer, (0, 0))
+
+        # 只平铺与区域相交的墙格
+        size = self.grid_size
+        visible = rect.clip(image.get_rect())
+        first_x = rect.x + (visible.left - rect.x) // size * size
+        first_y = rect.y + (visible.top - rect.y) // size * size
+        image.blits([(self.cell_image, (x, y))
+                     for y in range(first_y, visible.bottom, size)
+                     for x in range(first_x, visible.right, size)], doreturn=False)
+
+        layer.fill((0, 0, 0, 0))
+        pygame.draw.rect(layer, colors['glow'], rect.inflate(self.PADDING * 2, self.PADDING * 2),
+                         border_radius=7, width=3)
+        image.blit(layer, (0, 0))
+
+        layer.fill((0, 0, 0, 0))
+        pygame.draw.rect(layer, colors['highlight'], rect.inflate(2, 2), border_radius=4, width=1)
+        image.blit(layer, (0, 0))
+        return image
+
+    def check_collision(self, position: Tuple[float, float], radius: float) -> bool:
+        """
+        圆与碰撞矩形是否相交
+        :param position: 圆心
+        :param radius: 半径
+        :return: 是否发生碰撞
+        """
+        left, top, right, bottom = self.bounds
+        dx = position[0] - min(max(position[0], left), right)
+        dy = position[1] - min(max(position[1], top), bottom)
+        return dx * dx + dy * dy < radius * radius
+
+    def draw(self, surface: pygame.Surface, debug_collision: bool = False,
+             offset: Tuple[int, int] = (0, 0)) -> None:
+        """
+        绘制合并墙体（只渲染落在绘制表面内的部分）
+        :param surface: 绘制表面
+        :param debug_collision: 是否绘制碰撞区域调试信息
+        :param offset: 绘制偏移（摄像机或区块左上角的世界坐标）
+        """
+        region = pygame.Rect(offset, surface.get_size())
+        area = self.image_rect.clip(region)
+        if area.width > 0 and area.height > 0:
+            surface.blit(self._render_area(area), (area.x - offset[0], area.y - offset[1]))
+        if debug_collision:
+            self.draw_collision_debug(surface, offset)
+
+    def draw_collision_debug(self, surface: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> None:
+        """绘制碰撞矩形"""
+        left, top, right, bottom = self.bounds
+        pygame.draw.rect(surface, (255, 0, 255),
+                         (left - offset[0], top - offset[1], right - left, bottom - top), 2)
+
+
 class WallManager:
     """墙管理器 - 管理所有墙块"""
 
@@ -165,6 +340,20 @@ class WallManager:
         self.walls: List[Wall] = []
         self.config = Config.get_instance()
 
+        # 墙块空间索引：网格坐标 -> 该格内的墙块，碰撞检测只检查附近的格子
+        self._cell_index: Dict[Tuple[int, int], List[Wall]] = {}
+        self._index_dirty = False
+
+        # 从地图配置加载时的地图网格（墙体占用数组），手动添加的墙体没有
+        self.map_grid = None
+
+        # 地图墙体合并成的矩形，及其碰撞范围数组 (N, 4)：left, top, right, bottom
+        self.wall_rects: List[WallRect] = []
+        self._rect_bounds = np.zeros((0, 4), dtype=np.float64)
+        # 区块坐标 -> 与该区块相交的合并墙体下标，碰撞和绘制只处理附近区块的墙体
+        self.chunk_size = GameBalance.WORLD_CHUNK_SIZE
+        self._rect_chunks: Dict[Tuple[int, int], np.ndarray] = {}
+
     def add_wall(self, position: Tuple[float, float]) -> None:
         """
         添加单个墙块
@@ -172,6 +361,7 @@ class WallManager:
         """
         wall = Wall(position, self.wall_size)
         self.walls.append(wall)
+        self._index_dirty = True
 
     def load_from_positions(self, positions: List[Tuple[float, float]]) -> None:
         """
@@ -181,7 +371,8 @@ class WallManager:
         self.clear_walls()
         for position in positions:
             self.add_wall(position)
-        print(f"加载了 {len(positions)} 个墙块")
+        self.build_index()
+        logger.info("加载了 %s 个墙块", len(positions))
 
     def load_from_difficulty_config(self, difficulty_config: Dict[str, Any]) -> None:
         """
@@ -191,33 +382,54 @@ class WallManager:
         from ..configs.difficulty_loader import get_difficulty_loader
 
         loader = get_difficulty_loader()
-        wall_positions = loader.convert_map_to_walls(difficulty_config)
-
-        self.load_from_positions(wall_positions)
-        print(f"加载墙体配置: 网格大小={self.wall_size}px, 墙体数量={len(wall_positions)}")
+        map_grid = loader.get_map_grid(difficulty_config)
 
-    def create_border_walls(self, margin: int = 30) -> None:
+        # 相邻墙格合并为矩形，每个矩形只有一个碰撞盒，图像在构建静态图层区块时按需平铺
+        self.clear_walls()
+        cell_image = Wall.get_texture(self.wall_size)
+        self.wall_rects = [WallRect(col, row, width, height, self.wall_size, cell_image)
+                           for col, row, width, height in map_grid.wall_rects().tolist()]
+        self._rect_bounds = np.array([wall_rect.bounds for wall_rect in self.wall_rects],
+                                     dtype=np.float64).reshape(-1, 4)
+        self._build_rect_chunks()
+        self.map_grid = map_grid
+        logger.info("加载墙体配置: 网格大小=%spx, 墙体数量=%s, 合并为 %s 个矩形",
+                    self.wall_size, len(map_grid.wall_cells()), len(self.wall_rects))
+
+    def create_border_walls(self, margin: int = 30, world_size: Optional[Tuple[int, int]] = None) -> None:
         """
         创建边界墙壁
-        :param margin: 边界距离屏幕边缘的距离
+        :param margin: 边界距离世界边缘的距离
+        :param world_size: 世界大小 (宽, 高)，默认为屏幕大小
         """
         self.clear_walls()
+        world_width, world_height = world_size or (self.config.SCREEN_W, self.config.SCREEN_H)
 
         # 顶部边界
-        for x in range(margin, self.config.SCREEN_W - margin + 1, self.wall_size):
+        for x in range(margin, world_width - margin + 1, self.wall_size):
             self.add_wall((x, margin))
 
         # 底部边界
-        for x in range(margin, self.config.SCREEN_W - margin + 1, self.wall_size):
-            self.add_wall((x, self.config.SCREEN_H - margin))
+        for x in range(margin, world_width - margin + 1, self.wall_size):
+            self.add_wall((x, world_height - margin))
 
         # 左侧边界
-        for y in range(margin, self.config.SCREEN_H - margin + 1, self.wall_size):
+        for y in range(margin, world_height - margin + 1, self.wall_size):
             self.add_wall((margin, y))
 
         # 右侧边界
-        for y in range(margin, self.config.SCREEN_H - margin + 1, self.wall_size):
-            self.add_wall((self.config.SCREEN_W - margin, y))
+        for y in range(margin, world_height - margin + 1, self.wall_size):
+            self.add_wall((world_width - margin, y))
+
+    def get_world_size(self) -> Tuple[int, int]:
+        """
+        获取世界大小：有地图时为地图的像素尺寸（不小于屏幕），否则为屏幕大小
+        :return: (宽, 高)
+        """
+        if self.map_grid is None:
+            return (self.config.SCREEN_W, self.config.SCREEN_H)
+        return (max(self.map_grid.cols * self.wall_size, self.config.SCREEN_W),
+                max(self.map_grid.rows * self.wall_size, self.config.SCREEN_H))
 
     def check_collision(self, position: Tuple[float, float], radius: float) -> bool:
         """
@@ -226,22 +438,134 @@ class WallManager:
         :param radius: 检查的半径
         :return: 是否发生碰撞
         """
+        if len(self._rect_bounds) and self._check_rect_collision(position, radius):
+            return True
+        if not self.walls:
+            return False
+
+        if self._index_dirty:
+            self.build_index()
+
+        # 碰撞距离不超过 墙块碰撞半径 + 检查半径，只需检查覆盖该范围的格子
+        reach = int(math.ceil((self.wall_size * 0.4 + radius) / self.wall_size))
+        cell_x = int(position[0] // self.wall_size)
+        cell_y = int(position[1] // self.wall_size)
+        for gx in range(cell_x - reach, cell_x + reach + 1):
+            for gy in range(cell_y - reach, cell_y + reach + 1):
+                for wall in self._cell_index.get((gx, gy), ()):
+                    if wall.check_collision(position, radius):
+                        return True
+        return False
+
+    def _build_rect_chunks(self) -> None:
+        """建立区块 -> 合并墙体下标的索引（按图像区域登记，跨区块的墙体登记到每个区块）"""
+        chunks: Dict[Tuple[int, int], List[int]] = {}
+        size = self.chunk_size
+        for index, wall_rect in enumerate(self.wall_rects):
+            area = wall_rect.image_rect
+            for cy in range(area.top // size, (area.bottom - 1) // size + 1):
+                for cx in range(area.left // size, (area.right - 1) // size + 1):
+                    chunks.setdefault((cx, cy), []).append(index)
+        self._rect_chunks = {chunk: np.array(indices, dtype=np.intp) for chunk, indices in chunks.items()}
+
+    def _rects_in_region(self, left: float, top: float, right: float, bottom: float) -> np.ndarray:
+        """
+        获取登记在区域所覆盖区块中的合并墙体下标（候选集合，可能包含区域外的墙体）
+        :param left: 区域左边界
+        :param top: 区域上边界
+        :param right: 区域右边界（包含）
+        :param bottom: 区域下边界（包含）
+        :return: 下标数组
+        """
+        size = self.chunk_size
+        found = []
+        for cy in range(int(top // size), int(bottom // size) + 1):
+            for cx in range(int(left // size), int(right // size) + 1):
+                indices = self._rect_chunks.get((cx, cy))
+                if indices is not None:
+                    found.append(indices)
+        if not found:
+            return np.zeros(0, dtype=np.intp)
+        if len(found) == 1:
+            return found[0]
+        return np.unique(np.concatenate(found))
+
+    def _check_rect_collision(self, position: Tuple[float, float], radius: float) -> bool:
+        """圆与附近区块内合并墙体的碰撞矩形是否相交（一次向量化计算）"""
+        x, y = position
+        candidates = self._rects_in_region(x - radius, y - radius, x + radius, y + radius)
+        if len(candidates) == 0:
+            return False
+        bounds = self._rect_bounds[candidates]
+        dx = x - np.clip(x, bounds[:, 0], bounds[:, 2])
+        dy = y - np.clip(y, bounds[:, 1], bounds[:, 3])
+        return bool(np.any(dx * dx + dy * dy < radius * radius))
+
+    def build_index(self) -> None:
+        """重建墙块空间索引（加载墙体后自动调用，也可在后台预取时提前构建）"""
+        index: Dict[Tuple[int, int], List[Wall]] = {}
+        for wall in self.walls:
+            cell = (int(wall.position[0] // self.wall_size), int(wall.position[1] // self.wall_size))
+            index.setdefault(cell, []).append(wall)
+        self._cell_index = index
+        self._index_dirty = False
+
+    def is_near_wall(self, position: Tuple[float, float], distance: float) -> bool:
+        """
+        是否有墙块中心距离指定位置小于给定距离
+        :param position: 检查的位置
+        :param distance: 距离
+        :return: 是否靠近墙壁
+        """
+        if self.map_grid is not None and self.map_grid.is_near_wall(position[0], position[1], distance):
+            return True
+
         for wall in self.walls:
-            if wall.check_collision(position, radius):
+            if wall._calculate_distance(wall.position, position) < distance:
                 return True
         return False
 
+    def near_wall_mask(self, points: np.ndarray, distance) -> np.ndarray:
+        """
+        批量判断多个点是否靠近墙壁（判定与 is_near_wall 一致）
+        :param points: (N, 2) 的坐标数组
+        :param distance: 距离，标量或长度为 N 的数组
+        :return: bool 数组，靠近墙壁的点为True
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        distance = np.broadcast_to(np.asarray(distance, dtype=np.float64), (len(points),))
+        if self.map_grid is not None:
+            mask = self.map_grid.near_wall_mask(points[:, 0], points[:, 1], distance)
+        else:
+            mask = np.zeros(len(points), dtype=bool)
+
+        if self.walls and len(points):
+            wall_positions = np.array([wall.position for wall in self.walls], dtype=np.float64)
+            dx = points[:, 0, None] - wall_positions[None, :, 0]
+            dy = points[:, 1, None] - wall_positions[None, :, 1]
+            mask |= np.any(dx * dx + dy * dy < (distance * distance)[:, None], axis=1)
+        return mask
+
     def get_wall_positions(self) -> List[Tuple[float, float]]:
         """获取所有墙块的位置"""
-        return [wall.get_position() for wall in self.walls]
+        positions = [wall.get_position() for wall in self.walls]
+        if self.map_grid is not None:
+            positions.extend((float(x), float(y)) for x, y in self.map_grid.wall_positions().tolist())
+        return positions
 
     def clear_walls(self) -> None:
         """清除所有墙块"""
         self.walls.clear()
+        self._cell_index = {}
+        self._index_dirty = False
+        self.map_grid = None
+        self.wall_rects = []
+        self._rect_bounds = np.zeros((0, 4), dtype=np.float64)
+        self._rect_chunks = {}
 
     def get_wall_count(self) -> int:
-        """获取墙块数量"""
-        return len(self.walls)
+        """获取墙块数量（按墙格计）"""
+        return len(self.walls) + sum(wall_rect.cell_count for wall_rect in self.wall_rects)
 
     def draw(self, surface: pygame.Surface, debug_collision: bool = False) -> None:
         """
@@ -249,9 +573,42 @@ class WallManager:
         :param surface: 绘制表面
         :param debug_collision: 是否绘制碰撞区域调试信息
         """
+        for wall_rect in self.wall_rects:
+            wall_rect.draw(surface, debug_collision)
         for wall in self.walls:
             wall.draw(surface, debug_collision)
 
+    def draw_region(self, surface: pygame.Surface, region: pygame.Rect) -> None:
+        """
+        只绘制与世界区域相交的墙体（用于分块静态图层）
+        :param surface: 绘制表面，左上角对应区域左上角
+        :param region: 世界区域
+        """
+        offset = region.topleft
+        candidates = self._rects_in_region(region.left, region.top, region.right - 1, region.bottom - 1)
+        for index in candidates.tolist():
+            wall_rect = self.wall_rects[index]
+            if wall_rect.image_rect.colliderect(region):
+                wall_rect.draw(surface, offset=offset)
+
+        # 单个墙块的发光边框超出格子 4 像素
+        for wall in self.walls:
+            if wall.rect.inflate(8, 8).colliderect(region):
+                wall.draw(surface, offset=offset)
+
+    def draw_collision_debug(self, surface: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> None:
+        """
+        只绘制墙块碰撞区域（墙体本身已预渲染到静态图层时使用）
+        :param surface: 绘制表面
+        :param offset: 绘制偏移（摄像机位置）
+        """
+        for wall_rect in self.wall_rects:
+            wall_rect.draw_collision_debug(surface, offset)
+        for wall in self.walls:
+            pygame.draw.circle(surface, (255, 0, 255),
+                               (int(wall.position[0] - offset[0]), int(wall.position[1] - offset[1])),
+                               int(wall.collision_radius), 2)
+
     def update(self, dt: int) -> None:
         """
         更新墙块状态（可以添加动画效果）
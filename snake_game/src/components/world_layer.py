@@ -0,0 +1,133 @@
+"""
+分块静态图层 - 背景、网格和墙体按固定大小的区块预渲染
+只渲染视口覆盖的区块，区块图像按 LRU 缓存，大地图不会为屏幕外的内容付出代价
+"""
+from collections import OrderedDict
+from typing import Dict, Iterator, Tuple
+import pygame
+from ..configs.game_balance import GameBalance
+from ..utils.grid_utils import GridUtils
+
+
+def iter_chunks(region: pygame.Rect, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    """
+    遍历与区域相交的区块坐标
+    :param region: 世界区域
+    :param chunk_size: 区块大小（像素）
+    :return: (区块列, 区块行) 迭代器
+    """
+    if region.width <= 0 or region.height <= 0:
+        return
+    for cy in range(region.top // chunk_size, (region.bottom - 1) // chunk_size + 1):
+        for cx in range(region.left // chunk_size, (region.right - 1) // chunk_size + 1):
+            yield (cx, cy)
+
+
+class WorldLayer:
+    """分块静态图层 - 背景、网格、墙体"""
+
+    def __init__(self, world_size: Tuple[int, int], wall_manager, color_scheme: str = 'classic',
+                 chunk_size: int = GameBalance.WORLD_CHUNK_SIZE,
+                 max_chunks: int = GameBalance.WORLD_CHUNK_CACHE_SIZE):
+        """
+        创建分块静态图层
+        :param world_size: 世界大小 (宽, 高)
+        :param wall_manager: 墙管理器
+        :param color_scheme: 配色方案名称
+        :param chunk_size: 区块大小（像素）
+        :param max_chunks: 缓存的区块图像数量上限
+        """
+        self.world_width, self.world_height = world_size
+        self.wall_manager = wall_manager
+        self.colors = GameBalance.get_color_scheme(color_scheme)
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self._chunks: "OrderedDict[Tuple[int, int], pygame.Surface]" = OrderedDict()
+        self._converted: Dict[Tuple[int, int], bool] = {}
+
+    def chunk_rect(self, chunk: Tuple[int, int]) -> pygame.Rect:
+        """区块覆盖的世界区域（裁剪到世界范围内）"""
+        rect = pygame.Rect(chunk[0] * self.chunk_size, chunk[1] * self.chunk_size, self.chunk_size, self.chunk_size)
+        return rect.clip(pygame.Rect(0, 0, self.world_width, self.world_height))
+
+    def _render_chunk(self, chunk: Tuple[int, int]) -> pygame.Surface:
+        """渲染单个区块：背景、网格线、与区块相交的墙体"""
+        region = self.chunk_rect(chunk)
+        surface = pygame.Surface(region.size)
+        surface.fill(self.colors['background'])
+
+        grid_size = GridUtils.GRID_SIZE
+        grid_color = self.colors['grid']
+        first_x = -(-region.left // grid_size) * grid_size
+        first_y = -(-region.top // grid_size) * grid_size
+        for x in range(first_x, region.right, grid_size):
+            pygame.draw.line(surface, grid_color, (x - region.left, 0), (x - region.left, region.height))
+        for y in range(first_y, region.bottom, grid_size):
+            pygame.draw.line(surface, grid_color, (0, y - region.top), (region.width, y - region.top))
+
+        self.wall_manager.draw_region(surface, region)
+        return surface
+
+    def get_chunk(self, chunk: Tuple[int, int]) -> pygame.Surface:
+        """
+        获取区块图像，未缓存时渲染并按 LRU 淘汰最久未使用的区块
+        :param chunk: (区块列, 区块行)
+        :return: 区块图像
+        """
+        surface = self._chunks.get(chunk)
+        if surface is not None:
+            self._chunks.move_to_end(chunk)
+            if not self._converted.get(chunk) and pygame.display.get_surface() is not None:
+                # 后台线程预渲染的区块在主线程首次使用时转换为显示格式
+                surface = surface.convert()
+                self._chunks[chunk] = surface
+                self._converted[chunk] = True
+            return surface
+
+        surface = self._render_chunk(chunk)
+        converted = pygame.display.get_surface() is not None
+        if converted:
+            surface = surface.convert()
+        self._chunks[chunk] = surface
+        self._converted[chunk] = converted
+        while len(self._chunks) > self.max_chunks:
+            evicted, _ = self._chunks.popitem(last=False)
+            self._converted.pop(evicted, None)
+        return surface
+
+    def prewarm(self, region: pygame.Rect) -> None:
+        """
+        预渲染覆盖指定区域的区块（可在后台线程中调用，转换推迟到主线程）
+        :param region: 世界区域
+        """
+        for chunk in iter_chunks(region, self.chunk_size):
+            if chunk not in self._chunks:
+                self._chunks[chunk] = self._render_chunk(chunk)
+                self._converted[chunk] = False
+        while len(self._chunks) > self.max_chunks:
+            evicted, _ = self._chunks.popitem(last=False)
+            self._converted.pop(evicted, None)
+
+    def invalidate(self) -> None:
+        """清空区块缓存（墙体变化后调用）"""
+        self._chunks.clear()
+        self._converted.clear()
+
+    def draw(self, surface: pygame.Surface, camera) -> None:
+        """
+        绘制视口覆盖的区块
+        :param surface: 绘制表面（屏幕）
+        :param camera: 摄像机
+        """
+        view = camera.view_rect
+        offset_x, offset_y = camera.offset
+        blit_list = []
+        for chunk in iter_chunks(view, self.chunk_size):
+            position = (chunk[0] * self.chunk_size - offset_x, chunk[1] * self.chunk_size - offset_y)
+            blit_list.append((self.get_chunk(chunk), position))
+        surface.blits(blit_list, doreturn=False)
+
+    @property
+    def cached_chunk_count(self) -> int:
+        """当前缓存的区块数量"""
+        return len(self._chunks)
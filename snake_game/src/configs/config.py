@@ -17,6 +17,10 @@ class Config:
 
     # 游戏帧率
     FPS = 60
+    # 空闲时的帧率：界面没有动画时阻塞等待事件，最长等待 1000 / IDLE_FPS 毫秒
+    IDLE_FPS = 4
+    # 菜单无操作超过该时间（毫秒）后停止装饰性动画，进入空闲
+    IDLE_AFTER_MS = 3000
 
     def __init__(self):
         # 是否在游戏主界面
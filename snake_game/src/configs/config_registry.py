@@ -0,0 +1,268 @@
+"""
+配置注册表
+统一扫描、缓存关卡和难度JSON配置，按文件修改时间和大小自动失效
+存在同名的编译文件（.lvlb，见 level_compiler）且文件头中记录的源文件指纹（大小、修改时间、内容哈希）与JSON一致时，优先读取编译文件
+"""
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from .level_compiler import SourceFingerprint, get_compiled_path, hash_source, load_compiled
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 配置类别 -> 配置目录
+CONFIG_DIRS = {
+    'level': os.path.join(os.path.dirname(__file__), 'level'),
+    'difficulty': os.path.join(os.path.dirname(__file__), 'difficulty'),
+}
+
+# 元数据索引中保留的轻量字段
+METADATA_KEYS = ('name', 'description', 'target_score', 'difficulty')
+
+
+class ConfigEntry:
+    """单个配置文件的缓存条目"""
+
+    def __init__(self, name: str, path: str):
+        self.name = name  # 配置名称（文件名去掉 .json）
+        self.path = path
+        self.mtime = None  # 解析时的文件修改时间
+        self.size = None  # 解析时的文件大小
+        self.config: Optional[Dict[str, Any]] = None  # 解析结果，无效配置为None
+        self.metadata: Optional[Dict[str, Any]] = None  # 轻量元数据
+
+    def is_stale(self, stat: os.stat_result) -> bool:
+        """文件在解析后是否被修改"""
+        return self.mtime != stat.st_mtime_ns or self.size != stat.st_size
+
+
+class ConfigRegistry:
+    """配置注册表 - 目录只扫描一次，配置按名称 O(1) 查找"""
+
+    def __init__(self):
+        self._lock = threading.RLock()  # 后台加载线程也会读取配置
+        self._entries: Dict[str, Dict[str, ConfigEntry]] = {kind: {} for kind in CONFIG_DIRS}
+        self._names: Dict[str, List[str]] = {kind: [] for kind in CONFIG_DIRS}
+        self._positions: Dict[str, Dict[str, int]] = {kind: {} for kind in CONFIG_DIRS}
+        self._dir_mtimes: Dict[str, Optional[int]] = {kind: None for kind in CONFIG_DIRS}
+        self._validators: Dict[str, Callable[[Dict[str, Any]], bool]] = {}
+
+    def register_validator(self, kind: str, validator: Callable[[Dict[str, Any]], bool]) -> None:
+        """
+        注册配置校验函数，未通过校验的配置视为无效
+        :param kind: 配置类别 (level, difficulty)
+        :param validator: 校验函数 validator(config) -> bool
+        """
+        with self._lock:
+            self._validators[kind] = validator
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        """
+        将文件路径或文件名转换为配置名称 (src/configs/level/level_01.json -> level_01)
+        :param name: 配置名称、文件名或路径
+        :return: 配置名称
+        """
+        name = os.path.basename(name)
+        if name.endswith('.json'):
+            name = name[:-5]
+        return name
+
+    def _scan(self, kind: str) -> None:
+        """扫描配置目录（目录修改时间不变时跳过）"""
+        config_dir = CONFIG_DIRS[kind]
+        try:
+            dir_mtime = os.stat(config_dir).st_mtime_ns
+        except OSError:
+            dir_mtime = None
+
+        if dir_mtime is not None and dir_mtime == self._dir_mtimes[kind]:
+            return
+        self._dir_mtimes[kind] = dir_mtime
+
+        names = []
+        if dir_mtime is not None:
+            names = sorted(self.normalize_name(filename) for filename in os.listdir(config_dir)
+                           if filename.endswith('.json'))
+
+        entries = self._entries[kind]
+        for name in list(entries):
+            if name not in names:
+                del entries[name]
+        for name in names:
+            if name not in entries:
+                entries[name] = ConfigEntry(name, os.path.join(config_dir, f"{name}.json"))
+
+        self._names[kind] = names
+        self._positions[kind] = {name: index for index, name in enumerate(names)}
+
+    def _refresh(self, kind: str, entry: ConfigEntry) -> None:
+        """文件被修改时重新解析配置"""
+        try:
+            stat = os.stat(entry.path)
+        except OSError:
+            entry.config = None
+            entry.metadata = None
+            entry.mtime = entry.size = None
+            return
+
+        if not entry.is_stale(stat):
+            return
+
+        entry.mtime = stat.st_mtime_ns
+        entry.size = stat.st_size
+        entry.config = None
+        entry.metadata = None
+
+        try:
+            with open(entry.path, 'rb') as f:
+                raw = f.read()
+            source = SourceFingerprint(len(raw), stat.st_mtime_ns, hash_source(raw))
+            config = self._load_compiled(entry.path, source)
+            if config is None:
+                config = json.loads(raw.decode('utf-8'))
+        except json.JSONDecodeError as e:
+            logger.error("错误: 解析配置文件 %s 失败: %s", entry.path, e)
+            return
+        except Exception as e:
+            logger.error("错误: 加载配置文件 %s 失败: %s", entry.path, e)
+            return
+
+        validator = self._validators.get(kind)
+        if validator is not None and not validator(config):
+            logger.error("错误: 配置文件 %s 格式无效", entry.path)
+            return
+
+        entry.config = config
+        entry.metadata = {key: config.get(key) for key in METADATA_KEYS}
+        entry.metadata['file_name'] = os.path.basename(entry.path)
+        entry.metadata['file_path'] = entry.path
+        entry.metadata['key'] = entry.name
+        logger.info("成功加载配置: %s (%s)", config.get('name', entry.name), entry.path)
+
+    @staticmethod
+    def _load_compiled(json_path: str, source: SourceFingerprint) -> Optional[Dict[str, Any]]:
+        """
+        存在与JSON一致的编译文件时，直接读取编译文件（地图为 NumPy 数组）
+        :param json_path: JSON配置文件路径
+        :param source: JSON配置文件的指纹
+        :return: 配置字典，没有可用的编译文件时返回None
+        """
+        compiled_path = get_compiled_path(json_path)
+        try:
+            return load_compiled(compiled_path, source)
+        except OSError:
+            return None
+        except ValueError as e:
+            logger.warning("编译关卡文件无效，改用JSON: %s (%s)", compiled_path, e)
+            return None
+
+    def _get_entry(self, kind: str, name: str) -> Optional[ConfigEntry]:
+        """获取已刷新的配置条目"""
+        self._scan(kind)
+        entry = self._entries[kind].get(self.normalize_name(name))
+        if entry is None:
+            return None
+        self._refresh(kind, entry)
+        return entry
+
+    def get_config(self, kind: str, name: str) -> Optional[Dict[str, Any]]:
+        """
+        获取配置
+        返回缓存的浅拷贝：调用方增删、替换字段不会影响其他使用者；
+        嵌套的字典和地图数组仍与缓存共享（地图网格缓存按地图对象查找），不要原地修改
+        :param kind: 配置类别 (level, difficulty)
+        :param name: 配置名称（也接受文件名或路径）
+        :return: 配置字典，不存在或无效时返回None
+        """
+        with self._lock:
+            entry = self._get_entry(kind, name)
+            return dict(entry.config) if entry and entry.config is not None else None
+
+    def get_metadata(self, kind: str, name: str) -> Optional[Dict[str, Any]]:
+        """
+        获取配置的轻量元数据（名称、描述、目标分数、难度、文件信息）
+        :param kind: 配置类别
+        :param name: 配置名称
+        :return: 元数据字典（缓存的拷贝），不存在或无效时返回None
+        """
+        with self._lock:
+            entry = self._get_entry(kind, name)
+            return dict(entry.metadata) if entry and entry.metadata is not None else None
+
+    def get_names(self, kind: str) -> List[str]:
+        """
+        获取某类别下所有配置名称（按名称排序）
+        :param kind: 配置类别
+        :return: 配置名称列表
+        """
+        with self._lock:
+            self._scan(kind)
+            return list(self._names[kind])
+
+    def get_all_metadata(self, kind: str) -> List[Dict[str, Any]]:
+        """
+        获取某类别下所有有效配置的元数据（按名称排序）
+        :param kind: 配置类别
+        :return: 元数据列表
+        """
+        with self._lock:
+            self._scan(kind)
+            result = []
+            for name in self._names[kind]:
+                metadata = self.get_metadata(kind, name)
+                if metadata:
+                    result.append(metadata)
+            return result
+
+    def get_index(self, kind: str, name: str) -> int:
+        """
+        获取配置在排序列表中的位置
+        :param kind: 配置类别
+        :param name: 配置名称
+        :return: 位置索引，不存在时返回-1
+        """
+        with self._lock:
+            self._scan(kind)
+            return self._positions[kind].get(self.normalize_name(name), -1)
+
+    def get_neighbour(self, kind: str, name: str, offset: int) -> Optional[str]:
+        """
+        获取相邻的配置名称（用于上一关/下一关导航）
+        :param kind: 配置类别
+        :param name: 当前配置名称
+        :param offset: 偏移量（1 为下一个，-1 为上一个）
+        :return: 相邻配置名称，超出范围时返回None
+        """
+        with self._lock:
+            index = self.get_index(kind, name)
+            if index < 0:
+                return None
+            target = index + offset
+            names = self._names[kind]
+            return names[target] if 0 <= target < len(names) else None
+
+    def invalidate(self, kind: Optional[str] = None) -> None:
+        """
+        清除缓存，下次访问时重新扫描和解析
+        :param kind: 配置类别，None 表示全部
+        """
+        with self._lock:
+            kinds = [kind] if kind else list(CONFIG_DIRS)
+            for item in kinds:
+                self._entries[item].clear()
+                self._dir_mtimes[item] = None
+
+
+# 全局实例
+_config_registry = None
+
+
+def get_config_registry() -> ConfigRegistry:
+    """获取配置注册表的全局实例"""
+    global _config_registry
+    if _config_registry is None:
+        _config_registry = ConfigRegistry()
+    return _config_registry
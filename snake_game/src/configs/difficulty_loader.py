@@ -2,11 +2,17 @@
 难度配置加载器
 用于加载和管理不同难度的JSON配置文件
 """
-import json
 import os
-from typing import Dict, Any, Optional
+import threading
+import numpy as np
+from typing import Dict, Any, Optional, Tuple
 from ..utils.grid_utils import GridUtils
 from ..configs.game_balance import GameBalance
+from .config_registry import CONFIG_DIRS, get_config_registry
+from .map_grid import MapGrid, MARKER_SNAKE_HEAD, validate_map
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class DifficultyLoader:
@@ -14,43 +20,24 @@ class DifficultyLoader:
 
     def __init__(self):
         self.grid_size = GameBalance.GRID_SIZE  # 网格单元大小
-        self.config_dir = os.path.join(os.path.dirname(__file__), 'difficulty')
-        self.loaded_configs = {}
+        self.config_dir = CONFIG_DIRS['difficulty']
+        self.registry = get_config_registry()
+        self.registry.register_validator('difficulty', self._validate_config)
+
+        # 地图网格缓存：id(map) -> (map, MapGrid)，后台加载线程也会访问
+        self._map_grids: Dict[int, Tuple[Any, MapGrid]] = {}
+        self._map_lock = threading.Lock()
 
     def load_difficulty_config(self, difficulty_name: str) -> Optional[Dict[str, Any]]:
         """
-        加载指定难度的配置文件
+        加载指定难度的配置文件（由配置注册表缓存，文件修改后自动重新加载）
         :param difficulty_name: 难度名称 (easy, hard, hell)
         :return: 配置字典或None
         """
-        if difficulty_name in self.loaded_configs:
-            return self.loaded_configs[difficulty_name]
-
-        config_file = os.path.join(self.config_dir, f"{difficulty_name}.json")
-
-        if not os.path.exists(config_file):
-            print(f"警告: 配置文件 {config_file} 不存在")
-            return None
-
-        try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
-            # 验证配置格式
-            if self._validate_config(config):
-                self.loaded_configs[difficulty_name] = config
-                print(f"成功加载难度配置: {config['name']}")
-                return config
-            else:
-                print(f"错误: 配置文件 {config_file} 格式无效")
-                return None
-
-        except json.JSONDecodeError as e:
-            print(f"错误: 解析配置文件 {config_file} 失败: {e}")
-            return None
-        except Exception as e:
-            print(f"错误: 加载配置文件 {config_file} 失败: {e}")
-            return None
+        config = self.registry.get_config('difficulty', difficulty_name)
+        if config is None and self.registry.get_index('difficulty', difficulty_name) < 0:
+            logger.warning("警告: 配置文件 %s 不存在", os.path.join(self.config_dir, f"{difficulty_name}.json"))
+        return config
 
     def _validate_config(self, config: Dict[str, Any]) -> bool:
         """
@@ -62,9 +49,14 @@ class DifficultyLoader:
 
         for key in required_keys:
             if key not in config:
-                print(f"配置验证失败: 缺少必需字段 '{key}'")
+                logger.warning("配置验证失败: 缺少必需字段 '%s'", key)
                 return False
 
+        map_error = validate_map(config['map'])
+        if map_error:
+            logger.warning("配置验证失败: %s", map_error)
+            return False
+
         return True
 
     def get_available_difficulties(self) -> list:
@@ -72,34 +64,35 @@ class DifficultyLoader:
         获取所有可用的难度配置
         :return: 难度名称列表
         """
-        difficulties = []
-        if os.path.exists(self.config_dir):
-            for filename in os.listdir(self.config_dir):
-                if filename.endswith('.json'):
-                    difficulty_name = filename[:-5]  # 移除 .json 扩展名
-                    difficulties.append(difficulty_name)
-        return sorted(difficulties)
-
-    def convert_map_to_walls(self, config: Dict[str, Any]):
+        return self.registry.get_names('difficulty')
+
+    def get_map_grid(self, config: Dict[str, Any]) -> MapGrid:
+        """
+        获取配置对应的地图网格（每张地图只转换一次）
+        :param config: 难度或关卡配置
+        :return: 地图网格（墙体占用数组 + 特殊标记坐标）
+        """
+        map_data = config.get('map', [])
+        key = id(map_data)
+        with self._map_lock:
+            cached = self._map_grids.get(key)
+            # 缓存中保留地图对象本身，保证 id 不会被复用
+            if cached is not None and cached[0] is map_data:
+                return cached[1]
+
+            if len(self._map_grids) >= 64:
+                self._map_grids.clear()
+            map_grid = MapGrid(map_data, self.grid_size)
+            self._map_grids[key] = (map_data, map_grid)
+            return map_grid
+
+    def convert_map_to_walls(self, config: Dict[str, Any]) -> np.ndarray:
         """
-        将地图数据转换为墙体位置列表
+        将地图数据转换为墙体位置
         :param config: 难度配置
-        :return: (墙体位置列表, 网格单元大小) -> ([(x, y), ...], grid_size)
+        :return: 墙块中心像素坐标，(N, 2) 的数组
         """
-        wall_positions = []
-        map_data = config['map']
-
-        start_x = 0
-        start_y = 0
-
-        for row_idx, row in enumerate(map_data):
-            for col_idx, cell in enumerate(row):
-                if cell == 1:  # 1 表示墙壁
-                    x = start_x + col_idx * self.grid_size + self.grid_size // 2
-                    y = start_y + row_idx * self.grid_size + self.grid_size // 2
-                    wall_positions.append((x, y))
-
-        return wall_positions
+        return self.get_map_grid(config).wall_positions()
 
     def get_snake_initial_position(self, config: Dict[str, Any]) -> tuple:
         """
@@ -116,7 +109,30 @@ class DifficultyLoader:
         x = start_x + initial_pos[0] * self.grid_size + self.grid_size // 2
         y = start_y + initial_pos[1] * self.grid_size + self.grid_size // 2
 
-        return (x, y)
+        return self.resolve_spawn_position(config, (x, y), GameBalance.SMOOTH_COLLISION_RADIUS)
+
+    def resolve_spawn_position(self, config: Dict[str, Any], position: tuple, radius: float) -> tuple:
+        """
+        校验出生位置：与墙壁重叠时改用地图中的蛇头标记（10），没有标记时使用最近的空地
+        :param config: 难度或关卡配置
+        :param position: 配置中的出生位置 (x, y)
+        :param radius: 碰撞半径
+        :return: (x, y) 坐标
+        """
+        map_grid = self.get_map_grid(config)
+        x, y = position
+        if not map_grid.is_near_wall(x, y, radius + map_grid.grid_size * 0.4):
+            return (x, y)
+
+        cell = map_grid.get_marker(MARKER_SNAKE_HEAD)
+        if cell is None:
+            cell = map_grid.find_nearest_free_cell(*map_grid.cell_at(x, y))
+        if cell is None:
+            return (x, y)
+
+        resolved = map_grid.cell_center(*cell)
+        logger.warning("警告: 出生位置 %s 与墙壁重叠，改用 %s", (x, y), resolved)
+        return resolved
 
 
 # 全局实例
@@ -22,6 +22,9 @@ class GameBalance:
     FOOD_SIZE = 25  # 食物尺寸
     MAX_FOOD_COUNT = 1  # 同时存在的食物数量
     FOOD_GENERATION_PIXEL = 50  # 食物生成时的边缘留白像素数（增加边距避免靠近墙壁）
+    FOOD_INDEX_CELL_SIZE = 64  # 食物空间索引的格子大小（像素），需大于食物与蛇头碰撞半径之和
+    FOOD_SPAWN_ROUNDS = 10  # 批量生成食物时的最大采样轮数
+    FOOD_SPAWN_OVERSAMPLE = 4  # 每轮为每个待生成的食物采样的候选位置数
 
     # 蛇的初始配置
     INITIAL_BODY_SEGMENTS = 3  # 初始身体段数
@@ -37,6 +40,18 @@ class GameBalance:
 
     SMOOTH_BOOST_MULTIPLIER = 2.0  # 加速倍数
 
+    # 关卡预取配置
+    LEVEL_PREFETCH_FRACTION = 0.5  # 得分达到目标分数的该比例时，后台预取下一关
+
+    # 世界分块配置（地图可以大于屏幕，摄像机跟随蛇头滚动）
+    WORLD_CHUNK_SIZE = 400  # 静态图层和墙体索引的区块大小（像素）
+    WORLD_CHUNK_CACHE_SIZE = 24  # 最多缓存的区块图像数量，超出时淘汰最久未使用的区块
+
+    # 寻路配置（自动驾驶、提示箭头、食物可达性检查）
+    PATHFINDING_FRAME_BUDGET_MS = 1.0  # 每帧重新计算距离场的时间预算（毫秒）
+    PATHFINDING_MAX_FIELDS = 4  # 最多同时维护距离场的目标（食物）数量
+    PATHFINDING_WALL_CLEARANCE = 12.0  # 路径与墙体保持的额外距离（像素），约为蛇头碰撞半径，紧贴墙的格子不走
+
     # 食物类型配置
     FOOD_TYPES = {
         "food0": {  # 苹果
@@ -53,18 +68,31 @@ class GameBalance:
         }
     }
 
+    _food_type_table = None  # 食物类型别名表缓存，见 get_food_type_table
+
     @classmethod
     def get_food_config(cls, food_name: str):
         """获取食物配置"""
         return cls.FOOD_TYPES.get(food_name, cls.FOOD_TYPES["food0"])
 
+    @classmethod
+    def get_food_type_table(cls):
+        """
+        获取食物类型的别名表（按 FOOD_TYPES 顺序，首次使用时构建并缓存）
+        运行时修改 FOOD_TYPES 后需将 _food_type_table 置为 None
+        :return: (食物类型名称列表, AliasTable)
+        """
+        if cls._food_type_table is None:
+            from ..utils.alias_table import AliasTable
+            names = list(cls.FOOD_TYPES.keys())
+            cls._food_type_table = (names, AliasTable([cls.FOOD_TYPES[name]["weight"] for name in names]))
+        return cls._food_type_table
+
     @classmethod
     def get_random_food_type(cls):
         """根据权重随机选择食物类型"""
-        import random
-        food_types = list(cls.FOOD_TYPES.keys())
-        weights = [cls.FOOD_TYPES[food]["weight"] for food in food_types]
-        return random.choices(food_types, weights=weights, k=1)[0]
+        names, table = cls.get_food_type_table()
+        return names[table.sample()]
 
     @classmethod
     def calculate_speed_increase(cls, score: int) -> int:
@@ -0,0 +1,306 @@
+"""
+关卡编译器
+将JSON关卡/难度配置编译为紧凑的二进制格式（游程编码地图 + 配置头），
+加载时通过 mmap 直接解码为 NumPy 数组，不构建 Python 列表。
+JSON 仍然是编写关卡的格式，编译结果与 JSON 放在同一目录，扩展名为 .lvlb。
+
+文件格式（小端序）：
+    文件头  struct '<4sHHHIIQq16s'  魔数 b'SNKL'、版本、地图行数、地图列数、配置头长度、游程数量、
+            源JSON的大小、修改时间(纳秒)、内容哈希(blake2b-128)
+    配置头  UTF-8 JSON（除 map 以外的全部字段：snake、food、game_settings 等）
+    地图    游程数组，每项 (格子值 uint8, 连续长度 uint16)，按行优先展开
+
+用法：
+    python -m src.configs.level_compiler                 # 编译 level/ 和 difficulty/ 下全部配置
+    python -m src.configs.level_compiler a.json b.json   # 编译指定文件
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional
+import numpy as np
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+COMPILED_EXTENSION = '.lvlb'
+MAGIC = b'SNKL'
+VERSION = 2
+HEADER_FORMAT = '<4sHHHIIQq16s'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+RUN_DTYPE = np.dtype([('value', '<u1'), ('length', '<u2')])  # 无填充，每项3字节
+MAX_RUN_LENGTH = np.iinfo(np.uint16).max
+
+WALL_CELL = 1  # 地图中的墙壁格子
+DIGEST_SIZE = 16
+
+
+class SourceFingerprint(NamedTuple):
+    """源JSON文件的指纹，写入编译文件头，用于判断编译文件是否过期"""
+    size: int
+    mtime_ns: int
+    digest: bytes
+
+
+NO_SOURCE = SourceFingerprint(0, 0, bytes(DIGEST_SIZE))
+
+
+def hash_source(data: bytes) -> bytes:
+    """
+    计算源JSON内容的哈希
+    :param data: 文件内容
+    :return: DIGEST_SIZE 字节的摘要
+    """
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+def get_compiled_path(json_path: str) -> str:
+    """
+    获取JSON配置对应的编译文件路径
+    :param json_path: JSON配置文件路径
+    :return: 编译文件路径
+    """
+    return os.path.splitext(json_path)[0] + COMPILED_EXTENSION
+
+
+def encode_runs(grid: np.ndarray) -> np.ndarray:
+    """
+    对地图进行游程编码
+    :param grid: 二维地图数组（值为0~255的整数）
+    :return: RUN_DTYPE 结构化数组
+    """
+    flat = np.ascontiguousarray(grid, dtype=np.uint8).ravel()
+    if flat.size == 0:
+        return np.zeros(0, dtype=RUN_DTYPE)
+
+    # 找出值发生变化的位置，得到每段的起点和长度
+    starts = np.flatnonzero(np.concatenate(([True], flat[1:] != flat[:-1])))
+    lengths = np.diff(np.append(starts, flat.size))
+    values = flat[starts]
+
+    # 超长的段拆分为多个不超过 uint16 上限的段
+    if lengths.max() > MAX_RUN_LENGTH:
+        pieces = (lengths + MAX_RUN_LENGTH - 1) // MAX_RUN_LENGTH
+        values = np.repeat(values, pieces)
+        split = np.full(int(pieces.sum()), MAX_RUN_LENGTH, dtype=np.int64)
+        last = np.cumsum(pieces) - 1
+        split[last] = lengths - (pieces - 1) * MAX_RUN_LENGTH
+        lengths = split
+
+    runs = np.empty(len(values), dtype=RUN_DTYPE)
+    runs['value'] = values
+    runs['length'] = lengths
+    return runs
+
+
+def compile_config(config: Dict[str, Any], source: SourceFingerprint = NO_SOURCE) -> bytes:
+    """
+    将配置字典编译为二进制数据
+    :param config: 关卡或难度配置（必须包含 map）
+    :param source: 源JSON文件的指纹，默认全零（不对应任何源文件）
+    :return: 编译后的字节串
+    """
+    grid = np.asarray(config['map'])
+    if grid.ndim != 2:
+        raise ValueError("地图必须是二维数组")
+    if grid.size and (grid.min() < 0 or grid.max() > 255):
+        raise ValueError("地图格子值必须在 0~255 之间")
+
+    meta = {key: value for key, value in config.items() if key != 'map'}
+    meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    runs = encode_runs(grid)
+
+    header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, grid.shape[0], grid.shape[1], len(meta_bytes), len(runs),
+                         source.size, source.mtime_ns, source.digest)
+    return header + meta_bytes + runs.tobytes()
+
+
+def compile_file(json_path: str, output_path: Optional[str] = None) -> str:
+    """
+    编译单个JSON配置文件
+    :param json_path: JSON配置文件路径
+    :param output_path: 输出路径，默认与JSON同目录
+    :return: 输出文件路径
+    """
+    output_path = output_path or get_compiled_path(json_path)
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+        stat = os.fstat(f.fileno())
+    config = json.loads(raw.decode('utf-8'))
+
+    source = SourceFingerprint(len(raw), stat.st_mtime_ns, hash_source(raw))
+    data = compile_config(config, source)
+    with open(output_path, 'wb') as f:
+        f.write(data)
+
+    logger.info("编译关卡: %s -> %s (%s -> %s 字节)",
+                json_path, output_path, len(raw), len(data))
+    return output_path
+
+
+class CompiledLevel:
+    """编译关卡 - 通过 mmap 只读访问二进制关卡文件"""
+
+    def __init__(self, path: str):
+        """
+        打开编译关卡文件
+        :param path: .lvlb 文件路径
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            (magic, version, rows, cols, meta_len, run_count,
+             source_size, source_mtime_ns, source_digest) = struct.unpack_from(HEADER_FORMAT, self._mmap, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"不支持的关卡文件格式: {path}")
+            self.rows = rows
+            self.cols = cols
+            self.source = SourceFingerprint(source_size, source_mtime_ns, source_digest)
+            self._meta_offset = HEADER_SIZE
+            self._meta_len = meta_len
+            self._runs_offset = HEADER_SIZE + meta_len
+            self._run_count = run_count
+            if self._runs_offset + run_count * RUN_DTYPE.itemsize > len(self._mmap):
+                raise ValueError(f"关卡文件已损坏: {path}")
+        except struct.error as e:
+            self._mmap.close()
+            raise ValueError(f"关卡文件已损坏: {path}") from e
+        except Exception:
+            self._mmap.close()
+            raise
+
+        self._meta: Optional[Dict[str, Any]] = None
+
+    @property
+    def shape(self):
+        """地图尺寸 (行数, 列数)"""
+        return (self.rows, self.cols)
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        """配置头（除地图以外的全部配置）"""
+        if self._meta is None:
+            raw = self._mmap[self._meta_offset:self._meta_offset + self._meta_len]
+            self._meta = json.loads(raw.decode('utf-8'))
+        return self._meta
+
+    def runs(self) -> np.ndarray:
+        """游程数组（直接映射文件内容，零拷贝）"""
+        return np.frombuffer(self._mmap, dtype=RUN_DTYPE, count=self._run_count, offset=self._runs_offset)
+
+    def grid(self) -> np.ndarray:
+        """
+        解码完整地图
+        :return: (行数, 列数) 的 uint8 数组
+        """
+        runs = self.runs()
+        grid = np.repeat(runs['value'], runs['length'].astype(np.intp))
+        if grid.size != self.rows * self.cols:
+            raise ValueError(f"关卡文件已损坏: {self.path}")
+        return grid.reshape(self.rows, self.cols)
+
+    def occupancy(self) -> np.ndarray:
+        """
+        墙体占用数组
+        :return: (行数, 列数) 的 bool 数组，墙壁格子为True
+        """
+        return self.grid() == WALL_CELL
+
+    def wall_cells(self) -> np.ndarray:
+        """
+        墙体格子坐标（直接从游程计算，不展开整张地图）
+        :return: (N, 2) 的 int 数组，每行为 (列, 行)
+        """
+        runs = self.runs()
+        lengths = runs['length'].astype(np.intp)
+        ends = np.cumsum(lengths)
+        mask = runs['value'] == WALL_CELL
+        wall_lengths = lengths[mask]
+        if wall_lengths.size == 0:
+            return np.zeros((0, 2), dtype=np.intp)
+
+        # 展开每个墙体游程覆盖的线性下标
+        wall_starts = (ends - lengths)[mask]
+        offsets = np.arange(int(wall_lengths.sum())) - np.repeat(np.cumsum(wall_lengths) - wall_lengths, wall_lengths)
+        indices = np.repeat(wall_starts, wall_lengths) + offsets
+        rows, cols = np.divmod(indices, self.cols)
+        return np.column_stack((cols, rows))
+
+    def wall_positions(self, grid_size: int) -> np.ndarray:
+        """
+        墙块中心的像素坐标
+        :param grid_size: 网格单元大小
+        :return: (N, 2) 的 float 数组
+        """
+        return self.wall_cells() * float(grid_size) + grid_size // 2
+
+    def matches_source(self, source: SourceFingerprint) -> bool:
+        """
+        编译文件是否由给定的源JSON生成
+        大小和内容哈希必须一致；只有修改时间不同（例如重新检出后内容未变）时仍然有效
+        :param source: 当前源文件的指纹
+        :return: 是否与源文件一致
+        """
+        if self.source == source:
+            return True
+        if self.source.size == source.size and self.source.digest == source.digest:
+            logger.debug("源文件修改时间变化但内容未变，继续使用编译文件: %s", self.path)
+            return True
+        return False
+
+    def to_config(self) -> Dict[str, Any]:
+        """
+        转换为与JSON等价的配置字典（地图为 NumPy 数组）
+        :return: 配置字典
+        """
+        config = dict(self.meta)
+        config['map'] = self.grid()
+        return config
+
+    def close(self) -> None:
+        """关闭文件映射"""
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def load_compiled(path: str, source: Optional[SourceFingerprint] = None) -> Optional[Dict[str, Any]]:
+    """
+    读取编译关卡文件为配置字典
+    :param path: .lvlb 文件路径
+    :param source: 当前源JSON的指纹，给出时编译文件与之不一致则返回None
+    :return: 配置字典（地图为 NumPy 数组）
+    """
+    with CompiledLevel(path) as level:
+        if source is not None and not level.matches_source(source):
+            return None
+        return level.to_config()
+
+
+def main(argv: List[str]) -> int:
+    """命令行入口：编译指定的JSON文件，未指定时编译全部关卡和难度配置"""
+    paths = argv
+    if not paths:
+        config_root = os.path.dirname(__file__)
+        for folder in ('level', 'difficulty'):
+            directory = os.path.join(config_root, folder)
+            paths.extend(os.path.join(directory, name) for name in sorted(os.listdir(directory))
+                         if name.endswith('.json'))
+
+    for path in paths:
+        compile_file(path)
+    logger.info("编译完成: %s 个配置文件", len(paths))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
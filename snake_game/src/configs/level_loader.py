@@ -2,53 +2,33 @@
 关卡配置加载器
 用于加载和管理关卡配置文件
 """
-import json
-import os
 from typing import Dict, Any, Optional, List
 from .difficulty_loader import get_difficulty_loader
+from .config_registry import CONFIG_DIRS, get_config_registry
+from .map_grid import validate_map
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class LevelLoader:
     """关卡配置加载器"""
 
     def __init__(self):
-        self.config_dir = 'src/configs/level'
-        self.loaded_levels = {}
+        self.config_dir = CONFIG_DIRS['level']
+        self.registry = get_config_registry()
+        self.registry.register_validator('level', self._validate_config)
 
     def load_level_config(self, level_name: str) -> Optional[Dict[str, Any]]:
         """
-        加载指定关卡的配置文件
-        :param level_name: 关卡名称 (level_01, level_02, etc.)
+        加载指定关卡的配置文件（由配置注册表缓存，文件修改后自动重新加载）
+        :param level_name: 关卡名称 (level_01, level_02, etc.)，也接受文件路径
         :return: 配置字典或None
         """
-        if level_name in self.loaded_levels:
-            return self.loaded_levels[level_name]
-
-        config_file = os.path.join(level_name)
-
-        if not os.path.exists(config_file):
-            print(f"警告: 关卡配置文件 {config_file} 不存在")
-            return None
-
-        try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
-            # 验证配置格式
-            if self._validate_config(config):
-                self.loaded_levels[level_name] = config
-                print(f"成功加载关卡配置: {config['name']}")
-                return config
-            else:
-                print(f"错误: 关卡配置文件 {config_file} 格式无效")
-                return None
-
-        except json.JSONDecodeError as e:
-            print(f"错误: 解析关卡配置文件 {config_file} 失败: {e}")
-            return None
-        except Exception as e:
-            print(f"错误: 加载关卡配置文件 {config_file} 失败: {e}")
-            return None
+        config = self.registry.get_config('level', level_name)
+        if config is None and self.registry.get_index('level', level_name) < 0:
+            logger.warning("警告: 关卡配置文件 %s 不存在", level_name)
+        return config
 
     def _validate_config(self, config: Dict[str, Any]) -> bool:
         """
@@ -60,12 +40,17 @@ class LevelLoader:
 
         for key in required_keys:
             if key not in config:
-                print(f"关卡配置验证失败: 缺少必需字段 '{key}'")
+                logger.warning("关卡配置验证失败: 缺少必需字段 '%s'", key)
                 return False
 
         # 验证目标分数是正整数
         if not isinstance(config['target_score'], int) or config['target_score'] <= 0:
-            print(f"关卡配置验证失败: target_score 必须是正整数")
+            logger.warning("关卡配置验证失败: target_score 必须是正整数")
+            return False
+
+        map_error = validate_map(config['map'])
+        if map_error:
+            logger.warning("关卡配置验证失败: %s", map_error)
             return False
 
         return True
@@ -75,13 +60,31 @@ class LevelLoader:
         获取所有可用的关卡配置
         :return: 关卡名称列表
         """
-        levels = []
-        if os.path.exists(self.config_dir):
-            for filename in os.listdir(self.config_dir):
-                if filename.endswith('.json'):
-                    level_name = filename[:-5]  # 移除 .json 扩展名
-                    levels.append(level_name)
-        return sorted(levels)
+        return self.registry.get_names('level')
+
+    def get_level_index(self, level_name: str) -> int:
+        """
+        获取关卡在关卡列表中的位置
+        :param level_name: 关卡名称
+        :return: 位置索引，不存在时返回-1
+        """
+        return self.registry.get_index('level', level_name)
+
+    def get_next_level(self, level_name: str) -> Optional[str]:
+        """
+        获取下一关的名称
+        :param level_name: 当前关卡名称
+        :return: 下一关名称，已是最后一关时返回None
+        """
+        return self.registry.get_neighbour('level', level_name, 1)
+
+    def get_previous_level(self, level_name: str) -> Optional[str]:
+        """
+        获取上一关的名称
+        :param level_name: 当前关卡名称
+        :return: 上一关名称，已是第一关时返回None
+        """
+        return self.registry.get_neighbour('level', level_name, -1)
 
     def get_level_difficulty_config(self, level_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -95,21 +98,17 @@ class LevelLoader:
 
     def get_level_info(self, level_name: str) -> Optional[Dict[str, Any]]:
         """
-        获取关卡的基本信息（不加载完整配置）
+        获取关卡的基本信息（来自元数据索引）
         :param level_name: 关卡名称
         :return: 关卡信息字典
         """
-        config = self.load_level_config(level_name)
-        if not config:
+        metadata = self.registry.get_metadata('level', level_name)
+        if not metadata:
             return None
 
-        return {
-            'name': config['name'],
-            'description': config['description'],
-            'target_score': config['target_score'],
-            'difficulty': config['difficulty'],
-            'completed': False  # 默认未完成
-        }
+        info = dict(metadata)
+        info['completed'] = False  # 默认未完成
+        return info
 
     def get_all_levels_info(self) -> List[Dict[str, Any]]:
         """
@@ -117,13 +116,10 @@ class LevelLoader:
         :return: 关卡信息列表
         """
         levels_info = []
-        available_levels = self.get_available_levels()
-
-        for level_name in available_levels:
-            level_info = self.get_level_info(level_name)
-            if level_info:
-                levels_info.append(level_info)
-
+        for metadata in self.registry.get_all_metadata('level'):
+            info = dict(metadata)
+            info['completed'] = False
+            levels_info.append(info)
         return levels_info
 
 
@@ -0,0 +1,255 @@
+"""
+地图网格
+将配置中的 map 一次性转换为 NumPy 数组：墙体占用数组 + 特殊标记坐标，
+供墙体创建、食物生成、蛇的初始位置和寻路直接使用，避免逐格扫描嵌套列表。
+"""
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+# 地图格子取值（见配置中的 legend）
+CELL_EMPTY = 0  # 空地
+CELL_WALL = 1  # 墙壁
+MARKER_SNAKE_HEAD = 10  # 蛇头初始位置
+MARKER_SPECIAL_ITEM = 100  # 特殊道具位置
+
+
+def map_to_cells(map_data) -> np.ndarray:
+    """
+    将地图转换为 uint8 数组：各行长度不同时在行尾用空地补齐
+    :param map_data: 二维地图（嵌套列表或 NumPy 数组）
+    :return: (行数, 列数) 的 uint8 数组，空地图为 (0, 0)
+    :raises ValueError: 地图不是二维、格子值不是整数或不在 0~255 之间
+    """
+    if isinstance(map_data, np.ndarray):
+        cells = map_data
+    else:
+        rows = list(map_data) if map_data is not None else []
+        if not rows:
+            return np.zeros((0, 0), dtype=np.uint8)
+        if not all(isinstance(row, (list, tuple, np.ndarray)) for row in rows):
+            raise ValueError("地图的每一行必须是列表")
+        width = max(len(row) for row in rows)
+        if all(len(row) == width for row in rows):
+            cells = np.array(rows)
+        else:
+            cells = np.full((len(rows), width), CELL_EMPTY, dtype=np.int64)
+            for index, row in enumerate(rows):
+                cells[index, :len(row)] = row
+
+    if cells.size == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+    if cells.ndim != 2:
+        raise ValueError("地图必须是二维数组")
+    if not np.issubdtype(cells.dtype, np.integer):
+        raise ValueError("地图格子值必须是整数")
+    if cells.min() < 0 or cells.max() > 255:
+        raise ValueError("地图格子值必须在 0~255 之间")
+    return cells.astype(np.uint8, copy=False)
+
+
+def validate_map(map_data) -> Optional[str]:
+    """
+    检查地图格式（供配置校验使用）
+    :param map_data: 二维地图
+    :return: 错误说明，格式正确时返回 None
+    """
+    try:
+        map_to_cells(map_data)
+    except (ValueError, TypeError) as e:
+        return str(e)
+    return None
+
+
+class MapGrid:
+    """地图网格 - 墙体占用数组与特殊标记坐标"""
+
+    def __init__(self, map_data, grid_size: int):
+        """
+        转换地图数据
+        :param map_data: 二维地图（嵌套列表或 NumPy 数组），各行长度可以不同
+        :param grid_size: 网格单元大小（像素）
+        :raises ValueError: 地图格式无效（配置加载时已由 validate_map 校验）
+        """
+        cells = map_to_cells(map_data)
+        self.cells = cells
+        self.cells.flags.writeable = False
+        self.rows, self.cols = cells.shape
+        self.grid_size = grid_size
+        self.half = grid_size // 2
+
+        # 墙体占用数组（行, 列），True 表示墙壁
+        self.occupancy = cells == CELL_WALL
+        self.occupancy.flags.writeable = False
+
+        # 墙体格子坐标 (列, 行)
+        rows, cols = np.nonzero(self.occupancy)
+        self._wall_cells = np.column_stack((cols, rows))
+        self._wall_rects: Optional[np.ndarray] = None
+
+        # 特殊标记坐标：格子值 -> (N, 2) 的 (列, 行) 数组
+        self.markers: Dict[int, np.ndarray] = {}
+        for value in np.unique(cells):
+            if value not in (CELL_EMPTY, CELL_WALL):
+                rows, cols = np.nonzero(cells == value)
+                self.markers[int(value)] = np.column_stack((cols, rows))
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """地图尺寸 (行数, 列数)"""
+        return (self.rows, self.cols)
+
+    def wall_cells(self) -> np.ndarray:
+        """墙体格子坐标，(N, 2) 的 (列, 行) 数组"""
+        return self._wall_cells
+
+    def wall_positions(self) -> np.ndarray:
+        """墙块中心像素坐标，(N, 2) 的 float 数组"""
+        return self._wall_cells * float(self.grid_size) + self.half
+
+    def wall_rects(self) -> np.ndarray:
+        """
+        将相邻墙格合并为轴对齐矩形（结果缓存）
+        先把每行的墙格合并为水平游程，再把上下相邻、起止列相同的游程向下延伸，
+        矩形之间互不重叠且恰好覆盖全部墙格
+        :return: (N, 4) 的 int 数组，每行为 (列, 行, 宽, 高)，单位为格
+        """
+        if self._wall_rects is not None:
+            return self._wall_rects
+
+        rects = []
+        open_runs: Dict[Tuple[int, int], int] = {}  # (起始列, 结束列) -> rects 中的下标
+        for row in range(self.rows):
+            padded = np.concatenate(([False], self.occupancy[row], [False]))
+            edges = np.flatnonzero(padded[1:] != padded[:-1])
+            runs = {}
+            for start, end in zip(edges[::2].tolist(), edges[1::2].tolist()):
+                index = open_runs.get((start, end))
+                if index is None:
+                    index = len(rects)
+                    rects.append([start, row, end - start, 1])
+                else:
+                    rects[index][3] += 1
+                runs[(start, end)] = index
+            open_runs = runs
+
+        self._wall_rects = np.array(rects, dtype=np.intp).reshape(-1, 4)
+        self._wall_rects.flags.writeable = False
+        return self._wall_rects
+
+    def cell_center(self, col: int, row: int) -> Tuple[int, int]:
+        """
+        格子中心的像素坐标
+        :param col: 列
+        :param row: 行
+        :return: (x, y)
+        """
+        return (col * self.grid_size + self.half, row * self.grid_size + self.half)
+
+    def cell_at(self, x: float, y: float) -> Tuple[int, int]:
+        """
+        像素坐标所在的格子
+        :param x: 横坐标
+        :param y: 纵坐标
+        :return: (列, 行)
+        """
+        return (int(x // self.grid_size), int(y // self.grid_size))
+
+    def in_bounds(self, col: int, row: int) -> bool:
+        """格子是否在地图范围内"""
+        return 0 <= col < self.cols and 0 <= row < self.rows
+
+    def is_wall_cell(self, col: int, row: int) -> bool:
+        """格子是否为墙壁（地图范围外视为非墙壁）"""
+        return self.in_bounds(col, row) and bool(self.occupancy[row, col])
+
+    def is_near_wall(self, x: float, y: float, distance: float) -> bool:
+        """
+        是否有墙块中心距离该点小于指定距离（只检查覆盖该范围的格子）
+        :param x: 横坐标
+        :param y: 纵坐标
+        :param distance: 距离
+        :return: 是否靠近墙壁
+        """
+        col0 = max(int((x - distance) // self.grid_size), 0)
+        col1 = min(int((x + distance) // self.grid_size), self.cols - 1)
+        row0 = max(int((y - distance) // self.grid_size), 0)
+        row1 = min(int((y + distance) // self.grid_size), self.rows - 1)
+        if col1 < col0 or row1 < row0:
+            return False
+
+        window = self.occupancy[row0:row1 + 1, col0:col1 + 1]
+        if not window.any():
+            return False
+
+        rows, cols = np.nonzero(window)
+        dx = (cols + col0) * self.grid_size + self.half - x
+        dy = (rows + row0) * self.grid_size + self.half - y
+        return bool(np.any(dx * dx + dy * dy < distance * distance))
+
+    def near_wall_mask(self, xs: np.ndarray, ys: np.ndarray, distance) -> np.ndarray:
+        """
+        批量判断多个点是否靠近墙壁（与 is_near_wall 判定一致，一次处理所有点）
+        :param xs: 横坐标数组
+        :param ys: 纵坐标数组
+        :param distance: 距离，标量或与坐标等长的数组
+        :return: bool 数组，靠近墙壁的点为True
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        distance = np.broadcast_to(np.asarray(distance, dtype=np.float64), xs.shape)
+        mask = np.zeros(xs.shape, dtype=bool)
+        if xs.size == 0 or self.rows == 0 or self.cols == 0:
+            return mask
+
+        reach = int(np.ceil(distance.max() / self.grid_size))
+        base_cols = np.floor(xs / self.grid_size).astype(np.intp)
+        base_rows = np.floor(ys / self.grid_size).astype(np.intp)
+        limit = distance * distance
+        for d_row in range(-reach, reach + 1):
+            rows = base_rows + d_row
+            row_ok = (rows >= 0) & (rows < self.rows)
+            for d_col in range(-reach, reach + 1):
+                cols = base_cols + d_col
+                inside = row_ok & (cols >= 0) & (cols < self.cols)
+                walls = inside & self.occupancy[np.clip(rows, 0, self.rows - 1), np.clip(cols, 0, self.cols - 1)]
+                if not walls.any():
+                    continue
+                dx = cols * self.grid_size + self.half - xs
+                dy = rows * self.grid_size + self.half - ys
+                mask |= walls & (dx * dx + dy * dy < limit)
+        return mask
+
+    def get_marker(self, value: int) -> Optional[Tuple[int, int]]:
+        """
+        获取第一个特殊标记所在的格子
+        :param value: 标记值（如 MARKER_SNAKE_HEAD）
+        :return: (列, 行)，地图中没有该标记时返回None
+        """
+        cells = self.markers.get(value)
+        if cells is None or len(cells) == 0:
+            return None
+        return (int(cells[0, 0]), int(cells[0, 1]))
+
+    def get_marker_positions(self, value: int) -> np.ndarray:
+        """
+        获取所有特殊标记的格子中心像素坐标
+        :param value: 标记值
+        :return: (N, 2) 的 float 数组
+        """
+        cells = self.markers.get(value)
+        if cells is None:
+            return np.zeros((0, 2), dtype=np.float64)
+        return cells * float(self.grid_size) + self.half
+
+    def find_nearest_free_cell(self, col: int, row: int) -> Optional[Tuple[int, int]]:
+        """
+        查找距离指定格子最近的非墙壁格子
+        :param col: 列
+        :param row: 行
+        :return: (列, 行)，地图全是墙壁时返回None
+        """
+        free_rows, free_cols = np.nonzero(~self.occupancy)
+        if len(free_rows) == 0:
+            return None
+        index = int(np.argmin((free_cols - col) ** 2 + (free_rows - row) ** 2))
+        return (int(free_cols[index]), int(free_rows[index]))
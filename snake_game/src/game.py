@@ -9,13 +9,12 @@
 import pygame
 import os
 from .configs.config import Config
-from .states.main_menu import MainMenu
-from .states.difficulty_selection import DifficultySelection
-from .states.infinite_mode import InfiniteMode
-from .states.skin_selection import SkinSelection
-from .states.level_selection import LevelSelection
-from .states.level_mode import LevelMode
+from .states.registry import get_state_class, StateCache
 from .utils.sound_manager import SoundManager
+from .utils.startup_timeline import get_startup_timeline
+from .utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class Game:
@@ -31,8 +30,14 @@ class Game:
         self.screen = pygame.display.set_mode(Config.SCREEN_SIZE)
         pygame.display.set_caption("果香蛇踪")  # 设置窗口标题
         self.clock = pygame.time.Clock()  # 创建时钟对象的控制频率
-
-        self.state = MainMenu()  # 当前游戏状态， 默认围为主菜单
+        self.timeline = get_startup_timeline()
+        self.timeline.mark("sdl_init")
+
+        # 热状态缓存：切换回已创建过的状态时调用 startup 复用，不重新创建
+        self.state_cache = StateCache()
+        self.state = get_state_class("main_menu")()  # 当前游戏状态， 默认围为主菜单
+        self.state_cache.put("main_menu", self.state)
+        self.timeline.mark("assets")
         self.next_state = None
 
         self.keys = pygame.key.get_pressed()  # 获取当前的按键状态
@@ -45,41 +50,32 @@ class Game:
 
         # 初始化声音管理器并预加载所有音乐
         self.sound_manager = SoundManager.get_instance()
-        self.sound_manager.initialize_preloading()  # 预加载所有音乐文件
+        self.sound_manager.initialize_preloading()  # 在后台线程预加载所有音乐和音效，立即返回
 
-        # 直接播放预加载的主界面音乐（使用预加载机制）
+        # 播放主界面音乐（预读未完成时直接从磁盘流式读取）
         self.sound_manager.switch_to_main_music()
+        self.timeline.mark("audio")
 
     def run(self):
         """
         游戏主循环
+        当前状态没有动画时进入空闲：阻塞等待事件（最长 1000 / Config.IDLE_FPS 毫秒），不重绘、不刷新显示，
+        收到任何事件后立即恢复正常帧率
         """
+        idle_timeout = 1000 // Config.IDLE_FPS
         while True:
+            if self._is_idle():
+                event = pygame.event.wait(idle_timeout)
+                if event.type == pygame.NOEVENT:
+                    # 超时醒来：只处理音乐和计时类的状态切换，保持上一帧的画面
+                    self.sound_manager.handle_music_events()
+                    self.state.idle_update()
+                    continue
+                self._handle_event(event)
+
             # 事件处理
             for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    quit()
-                elif event.type == pygame.KEYDOWN:
-                    # 判断是否在主界面或菜单状态
-                    flag = self.config.MAIN_MENU_FLAG
-                    if flag:
-                        # 主界面逻辑，使用update_cursor方法
-                        if hasattr(self.state, 'update_cursor'):
-                            self.state.update_cursor(event.key)
-                    else:
-                        # 游戏进行中，将事件传递给当前状态
-                        if hasattr(self.state, 'handle_event'):
-                            self.state.handle_event(event)
-
-                    self.keys = pygame.key.get_pressed()
-
-                elif event.type == pygame.KEYUP:
-                    self.keys = pygame.key.get_pressed()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    # 鼠标事件处理
-                    if hasattr(self.state, 'handle_event'):
-                        self.state.handle_event(event)
+                self._handle_event(event)
 
             # 处理音乐事件，实现无缝循环
             self.sound_manager.handle_music_events()
@@ -88,8 +84,78 @@ class Game:
             self.update()
 
             pygame.display.update()
+            if not self.timeline.reported:
+                self.timeline.mark("first_frame")
+                self.timeline.report()
             self.clock.tick(Config.FPS)
 
+    def _is_idle(self):
+        """当前状态是否处于空闲（没有动画、没有待处理的状态切换）"""
+        if self.state.finished or not hasattr(self.state, 'is_animating'):
+            return False
+        return not self.state.is_animating()
+
+    def _handle_event(self, event):
+        """
+        处理一个 pygame 事件
+        :param event: pygame事件
+        """
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            quit()
+        elif event.type == pygame.KEYDOWN:
+            if hasattr(self.state, 'on_input'):
+                self.state.on_input()
+            # 判断是否在主界面或菜单状态
+            flag = self.config.MAIN_MENU_FLAG
+            if flag:
+                # 主界面逻辑，使用update_cursor方法
+                if hasattr(self.state, 'update_cursor'):
+                    self.state.update_cursor(event.key)
+            else:
+                # 游戏进行中，将事件传递给当前状态
+                if hasattr(self.state, 'handle_event'):
+                    self.state.handle_event(event)
+
+            self.keys = pygame.key.get_pressed()
+
+        elif event.type == pygame.KEYUP:
+            self.keys = pygame.key.get_pressed()
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            if hasattr(self.state, 'on_input'):
+                self.state.on_input()
+            # 鼠标事件处理
+            if hasattr(self.state, 'handle_event'):
+                self.state.handle_event(event)
+        elif event.type == pygame.MOUSEMOTION:
+            if hasattr(self.state, 'on_input'):
+                self.state.on_input()
+
+    def enter_state(self, name, *args, variant=None, persistent=None, cache_name=None):
+        """
+        切换到新状态：先调用当前状态的 cleanup，缓存中有可复用的实例时调用 startup，否则创建新实例并缓存
+        :param name: 状态名称（状态注册表的键）
+        :param args: 创建新实例时的构造参数
+        :param variant: 变体（构造参数的摘要），与缓存实例不同时重新创建
+        :param persistent: 传给 startup 的持久化数据
+        :param cache_name: 缓存名称，默认与状态名称相同
+        """
+        persistent = persistent or {}
+        if hasattr(self.state, 'cleanup'):
+            self.state.cleanup()
+
+        cache_name = cache_name or name
+        state = self.state_cache.get(cache_name, variant)
+        if state is not None:
+            state.startup(persistent)
+            logger.debug("复用缓存的状态: %s", cache_name)
+        else:
+            state = get_state_class(name)(*args)
+            if hasattr(state, 'startup'):
+                self.state_cache.put(cache_name, state, variant)
+        state.finished = False
+        self.state = state
+
     def update(self):
         """
         更新游戏状态
@@ -99,18 +165,16 @@ class Game:
             self.next_state = self.state.next
 
             if self.next_state == "main_menu":
-                # 返回主菜单
+                # 返回主菜单（皮肤选择界面在选中皮肤时已经保存到全局配置）
                 # 切换到主界面音乐
                 self.sound_manager.switch_to_main_music()
 
-                self.state = MainMenu()
-                self.state.finished = False
+                self.enter_state("main_menu")
                 self.config.MAIN_MENU_FLAG = True
 
             elif self.next_state == "difficulty_selection":
                 # 进入难度选择
-                self.state = DifficultySelection()
-                self.state.finished = False
+                self.enter_state("difficulty_selection")
                 self.config.MAIN_MENU_FLAG = True  # 保持菜单模式用于键盘导航
 
             elif self.next_state == "infinite_mode":
@@ -124,7 +188,7 @@ class Game:
                     self.selected_skin = self.state.get_selected_skin()
                     # 更新全局配置中的皮肤ID
                     self.config.set_skin_id(self.selected_skin)
-                    print(f"选择了皮肤ID: {self.selected_skin}")
+                    logger.info("选择了皮肤ID: %s", self.selected_skin)
                 else:
                     # 如果没有选择皮肤，使用当前配置中的皮肤ID
                     self.selected_skin = self.config.get_skin_id()
@@ -132,8 +196,17 @@ class Game:
                 # 切换到游戏运行时音乐（使用预加载机制）
                 self.sound_manager.switch_to_game_music()
 
-                self.state = InfiniteMode(self.selected_difficulty, self.selected_skin)
-                self.state.finished = False
+                # 难度和皮肤与缓存的实例相同时复用（保留墙体和静态图层，重新开始一局）
+                difficulty_key = (self.selected_difficulty or {}).get('key')
+                self.enter_state("infinite_mode", self.selected_difficulty, self.selected_skin,
+                                  variant=(difficulty_key, self.selected_skin))
+                self.config.MAIN_MENU_FLAG = False
+
+            elif self.next_state == "attract_mode":
+                # 主菜单闲置后进入演示模式：自动驾驶玩无尽模式，保留主界面音乐
+                skin_id = self.config.get_skin_id()
+                self.enter_state("infinite_mode", None, skin_id, False, True,  # autopilot=False, attract=True
+                                  variant=skin_id, cache_name="attract_mode")
                 self.config.MAIN_MENU_FLAG = False
 
             elif self.next_state == "skin_selection":
@@ -144,46 +217,27 @@ class Game:
                 elif hasattr(self.state, 'get_selected_difficulty'):
                     previous_state = "difficulty_selection"  # 从难度选择来的
 
-                self.state = SkinSelection(previous_state)
-                self.state.finished = False
+                self.enter_state("skin_selection", previous_state, persistent={'previous_state': previous_state})
                 self.config.MAIN_MENU_FLAG = True  # 保持菜单模式用于键盘导航
 
             elif self.next_state == "level_selection":
                 # 进入关卡选择
-                print("切换到关卡选择界面...")
-                self.state = LevelSelection()
-                self.state.finished = False
+                logger.info("切换到关卡选择界面...")
+                self.enter_state("level_selection")
                 self.config.MAIN_MENU_FLAG = True  # 保持菜单模式用于键盘导航
-                print("关卡选择界面初始化完成")
+                logger.info("关卡选择界面初始化完成")
 
             elif self.next_state.startswith("level_mode:"):
                 # 进入关卡模式（支持从关卡内部切换关卡）
                 level_file = self.next_state.split(":")[1]  # 解析关卡文件名
-                print(f"切换到关卡: {level_file}")
+                logger.info("切换到关卡: %s", level_file)
 
-                # 关卡模式现在直接从全局配置获取皮肤ID
-                # 传递关卡名称而不是文件路径
-                self.state = LevelMode(level_file)
-                self.state.finished = False
+                # 关卡模式直接从全局配置获取皮肤ID；皮肤相同时复用缓存的关卡模式，只重新加载关卡世界
+                self.enter_state("level_mode", level_file, variant=self.config.get_skin_id(),
+                                  persistent={'level_name': level_file})
                 self.config.MAIN_MENU_FLAG = False
 
                 # 切换到游戏运行时音乐（使用预加载机制）
                 self.sound_manager.switch_to_game_music()
 
-            elif self.next_state == "main_menu":
-                # 返回主菜单（从皮肤选择或关卡选择返回时）
-                if hasattr(self.state, 'get_selected_skin'):
-                    self.selected_skin = self.state.get_selected_skin()
-                    # 更新全局配置中的皮肤ID
-                    self.config.set_skin_id(self.selected_skin)
-                    print(f"从皮肤选择返回，皮肤ID: {self.selected_skin}")
-
-                # 切换到主界面音乐（使用预加载机制）
-                self.sound_manager.switch_to_main_music()
-
-                # 返回主菜单
-                self.state = MainMenu()
-                self.state.finished = False
-                self.config.MAIN_MENU_FLAG = True
-
         self.state.update(self.screen, self.keys)
@@ -0,0 +1,238 @@
+"""
+自动驾驶压力测试
+用自动驾驶长时间无人值守地玩无尽模式或闯关模式，死亡后自动重来、过关后自动进入下一关，
+按固定间隔记录帧时间（不含帧率等待）分位数、PerformanceMonitor 统计、内存占用和蛇的长度，
+用于发现蛇变长后的性能下降和多次重来之后的内存泄漏。
+
+用法：python main.py --soak [--mode infinite|level] [--minutes 60] [--headless]
+"""
+import gc
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pygame
+from .configs.config import Config
+from .components.autopilot import Autopilot
+from .utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def get_memory_usage_mb() -> float:
+    """
+    当前进程的内存占用（MB）：Linux 下读取常驻内存，其他 Unix 使用峰值常驻内存，Windows 上返回0
+    :return: 内存占用
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource  # 只在 Unix 上存在
+        except ImportError:
+            return 0.0
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 的单位是字节，其他 Unix 是 KB
+        return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+
+class SoakTest:
+    """自动驾驶压力测试"""
+
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, mode: str = 'infinite', duration: float = 3600.0, report_interval: float = 60.0,
+                 level_name: str = 'level_01', difficulty: Optional[str] = None, fps: int = Config.FPS):
+        """
+        :param mode: 'infinite'（无尽模式）或 'level'（闯关模式）
+        :param duration: 运行时长（秒）
+        :param report_interval: 统计间隔（秒）
+        :param level_name: 闯关模式的起始关卡
+        :param difficulty: 无尽模式的难度名称，None 使用默认模式
+        :param fps: 帧率上限
+        """
+        self.mode = mode
+        self.duration = duration
+        self.report_interval = report_interval
+        self.level_name = level_name
+        self.difficulty = difficulty
+        self.fps = fps
+
+        self.game = None
+        self.intervals: List[Dict[str, Any]] = []
+        self.rounds = 0  # 死亡后重来的次数
+        self.levels_completed = 0
+        self.best_length = 0
+        self._frame_times: List[float] = []
+
+    def _enter_mode(self) -> None:
+        """
+        通过 Game.enter_state 进入启用自动驾驶的游戏状态，
+        与正常游戏一样经过状态缓存和 cleanup/startup 生命周期
+        """
+        game = self.game
+        skin_id = game.config.get_skin_id()
+        if self.mode == 'level':
+            game.enter_state("level_mode", self.level_name, variant=skin_id,
+                              persistent={'level_name': self.level_name})
+            if game.state.autopilot is None:
+                game.state.autopilot = Autopilot()
+        else:
+            # 只给出难度名称，由无尽模式自行加载对应的 JSON 配置；
+            # 自动驾驶实例单独缓存，不会被玩家之后进入的无尽模式复用
+            difficulty_config = {'name': self.difficulty, 'key': self.difficulty} if self.difficulty else None
+            game.enter_state("infinite_mode", difficulty_config, skin_id, True,  # autopilot=True
+                              variant=(self.difficulty, skin_id), cache_name="soak_test")
+        game.config.MAIN_MENU_FLAG = False
+
+    def _ensure_state(self) -> None:
+        """状态切换后（如进入下一关、回到主菜单）保证自动驾驶仍在运行"""
+        state = self.game.state
+        if not hasattr(state, 'autopilot'):
+            self._enter_mode()
+        elif state.autopilot is None:
+            state.autopilot = Autopilot()
+
+    def _handle_round_end(self) -> None:
+        """死亡后重新开始，过关后进入下一关（最后一关重玩）"""
+        state = self.game.state
+        if getattr(state, 'snake', None) is not None:
+            self.best_length = max(self.best_length, state.snake.get_length())
+
+        if getattr(state, 'level_completed', False) and not state.finished:
+            self.levels_completed += 1
+            if not state.advance_level():
+                # 最后一关重玩
+                state.restart_game()
+                state.state_manager.set_state(state.state_manager.STATE_GAME)
+        elif state.game_over:
+            self.rounds += 1
+            logger.info("压力测试: 第 %s 局结束，得分 %s，长度 %s", self.rounds, state.score, state.snake.get_length())
+            state.restart_game()
+            if hasattr(state, 'state_manager'):
+                state.state_manager.set_state(state.state_manager.STATE_GAME)
+
+    def _record_interval(self, elapsed: float) -> None:
+        """汇总一个统计间隔的帧时间、性能统计和内存占用"""
+        frame_times = np.array(self._frame_times, dtype=np.float64)
+        self._frame_times.clear()
+        if len(frame_times) == 0:
+            return
+
+        state = self.game.state
+        percentiles = np.percentile(frame_times, self.PERCENTILES)
+        monitor = getattr(state, 'performance_monitor', None)
+        snake = getattr(state, 'snake', None)
+        interval = {
+            'elapsed_s': round(elapsed, 1),
+            'frames': int(len(frame_times)),
+            'frame_ms': {f'p{p}': round(float(v), 3) for p, v in zip(self.PERCENTILES, percentiles)},
+            'frame_ms_max': round(float(frame_times.max()), 3),
+            'performance': monitor.get_performance_report() if monitor is not None else {},
+            'memory_mb': round(get_memory_usage_mb(), 1),
+            'gc_objects': len(gc.get_objects()),
+            'snake_length': snake.get_length() if snake is not None else 0,
+            'rounds': self.rounds,
+            'levels_completed': self.levels_completed,
+        }
+        self.intervals.append(interval)
+        logger.info("压力测试 %.0fs: 帧时间 p50=%.2fms p95=%.2fms p99=%.2fms max=%.2fms, 内存 %.1fMB, "
+                    "对象 %s, 蛇长度 %s, 已重来 %s 次",
+                    elapsed, interval['frame_ms']['p50'], interval['frame_ms']['p95'], interval['frame_ms']['p99'],
+                    interval['frame_ms_max'], interval['memory_mb'], interval['gc_objects'],
+                    interval['snake_length'], self.rounds)
+
+    def get_summary(self) -> Dict[str, Any]:
+        """
+        汇总结果：内存增长以第一个统计间隔为基准（排除启动时的资源加载）
+        :return: 结果字典
+        """
+        summary = {
+            'mode': self.mode,
+            'duration_s': self.duration,
+            'rounds': self.rounds,
+            'levels_completed': self.levels_completed,
+            'best_length': self.best_length,
+            'intervals': self.intervals,
+        }
+        if self.intervals:
+            first, last = self.intervals[0], self.intervals[-1]
+            summary['memory_growth_mb'] = round(last['memory_mb'] - first['memory_mb'], 1)
+            summary['gc_object_growth'] = last['gc_objects'] - first['gc_objects']
+            summary['p99_first_ms'] = first['frame_ms']['p99']
+            summary['p99_last_ms'] = last['frame_ms']['p99']
+        return summary
+
+    def run(self) -> Dict[str, Any]:
+        """
+        运行压力测试（关闭窗口可提前结束）
+        :return: 结果汇总
+        """
+        from .game import Game
+
+        self.game = Game()
+        self._enter_mode()
+        logger.info("压力测试开始: 模式=%s, 时长=%ss", self.mode, self.duration)
+
+        start = time.perf_counter()
+        next_report = start + self.report_interval
+        running = True
+        while running:
+            frame_start = time.perf_counter()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+
+            self.game.sound_manager.handle_music_events()
+            self.game.update()
+            pygame.display.update()
+            self._ensure_state()
+            self._handle_round_end()
+
+            # 帧时间只统计本帧的工作量，不包括帧率限制的等待
+            now = time.perf_counter()
+            self._frame_times.append((now - frame_start) * 1000)
+            self.game.clock.tick(self.fps)
+            if now >= next_report:
+                self._record_interval(now - start)
+                next_report += self.report_interval
+            if now - start >= self.duration:
+                running = False
+
+        self._record_interval(time.perf_counter() - start)
+        summary = self.get_summary()
+        logger.info("压力测试结束: 重来 %s 次, 过关 %s 次, 最长 %s, 内存增长 %sMB, 对象增长 %s, p99 %s -> %sms",
+                    self.rounds, self.levels_completed, self.best_length, summary.get('memory_growth_mb'),
+                    summary.get('gc_object_growth'), summary.get('p99_first_ms'), summary.get('p99_last_ms'))
+        return summary
+
+
+def run_soak_test(mode: str = 'infinite', minutes: float = 60.0, report_interval: float = 60.0,
+                  level_name: str = 'level_01', difficulty: Optional[str] = None, headless: bool = False,
+                  report_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    运行自动驾驶压力测试
+    :param mode: 'infinite' 或 'level'
+    :param minutes: 运行时长（分钟）
+    :param report_interval: 统计间隔（秒）
+    :param level_name: 闯关模式的起始关卡
+    :param difficulty: 无尽模式的难度名称
+    :param headless: 是否不显示窗口、不输出声音（需在 pygame 初始化前设置）
+    :param report_path: 结果 JSON 的保存路径，None 不保存
+    :return: 结果汇总
+    """
+    if headless:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    soak = SoakTest(mode, minutes * 60.0, report_interval, level_name, difficulty)
+    summary = soak.run()
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as report_file:
+            json.dump(summary, report_file, ensure_ascii=False, indent=2)
+        logger.info("压力测试结果已保存: %s", report_path)
+    return summary
@@ -2,6 +2,7 @@
 游戏状态基类
 """
 import pygame
+from ..configs.config import Config
 
 
 class BaseState:
@@ -16,6 +17,7 @@ class BaseState:
         self.finished = False
         self.next = None
         self.persist = {}
+        self.last_input_time = pygame.time.get_ticks()  # 最近一次输入的时间
     
     def startup(self, persistent):
         """
@@ -25,6 +27,7 @@ class BaseState:
         self.persist = persistent
         self.finished = False
         self.next = None
+        self.last_input_time = pygame.time.get_ticks()
     
     def get_event(self, event):
         """
@@ -48,6 +51,26 @@ class BaseState:
         """
         pass
     
+    def on_input(self):
+        """收到键盘或鼠标输入时调用（由主循环调用）"""
+        self.last_input_time = pygame.time.get_ticks()
+
+    def is_animating(self):
+        """
+        界面是否在变化：返回 False 时主循环进入空闲，不再重绘，阻塞等待输入
+        默认始终在变化（游戏进行中）
+        :return: bool
+        """
+        return True
+
+    def idle_update(self):
+        """空闲期间主循环每次超时醒来时调用（不绘制），用于检查计时类的状态切换"""
+        pass
+
+    def _has_recent_input(self):
+        """最近是否有输入（无操作超过 Config.IDLE_AFTER_MS 后停止装饰性动画）"""
+        return pygame.time.get_ticks() - self.last_input_time < Config.IDLE_AFTER_MS
+
     def cleanup(self):
         """
         状态清理时调用
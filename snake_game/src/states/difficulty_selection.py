@@ -6,13 +6,18 @@ from ..configs.config import Config
 from ..configs.game_balance import GameBalance
 from ..configs.difficulty_loader import get_difficulty_loader
 from ..utils.font_manager import get_font_manager
+from ..utils.logger import get_logger
+from .base_state import BaseState
 
+logger = get_logger(__name__)
 
-class DifficultySelection:
+
+class DifficultySelection(BaseState):
     def __init__(self):
         """
         初始化难度选择状态
         """
+        super().__init__()
         self.config = Config.get_instance()
         self.finished = False  # 是否完成
         self.next = "infinite_mode"  # 选择难度后进入无尽模式
@@ -34,6 +39,19 @@ class DifficultySelection:
         self.animation_time = 0
         self.pulse_speed = 2.0
 
+    def startup(self, persistent):
+        """
+        从状态缓存中再次进入难度选择：保留光标位置，清除上次的选择
+        :param persistent: 持久化数据
+        """
+        super().startup(persistent)
+        self.next = "infinite_mode"
+        self.selected_difficulty = None
+
+    def is_animating(self):
+        """选中项的脉冲动画只在最近有操作时播放"""
+        return self._has_recent_input()
+
     def _load_difficulty_options(self):
         """
         从JSON配置文件加载难度选项
@@ -106,7 +124,7 @@ class DifficultySelection:
         
         # 如果没有找到配置文件，使用默认配置
         if not options:
-            print("警告: 未找到难度配置文件，使用默认配置")
+            logger.warning("警告: 未找到难度配置文件，使用默认配置")
             options = [{
                 'name': '默认模式',
                 'key': 'default',
@@ -134,7 +152,7 @@ class DifficultySelection:
                 self.selected_difficulty = self.difficulty_options[self.selected_option]  # 选中的难度
                 self.finished = True
                 self.config.MAIN_MENU_FLAG = False  # 设置主菜单标志为False
-                print(f"选择了难度: {self.selected_difficulty['name']}")
+                logger.info("选择了难度: %s", self.selected_difficulty['name'])
             else:
                 # 选择了返回
                 self.finished = True
@@ -4,6 +4,7 @@
 import pygame
 from src.configs.config import Config
 from src.utils.font_manager import get_font_manager
+from src.utils.menu_compositor import MenuCompositor
 
 
 class GameOverMenu:
@@ -43,6 +44,9 @@ class GameOverMenu:
         self.pulse_time = 0
         self.pulse_speed = 2.0
 
+        # 菜单合成器（冻结游戏画面，缓存合成好的菜单画面）
+        self.compositor = MenuCompositor((self.config.SCREEN_W, self.config.SCREEN_H), (20, 0, 0))  # 深红色覆盖层
+
     def handle_event(self, event):
         """
         处理事件
@@ -105,13 +109,12 @@ class GameOverMenu:
         绘制游戏结束界面
         :param surface: 绘制表面
         """
-        # 创建半透明覆盖层
-        overlay = pygame.Surface((self.config.SCREEN_W, self.config.SCREEN_H))
-        overlay.set_alpha(self.fade_alpha)
-        overlay.fill((20, 0, 0))  # 深红色覆盖层
-        surface.blit(overlay, (0, 0))
-        
-        # 绘制游戏结束标题 - 左上角
+        # 第一次绘制时冻结游戏画面，面板只有选中项、统计或淡入透明度变化时才重新合成
+        if not self.compositor.is_frozen():
+            self.compositor.freeze(surface)
+        self.compositor.draw(surface, self.fade_alpha, self._get_panel_key(), self._draw_panels)
+
+        # 绘制游戏结束标题（脉动动画，每帧绘制） - 左上角
         pulse_scale = 1.0 + 0.1 * abs(pygame.math.Vector2(0, 1).rotate(self.pulse_time * self.pulse_speed * 180).y)
         title_color_intensity = int(200 + 55 * abs(pygame.math.Vector2(0, 1).rotate(self.pulse_time * self.pulse_speed * 180).y))
         title_color = (255, title_color_intensity, title_color_intensity)
@@ -119,7 +122,25 @@ class GameOverMenu:
         title_text = self.font_manager.render_text("游戏结束", 'title', title_color)
         title_rect = title_text.get_rect(topleft=(50, 50))
         surface.blit(title_text, title_rect)
-        
+
+    def _get_panel_key(self):
+        """
+        面板内容的键：选中项和统计数值
+        :return: 可哈希的键
+        """
+        game_state = self.game_state
+        snake = getattr(game_state, 'snake', None)
+        difficulty_config = getattr(game_state, 'difficulty_config', None)
+        return ('game_over', self.selected_option, getattr(game_state, 'score', None),
+                getattr(game_state, 'high_score', None),
+                snake.get_length() if hasattr(snake, 'get_length') else None,
+                difficulty_config.get('name') if difficulty_config else None)
+
+    def _draw_panels(self, surface):
+        """
+        绘制统计、菜单选项和控制提示面板
+        :param surface: 绘制表面
+        """
         # 绘制游戏统计信息 - 右上角面板
         if self.game_state:
             self._draw_game_stats(surface)
@@ -263,4 +284,5 @@ class GameOverMenu:
         self.selected_option = 0
         self.fade_alpha = 0
         self.key_delay = 0
-        self.pulse_time = 0
\ No newline at end of file
+        self.pulse_time = 0
+        self.compositor.release()
\ No newline at end of file
@@ -2,25 +2,36 @@ import pygame
 from ..components.snake import Snake
 from ..components.food import FoodManager
 from ..components.wall import WallManager
+from ..components.camera import Camera
+from ..components.world_layer import WorldLayer
+from ..components.hint_arrow import HintArrow
+from ..components.autopilot import Autopilot
 from ..configs.config import Config
 from ..configs.game_balance import GameBalance
 from ..configs.difficulty_loader import get_difficulty_loader
 from ..utils.grid_utils import GridUtils
 from ..utils.performance_monitor import PerformanceMonitor
+from ..utils.pathfinding import GridPathfinder
 from ..utils.font_manager import get_font_manager
 from ..utils.sound_manager import SoundManager
 from .pause_menu import PauseMenu
 from .game_over_menu import GameOverMenu
+from .base_state import BaseState
+from ..utils.logger import get_logger
 
+logger = get_logger(__name__)
 
-class InfiniteMode:
-    def __init__(self, difficulty_config=None, skin_name=None):
+
+class InfiniteMode(BaseState):
+    def __init__(self, difficulty_config=None, skin_name=None, autopilot=False, attract=False):
         """
         初始化无尽模式
         :param difficulty_config: 难度配置字典
         :param skin_name: 皮肤名称
+        :param autopilot: 是否启用自动驾驶（F6 键可随时切换）
+        :param attract: 是否为主菜单演示模式（自动驾驶，死亡后自动重来，按任意键返回主菜单）
         """
-
+        super().__init__()
         self.finished = False
         self.next = None
 
@@ -58,7 +69,7 @@ class InfiniteMode:
         # 创建蛇实例，应用皮肤
         # 将皮肤名称转换为整数ID（如 "snake1" -> 1）
         skin_id = self._parse_skin_id(skin_name)
-        print(f"创建蛇实例，皮肤名称: {skin_name}, 皮肤ID: {skin_id}")
+        logger.info("创建蛇实例，皮肤名称: %s, 皮肤ID: %s", skin_name, skin_id)
         self.snake = Snake("snake0", skin_id=skin_id)
         
         # 为蛇实例设置声音管理器
@@ -67,12 +78,31 @@ class InfiniteMode:
         # 根据JSON配置设置游戏参数
         self._apply_json_config()
 
+        # 世界可以大于屏幕，摄像机跟随蛇头滚动
+        self.camera = Camera(self.screen_width, self.screen_height)
+        self.world_width = self.screen_width
+        self.world_height = self.screen_height
+        self.world_layer = None
+
+        # 寻路提示箭头（H 键切换），寻路网格在首次使用时构建
+        self.show_hint = False
+        self.pathfinder = None
+        self.hint_arrow = HintArrow()
+        self.hint_step = None
+
+        # 自动驾驶（演示模式和压力测试使用）
+        self.autopilot = Autopilot() if autopilot or attract else None
+        self.attract_mode = attract
+
         # 创建墙管理器并加载墙体
         self.wall_manager = WallManager()
         self._setup_walls()
 
         # 创建食物管理器，传递墙壁管理器实例
-        self.food_manager = FoodManager(max_food_count=GameBalance.MAX_FOOD_COUNT, wall_manager=self.wall_manager)
+        # 竞技场类地图可以在 food.count 中配置同时存在的食物数量
+        food_count = (self.json_config or {}).get('food', {}).get('count', GameBalance.MAX_FOOD_COUNT)
+        self.food_manager = FoodManager(max_food_count=food_count, wall_manager=self.wall_manager,
+                                        world_size=(self.world_width, self.world_height))
 
         # 创建暂停菜单实例
         self.pause_menu = PauseMenu(game_state=self)
@@ -93,6 +123,7 @@ class InfiniteMode:
 
         # 性能监控
         self.performance_monitor = PerformanceMonitor()
+        self.performance_monitor.register_counters('audio', self.sound_manager.get_channel_stats)
 
         # 字体管理器
         self.font_manager = get_font_manager()
@@ -111,7 +142,23 @@ class InfiniteMode:
         self.key_debounce = {}  # 按键防抖计时器
         self.debounce_delay = 200  # 防抖延迟时间（毫秒）
 
-        print(f"无尽模式初始化完成 - 难度: {self.difficulty_config.get('name', '默认')}")
+        logger.info("无尽模式初始化完成 - 难度: %s", self.difficulty_config.get('name', '默认'))
+
+    def startup(self, persistent):
+        """
+        从状态缓存中再次进入（难度和皮肤相同）：保留墙体、静态图层和寻路网格，重新开始一局
+        :param persistent: 持久化数据
+        """
+        super().startup(persistent)
+        self.restart_game()
+
+    def cleanup(self):
+        """
+        离开无尽模式时停止加速音效的循环
+        :return: 持久化数据
+        """
+        self.sound_manager.stop_high_speed_sound()
+        return super().cleanup()
 
     def _parse_skin_id(self, skin_name):
         """将皮肤名称转换为整数ID"""
@@ -130,7 +177,7 @@ class InfiniteMode:
                 pass
         
         # 如果无法解析，返回默认皮肤ID
-        print(f"警告：无法解析皮肤名称 '{skin_name}'，使用默认皮肤ID 1")
+        logger.warning("警告：无法解析皮肤名称 '%s'，使用默认皮肤ID 1", skin_name)
         return 1
 
     def _apply_json_config(self):
@@ -144,7 +191,7 @@ class InfiniteMode:
             # 设置默认初始位置
             initial_pos = GridUtils.align_to_grid(*GameBalance.INITIAL_POSITION)
             self.snake.rect.center = initial_pos
-            print(f"使用默认配置，蛇初始位置: {initial_pos}")
+            logger.info("使用默认配置，蛇初始位置: %s", initial_pos)
             return
 
         # 应用蛇的配置
@@ -166,7 +213,7 @@ class InfiniteMode:
             initial_pos = GridUtils.align_to_grid(*GameBalance.INITIAL_POSITION)
 
         self.snake.rect.center = initial_pos
-        print(f"蛇初始位置设置为: {initial_pos}")
+        logger.info("蛇初始位置设置为: %s", initial_pos)
         self.snake.reset(initial_pos)
 
         # 应用食物配置
@@ -180,22 +227,34 @@ class InfiniteMode:
         self.self_collision = game_settings.get('self_collision', True)
 
     def _setup_walls(self):
-        """根据JSON配置设置墙壁"""
+        """根据JSON配置设置墙壁，并重建分块静态图层"""
         if not self.json_config:
             # 没有JSON配置，创建默认边界墙壁
             self.wall_manager.create_border_walls(margin=30)
-            print("创建了默认边界墙壁")
-            return
+            logger.info("创建了默认边界墙壁")
+        else:
+            # 使用JSON配置加载墙体
+            self.wall_manager.load_from_difficulty_config(self.json_config)
+            logger.info("从JSON配置加载了墙体: %s", self.json_config.get('name', '未知'))
 
-        # 使用JSON配置加载墙体
-        self.wall_manager.load_from_difficulty_config(self.json_config)
-        print(f"从JSON配置加载了墙体: {self.json_config.get('name', '未知')}")
+        self.world_width, self.world_height = self.wall_manager.get_world_size()
+        self.world_layer = WorldLayer((self.world_width, self.world_height), self.wall_manager)
+        self.camera.set_world_size(self.world_width, self.world_height)
+        self.camera.center_on(self.snake.position)
+        self.pathfinder = None
 
     def handle_event(self, event):
         """
         处理pygame事件
         :param event: pygame事件
         """
+        if self.attract_mode:
+            # 演示模式下按任意键返回主菜单
+            if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                self.finished = True
+                self.next = 'main_menu'
+            return
+
         if self.game_over:
             # 如果游戏结束，将事件传递给游戏结束菜单
             self.game_over_menu.handle_event(event)
@@ -260,6 +319,10 @@ class InfiniteMode:
         # 处理输入
         self._handle_input(keys)
 
+        # 演示模式死亡后直接重新开始
+        if self.game_over and self.attract_mode:
+            self.restart_game()
+
         # 如果游戏结束，更新游戏结束菜单
         if self.game_over:
             self.game_over_menu.update(surface, keys)
@@ -274,8 +337,8 @@ class InfiniteMode:
             dt = current_time - self.last_time
             self.last_time = current_time
 
-            # 处理蛇的键盘输入（只处理方向改变，不立即移动）
-            self.snake.handle_input(keys)
+            # 处理蛇的键盘输入（只处理方向改变，不立即移动），自动驾驶时使用模拟按键
+            self.snake.handle_input(self._get_snake_keys(keys))
 
             # 动态调整蛇的移动速度
             if self.dynamic_speed:
@@ -284,24 +347,14 @@ class InfiniteMode:
 
             # 基于时间更新蛇的位置
             self.snake.update(dt)
+            self.camera.center_on(self.snake.position)
 
             # 更新食物并检查食物碰撞
             snake_head_pos = (self.snake.position[0], self.snake.position[1])  # 蛇头浮点坐标
-            snake_body_positions = [(seg[0], seg[1]) for seg in self.snake.body_segments]  # 身体浮点坐标
-
-            # 添加墙壁位置到避免列表
-            avoid_positions = snake_body_positions.copy()
-            avoid_positions.append(snake_head_pos)
-            avoid_positions.extend(self.wall_manager.get_wall_positions())
+            snake_body_positions = self.snake.body_segments  # 身体浮点坐标（只读视图，零拷贝）
 
             score_gained = self.food_manager.update(dt, snake_head_pos, snake_body_positions, self.snake.rect)  # 获取得分
 
-            # 如果食物被重新生成，确保避开墙壁
-            for food in self.food_manager.foods:
-                if hasattr(food, '_needs_repositioning') and food._needs_repositioning:
-                    food.randomize_position(avoid_positions)
-                    food._needs_repositioning = False
-
             # 如果吃到食物，蛇增长
             if score_gained > 0:
                 self.snake.grow()
@@ -311,11 +364,14 @@ class InfiniteMode:
                 self.high_score = max(self.high_score, self.score)
                 # 播放吃食物音效
                 self.sound_manager.play_eat_sound()
-                print(f"得分: {self.score}, 蛇长度: {self.snake.get_length()}")
+                logger.debug("得分: %s, 蛇长度: %s", self.score, self.snake.get_length())
 
             # 检查其他碰撞
             self._check_collisions()
 
+            if self.show_hint:
+                self._update_hint()
+
         # 性能监控结束更新阶段
         self.performance_monitor.end_update_timing()
         self.performance_monitor.start_draw_timing()
@@ -326,6 +382,38 @@ class InfiniteMode:
         # 性能监控结束绘制阶段
         self.performance_monitor.end_draw_timing()
 
+    def _get_pathfinder(self):
+        """获取当前世界的寻路网格（墙体变化后首次使用时重建）"""
+        if self.pathfinder is None:
+            self.pathfinder = GridPathfinder(self.wall_manager, (self.world_width, self.world_height))
+        return self.pathfinder
+
+    def _get_snake_keys(self, keys):
+        """
+        获取控制蛇的按键状态
+        :param keys: 键盘按键状态
+        :return: 自动驾驶启用时为自动驾驶的模拟按键，否则为键盘按键
+        """
+        if self.autopilot is None:
+            return keys
+        return self.autopilot.get_keys(self._get_pathfinder(), self.snake, self.food_manager.get_food_positions())
+
+    def _toggle_autopilot(self):
+        """切换自动驾驶"""
+        self.autopilot = None if self.autopilot is not None else Autopilot()
+        logger.info("自动驾驶: %s", '开启' if self.autopilot else '关闭')
+
+    def _update_hint(self):
+        """更新提示箭头：在寻路预算内刷新到最近食物的距离场，取蛇头的下一步"""
+        if self.autopilot is not None:
+            # 自动驾驶本帧已经刷新过距离场
+            self.hint_step = self.autopilot.last_step
+            return
+        pathfinder = self._get_pathfinder()
+        head_position = (self.snake.position[0], self.snake.position[1])
+        pathfinder.update(head_position, self.snake.body_segments, self.food_manager.get_food_positions())
+        self.hint_step = pathfinder.next_step(head_position)
+
     def _handle_input(self, keys):
         """处理额外的输入（带防抖）"""
         current_time = pygame.time.get_ticks()
@@ -347,27 +435,37 @@ class InfiniteMode:
         # F2 切换动态速度
         handle_debounced_key(pygame.K_F2, lambda: (
             setattr(self, 'dynamic_speed', not self.dynamic_speed),
-            print(f"动态速度调整: {'开启' if self.dynamic_speed else '关闭'}")
+            logger.info("动态速度调整: %s", '开启' if self.dynamic_speed else '关闭')
         ))
 
         # F3 切换碰撞区域调试显示
         handle_debounced_key(pygame.K_F3, lambda: (
             setattr(self, 'debug_collision', not self.debug_collision),
-            print(f"碰撞区域调试: {'开启' if self.debug_collision else '关闭'}")
+            logger.info("碰撞区域调试: %s", '开启' if self.debug_collision else '关闭')
         ))
 
         # F4 切换碰撞检测调试日志
         handle_debounced_key(pygame.K_F4, lambda: (
-            setattr(Food, 'DEBUG_COLLISION', not Food.DEBUG_COLLISION),
-            print(f"碰撞检测调试日志: {'开启' if Food.DEBUG_COLLISION else '关闭'}")
+            setattr(FoodManager, 'DEBUG_COLLISION', not FoodManager.DEBUG_COLLISION),
+            logger.info("碰撞检测调试日志: %s", '开启' if FoodManager.DEBUG_COLLISION else '关闭')
         ))
 
         # M键切换UI显示状态
         handle_debounced_key(pygame.K_m, lambda: (
             setattr(self, 'show_ui', not self.show_ui),
-            print(f"游戏状态信息: {'显示' if self.show_ui else '隐藏'}")
+            logger.info("游戏状态信息: %s", '显示' if self.show_ui else '隐藏')
+        ))
+
+        # H键切换寻路提示箭头
+        handle_debounced_key(pygame.K_h, lambda: (
+            setattr(self, 'show_hint', not self.show_hint),
+            setattr(self, 'hint_step', None),
+            logger.info("寻路提示: %s", '开启' if self.show_hint else '关闭')
         ))
 
+        # F6键切换自动驾驶
+        handle_debounced_key(pygame.K_F6, self._toggle_autopilot)
+
         # 移除旧的R键重新开始逻辑，现在由游戏结束菜单处理
         pass
 
@@ -381,7 +479,7 @@ class InfiniteMode:
             self.game_over = True
             # 播放死亡音效
             self.sound_manager.play_game_over_sound()
-            print(f"游戏结束：蛇撞到自己了！最终得分: {self.score}")
+            logger.info("游戏结束：蛇撞到自己了！最终得分: %s", self.score)
             return
 
         # 检查是否撞到墙壁（如果启用墙壁碰撞）
@@ -392,17 +490,17 @@ class InfiniteMode:
                 self.game_over = True
                 # 播放死亡音效
                 self.sound_manager.play_game_over_sound()
-                print(f"游戏结束：蛇撞到墙壁了！最终得分: {self.score}")
+                logger.info("游戏结束：蛇撞到墙壁了！最终得分: %s", self.score)
                 return
 
         # 检查是否撞到边界（如果没有墙壁或墙壁不致命）
         if not getattr(self, 'walls_kill', True) or self.wall_manager.get_wall_count() == 0:
-            if self.snake.check_boundary_collision(screen_width=self.screen_width, screen_height=self.screen_height):
+            if self.snake.check_boundary_collision(screen_width=self.world_width, screen_height=self.world_height):
                 self.snake.is_dead = True
                 self.game_over = True
                 # 播放死亡音效
                 self.sound_manager.play_game_over_sound()
-                print(f"游戏结束：蛇撞到边界了！最终得分: {self.score}")
+                logger.info("游戏结束：蛇撞到边界了！最终得分: %s", self.score)
                 return
 
     def draw(self, surface):
@@ -410,25 +508,41 @@ class InfiniteMode:
         绘制游戏画面
         :param surface: 绘制表面
         """
+        # 暂停或游戏结束菜单已冻结游戏画面时，画面由菜单在 update 中合成，不再重绘游戏世界
+        menu = self.game_over_menu if self.game_over else self.pause_menu if self.paused else None
+        if menu is not None and menu.compositor.is_frozen():
+            self.performance_monitor.draw_stats(surface)
+            return
+
         # 获取颜色主题
         colors = GameBalance.get_color_scheme('classic')
-        surface.fill(colors['background'])  # 填充背景色
 
-        # 绘制网格（可选）
-        self._draw_grid(surface, colors['grid'])
+        # 绘制视口覆盖的静态图层区块（背景、网格、墙壁）
+        self.world_layer.draw(surface, self.camera)
+        offset = self.camera.offset
 
-        # 绘制墙壁（带碰撞调试）
-        self.wall_manager.draw(surface, self.debug_collision)
+        # 墙壁碰撞调试
+        if self.debug_collision:
+            self.wall_manager.draw_collision_debug(surface, offset)
 
         # 绘制食物（带碰撞调试）
-        self.food_manager.draw(surface, self.debug_collision)
+        self.food_manager.draw(surface, self.debug_collision, offset)
 
         # 绘制蛇（带碰撞调试）
-        self.snake.draw(surface, self.debug_collision)
+        self.snake.draw(surface, self.debug_collision, offset)
+
+        # 绘制寻路提示箭头
+        if self.show_hint:
+            self.hint_arrow.draw(surface, self.snake.position, self.hint_step, offset)
 
         # 绘制UI
         self._draw_ui(surface, colors['text'])
 
+        # 演示模式提示
+        if self.attract_mode:
+            demo_text = self.font_manager.render_text("演示模式 - 按任意键返回", 'medium', (255, 215, 0))
+            surface.blit(demo_text, demo_text.get_rect(center=(self.screen_width // 2, self.screen_height - 30)))
+
         # 绘制暂停界面
         if self.paused and not self.game_over:
             self.pause_menu.draw(surface)
@@ -440,18 +554,6 @@ class InfiniteMode:
         # 绘制性能监控
         self.performance_monitor.draw_stats(surface)
 
-    def _draw_grid(self, surface, grid_color):
-        """绘制网格线（调试用）"""
-        # 可以通过配置开关控制是否显示网格
-        show_grid = True  # 设置为True可显示网格
-        if not show_grid:
-            return
-
-        for x in range(0, self.screen_width, GridUtils.GRID_SIZE):
-            pygame.draw.line(surface, grid_color, (x, 0), (x, self.screen_height))
-        for y in range(0, self.screen_height, GridUtils.GRID_SIZE):
-            pygame.draw.line(surface, grid_color, (0, y), (self.screen_width, y))
-
     def _draw_ui(self, surface, text_color):
         """
         绘制用户界面 - 优化版：更小、更透明，支持M键切换
@@ -507,12 +609,14 @@ class InfiniteMode:
             "F2: 速度",
             "F3: 调试",
             "M: UI切换",
+            "H: 提示",
+            "F6: 自动",
             "方向键: 移动",
             "空格: 加速"
         ]
 
         # 创建右侧半透明背景（更透明）
-        help_bg = pygame.Surface((110, 140))
+        help_bg = pygame.Surface((110, 176))
         help_bg.set_alpha(96)  # 37.5%透明度
         help_bg.fill((0, 0, 0))
         surface.blit(help_bg, (self.screen_width - 115, 5))
@@ -569,9 +673,9 @@ class InfiniteMode:
         # 重置食物管理器
         self.food_manager.reset()
 
-        # 重新设置墙壁
-        self.wall_manager.clear_walls()
-        self._setup_walls()
+        # 墙体在一局中不会改变，保留墙体、静态图层和寻路网格，只把摄像机移回蛇头
+        self.camera.center_on(self.snake.position)
+        self.hint_step = None
 
         self.score = 0
         self.game_over = False
@@ -583,4 +687,4 @@ class InfiniteMode:
         self.pause_menu.reset()
         self.game_over_menu.reset()
         
-        print(f"游戏重新开始 - 难度: {self.difficulty_config.get('name', '默认')}")
+        logger.info("游戏重新开始 - 难度: %s", self.difficulty_config.get('name', '默认'))
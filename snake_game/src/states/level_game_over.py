@@ -4,6 +4,7 @@
 import pygame
 from src.configs.config import Config
 from src.utils.font_manager import get_font_manager
+from src.utils.menu_compositor import MenuCompositor
 
 
 class LevelGameOverMenu:
@@ -64,6 +65,9 @@ class LevelGameOverMenu:
         self.pulse_time = 0
         self.pulse_speed = 2.0
 
+        # 菜单合成器（冻结游戏画面，缓存合成好的菜单画面）
+        self.compositor = MenuCompositor((self.config.SCREEN_W, self.config.SCREEN_H))
+
     def handle_event(self, event):
         """
         处理事件
@@ -148,18 +152,18 @@ class LevelGameOverMenu:
         绘制界面 - 采用分散布局避免上下布局
         :param surface: 绘制表面
         """
-        # 创建半透明覆盖层
-        overlay = pygame.Surface((self.config.SCREEN_W, self.config.SCREEN_H))
-        overlay.set_alpha(self.fade_alpha)
-
+        # 半透明覆盖层
         if self.level_completed:
-            overlay.fill((0, 20, 0))  # 深绿色（通关）
+            self.compositor.set_overlay_color((0, 20, 0))  # 深绿色（通关）
         else:
-            overlay.fill((20, 0, 0))  # 深红色（失败）
+            self.compositor.set_overlay_color((20, 0, 0))  # 深红色（失败）
 
-        surface.blit(overlay, (0, 0))
+        # 第一次绘制时冻结游戏画面，面板只有界面内容或淡入透明度变化时才重新合成
+        if not self.compositor.is_frozen():
+            self.compositor.freeze(surface)
+        self.compositor.draw(surface, self.fade_alpha, self._get_panel_key(), self._draw_panels)
 
-        # 绘制标题 - 左上角
+        # 绘制标题（脉动动画，每帧绘制） - 左上角
         if self.level_completed:
             title_color = (100, 255, 100)
             title_text = "关卡完成！"
@@ -179,6 +183,21 @@ class LevelGameOverMenu:
         title_rect = title_surface.get_rect(topleft=(50, 50))
         surface.blit(title_surface, title_rect)
 
+    def _get_panel_key(self):
+        """
+        面板内容的键：通关/失败、选中项、关卡信息和统计数值
+        :return: 可哈希的键
+        """
+        snake = getattr(self.game_state, 'snake', None)
+        return ('completed' if self.level_completed else 'failed', self.selected_option,
+                self.current_level, self.total_levels, getattr(self.game_state, 'score', None),
+                snake.get_length() if hasattr(snake, 'get_length') else None)
+
+    def _draw_panels(self, surface):
+        """
+        绘制关卡信息、统计、菜单选项和控制提示面板
+        :param surface: 绘制表面
+        """
         # 绘制关卡信息 - 右上角
         self._draw_level_info(surface)
 
@@ -349,6 +368,10 @@ class LevelGameOverMenu:
         """检查界面是否完成"""
         return self.finished
 
+    def release_background(self):
+        """离开界面时释放冻结的游戏画面，下次显示时重新冻结"""
+        self.compositor.release()
+
     def set_level_info(self, current_level, total_levels, level_completed):
         """设置关卡信息"""
         self.current_level = current_level
@@ -385,3 +408,4 @@ class LevelGameOverMenu:
         self.fade_alpha = 0
         self.key_delay = 0
         self.pulse_time = 0
+        self.compositor.release()
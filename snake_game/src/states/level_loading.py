@@ -19,15 +19,28 @@ class LevelLoadingScreen:
         self.current_level = current_level
         self.total_levels = total_levels
         
-        # 加载进度
+        # 加载进度（来自后台加载任务，显示值平滑追赶真实进度）
+        self.loader = None
         self.progress = 0
-        self.loading_speed = 2  # 加载速度
+        self.display_progress = 0.0
+        self.progress_smoothing = 8.0  # 显示进度追赶速度（每秒）
         self.finished = False
         
         # 动画效果
         self.animation_time = 0
         self.dots_count = 0
         self.dot_timer = 0
+        self.last_ticks = pygame.time.get_ticks()
+
+    def set_loader(self, loader):
+        """
+        绑定后台加载任务，加载完成后界面自动结束
+        :param loader: AsyncLoader 实例
+        """
+        self.loader = loader
+        self.progress = 0
+        self.display_progress = 0.0
+        self.finished = False
 
     def update(self, surface, keys):
         """
@@ -35,13 +48,26 @@ class LevelLoadingScreen:
         :param surface: 绘制表面
         :param keys: 键盘按键状态
         """
-        # 检查是否有按键按下
-        if any(keys):
+        # 使用真实帧间隔驱动动画，不受加载线程影响
+        now = pygame.time.get_ticks()
+        dt = min((now - self.last_ticks) / 1000.0, 0.1)
+        self.last_ticks = now
+
+        if self.loader is not None:
+            # 资源就绪后立即结束加载界面
+            self.progress = self.loader.progress
+            if self.loader.done():
+                self.progress = 1.0
+                self.finished = True
+        elif any(keys):
+            # 没有后台任务时保持原有行为：按任意键继续
             self.finished = True
-        
+
+        self.display_progress += (self.progress - self.display_progress) * min(1.0, dt * self.progress_smoothing)
+
         # 更新动画
-        self.animation_time += 0.016  # 假设60FPS
-        self.dot_timer += 0.016
+        self.animation_time += dt
+        self.dot_timer += dt
         if self.dot_timer >= 0.3:
             self.dots_count = (self.dots_count + 1) % 4
             self.dot_timer = 0
@@ -82,10 +108,35 @@ class LevelLoadingScreen:
         difficulty_rect = difficulty_surface.get_rect(center=(self.config.SCREEN_W // 2, 300))
         surface.blit(difficulty_surface, difficulty_rect)
         
-        # 绘制按键提示
-        key_text = self.font_manager.render_text("按任意键继续", 'large', (150, 200, 255))
-        key_rect = key_text.get_rect(center=(self.config.SCREEN_W // 2, 360))
-        surface.blit(key_text, key_rect)
+        if self.loader is None:
+            # 绘制按键提示
+            key_text = self.font_manager.render_text("按任意键继续", 'large', (150, 200, 255))
+            key_rect = key_text.get_rect(center=(self.config.SCREEN_W // 2, 360))
+            surface.blit(key_text, key_rect)
+        else:
+            self._draw_progress(surface)
+
+    def _draw_progress(self, surface):
+        """
+        绘制真实加载进度条和当前步骤
+        :param surface: 绘制表面
+        """
+        bar_width = 360
+        bar_height = 16
+        bar_x = (self.config.SCREEN_W - bar_width) // 2
+        bar_y = 350
+
+        pygame.draw.rect(surface, (50, 50, 50), (bar_x, bar_y, bar_width, bar_height), border_radius=8)
+        fill_width = int(bar_width * self.display_progress)
+        if fill_width > 0:
+            pygame.draw.rect(surface, (150, 200, 255), (bar_x, bar_y, fill_width, bar_height), border_radius=8)
+        pygame.draw.rect(surface, (200, 200, 200), (bar_x, bar_y, bar_width, bar_height), 1, border_radius=8)
+
+        message = self.loader.message or "加载中"
+        status = f"{message}{'.' * self.dots_count}  {int(self.display_progress * 100)}%"
+        status_text = self.font_manager.render_text(status, 'medium', (150, 200, 255))
+        status_rect = status_text.get_rect(center=(self.config.SCREEN_W // 2, bar_y + 40))
+        surface.blit(status_text, status_rect)
 
     def _draw_level_hints(self, surface):
         """
@@ -114,21 +165,24 @@ class LevelLoadingScreen:
         self.current_level = level
         self.total_levels = total_levels
         self.progress = 0
+        self.display_progress = 0.0
         self.finished = False
 
     def handle_event(self, event):
         """
-        处理事件 - 允许用户按任意键继续
+        处理事件 - 没有后台加载任务时允许用户按任意键继续
         :param event: pygame事件
         """
-        if event.type == pygame.KEYDOWN:
+        if event.type == pygame.KEYDOWN and self.loader is None:
             # 按任意键继续
             self.finished = True
 
     def reset(self):
         """重置加载界面"""
         self.progress = 0
+        self.display_progress = 0.0
         self.finished = False
         self.animation_time = 0
         self.dots_count = 0
-        self.dot_timer = 0
\ No newline at end of file
+        self.dot_timer = 0
+        self.last_ticks = pygame.time.get_ticks()
\ No newline at end of file
@@ -4,46 +4,44 @@ import os
 from ..components.snake import Snake
 from ..components.food import FoodManager
 from ..components.wall import WallManager
+from ..components.camera import Camera
+from ..components.world_layer import WorldLayer
+from ..components.hint_arrow import HintArrow
+from ..components.autopilot import Autopilot
 from ..configs.config import Config
 from ..configs.game_balance import GameBalance
 from ..configs.difficulty_loader import get_difficulty_loader
 from ..configs.level_loader import get_level_loader
 from ..utils.grid_utils import GridUtils
 from ..utils.performance_monitor import PerformanceMonitor
+from ..utils.pathfinding import GridPathfinder
 from ..utils.font_manager import get_font_manager
 from ..utils.sound_manager import SoundManager
 from .level_loading import LevelLoadingScreen
 from .level_pause_menu import LevelPauseMenu
 from .level_game_over import LevelGameOverMenu
 from .level_state_manager import LevelStateManager
+from .level_prefetcher import LevelPrefetcher
+from ..utils.async_loader import AsyncLoader
+from .base_state import BaseState
+from ..utils.logger import get_logger
 
+logger = get_logger(__name__)
 
-class LevelMode:
+
+class LevelMode(BaseState):
     def __init__(self, level_name):
         """
         初始化关卡模式
         :param level_name: 关卡名称 (如 "level_01")
         """
+        super().__init__()
         self.finished = False
         self.next = None
         self.level_name = level_name
 
         # 获取关卡加载器
         self.level_loader = get_level_loader()
-        
-        # 从level_name中提取关卡名称（处理可能的文件路径）
-        actual_level_name = level_name
-        if '/' in level_name:
-            actual_level_name = os.path.basename(level_name).replace('.json', '')
-        
-        # 构建正确的配置文件路径
-        level_config_path = f"src/configs/level/{actual_level_name}.json"
-        self.level_config = self.level_loader.load_level_config(level_config_path)
-
-        if not self.level_config:
-            # 如果关卡加载失败，使用默认配置
-            self.level_config = self._get_default_level_config()
-            print(f"警告: 关卡 {actual_level_name} 加载失败，使用默认配置")
 
         # 获取难度配置加载器
         self.difficulty_loader = get_difficulty_loader()
@@ -58,23 +56,17 @@ class LevelMode:
         # 预加载音效
         self.sound_manager.initialize_preloading()
 
-        # 创建蛇实例，使用全局配置中的皮肤ID
-        skin_id = self.config.get_skin_id()
-        print(f"创建蛇实例，使用全局皮肤ID: {skin_id}")
-        self.snake = Snake("snake0", skin_id=skin_id)
-        
-        # 为蛇实例设置声音管理器
-        self.snake.sound_manager = self.sound_manager
-
-        # 应用关卡配置
-        self._apply_level_config()
-
-        # 创建墙管理器并加载墙体
-        self.wall_manager = WallManager()
-        self._setup_walls()
+        # 关卡世界（配置、蛇、墙体、食物、静态图层）由后台线程准备，加载完成前为空
+        self.level_config = None
+        self.snake = None
+        self.wall_manager = None
+        self.food_manager = None
+        self.world_layer = None
 
-        # 创建食物管理器
-        self.food_manager = FoodManager(max_food_count=GameBalance.MAX_FOOD_COUNT, wall_manager=self.wall_manager)
+        # 世界可以大于屏幕，摄像机跟随蛇头滚动
+        self.world_width = self.screen_width
+        self.world_height = self.screen_height
+        self.camera = Camera(self.screen_width, self.screen_height)
 
         # 关卡导航相关属性
         self.available_levels = self._get_available_levels()
@@ -85,7 +77,7 @@ class LevelMode:
 
         # 游戏统计
         self.score = 0
-        self.target_score = self.level_config.get('target_score', 100)
+        self.target_score = 100
         self.level_completed = False
 
         # 时间管理
@@ -93,6 +85,7 @@ class LevelMode:
 
         # 性能监控
         self.performance_monitor = PerformanceMonitor()
+        self.performance_monitor.register_counters('audio', self.sound_manager.get_channel_stats)
 
         # 字体管理器
         self.font_manager = get_font_manager()
@@ -106,42 +99,190 @@ class LevelMode:
         
         # UI显示状态
         self.show_ui = True
+
+        # 寻路提示箭头（H 键切换），寻路网格在首次使用时构建
+        self.show_hint = False
+        self.pathfinder = None
+        self.hint_arrow = HintArrow()
+        self.hint_step = None
+
+        # 自动驾驶（F6 键切换，压力测试使用）
+        self.autopilot = None
         
         # 按键防抖
         self.key_debounce = {}
         self.debounce_delay = 200  # 200毫秒防抖延迟
 
-        print(f"关卡模式初始化完成 - 关卡: {self.level_config.get('name', '未知')}, 目标分数: {self.target_score}")
+        # 下一关预取状态
+        self.prefetch_started = False
+
+        self.world_loader = None
+        self._start_world_loader()
+
+    def startup(self, persistent):
+        """
+        从状态缓存中再次进入关卡模式：同一关直接重新开始，其他关卡复用界面、摄像机等对象，只重新加载关卡世界
+        :param persistent: 持久化数据，level_name 为要进入的关卡
+        """
+        super().startup(persistent)
+        level_name = persistent.get('level_name', self.level_name)
+        if level_name == self.level_name and self.world_loader is None and self.snake is not None:
+            self.state_manager.set_level(self.current_level_index + 1, len(self.available_levels))
+            self.restart_game()
+            return
+
+        self.level_name = level_name
+        self.level_config = None
+        self.snake = None
+        self.wall_manager = None
+        self.food_manager = None
+        self.world_layer = None
+        self.pathfinder = None
+        self.hint_step = None
+        self.score = 0
+        self.level_completed = False
+        self.game_over = False
+        self.paused = False
+        self.prefetch_started = False
+        self.current_level_index = self._get_current_level_index()
+        self.state_manager.set_level(self.current_level_index + 1, len(self.available_levels))
+        self.state_manager.set_state(self.state_manager.STATE_LOADING)
+        self.performance_monitor.reset_stats()
+        self._start_world_loader()
+
+    def cleanup(self):
+        """
+        离开关卡模式时停止加速音效的循环
+        :return: 持久化数据
+        """
+        self.sound_manager.stop_high_speed_sound()
+        return super().cleanup()
+
+    def _start_world_loader(self):
+        """
+        开始准备当前关卡的世界：优先使用上一关预取的关卡世界，否则启动后台加载
+        加载界面显示真实进度，资源就绪后自动进入游戏
+        """
+        actual_level_name = self._get_actual_level_name()
+        self.world_loader = LevelPrefetcher.take(actual_level_name, self.config.get_skin_id())
+        if self.world_loader is None:
+            self.world_loader = AsyncLoader(self._load_world, actual_level_name, name=self.level_name)
+        self.state_manager.level_loading.set_loader(self.world_loader)
+
+        # 预取已完成时直接进入游戏，跳过加载界面
+        if self.world_loader.done() and self._poll_world_loader():
+            self.state_manager.set_state(self.state_manager.STATE_GAME)
+
+    def _get_actual_level_name(self):
+        """从level_name中提取关卡名称（处理可能的文件路径）"""
+        level_name = self.level_name
+        if '/' in level_name:
+            level_name = os.path.basename(level_name).replace('.json', '')
+        return level_name
+
+    def _load_world(self, report, level_name):
+        """
+        准备关卡世界（在后台线程中执行）
+        :param report: 进度回调 report(progress, message)
+        :param level_name: 关卡名称
+        :return: 关卡世界字典
+        """
+        report(0.05, "读取关卡配置")
+        level_config = self.level_loader.load_level_config(level_name)
+        if not level_config:
+            # 如果关卡加载失败，使用默认配置
+            level_config = self._get_default_level_config()
+            logger.warning("警告: 关卡 %s 加载失败，使用默认配置", level_name)
+
+        report(0.15, "创建蛇")
+        skin_id = self.config.get_skin_id()
+        logger.info("创建蛇实例，使用全局皮肤ID: %s", skin_id)
+        snake = Snake("snake0", skin_id=skin_id)
+        self._configure_snake(snake, level_config)
+
+        report(0.45, "搭建墙体")
+        wall_manager = WallManager()
+        wall_manager.load_from_difficulty_config(level_config)
+        logger.info("从关卡配置加载了墙体: %s", level_config.get('name', '未知'))
+
+        report(0.65, "绘制场景")
+        world_size = wall_manager.get_world_size()
+        world_layer = self._create_world_layer(wall_manager, snake.position)
+
+        report(0.85, "放置食物")
+        # 竞技场类地图可以在 food.count 中配置同时存在的食物数量
+        food_count = level_config.get('food', {}).get('count', GameBalance.MAX_FOOD_COUNT)
+        food_manager = FoodManager(max_food_count=food_count, wall_manager=wall_manager, world_size=world_size)
+
+        return {
+            'level_config': level_config,
+            'snake': snake,
+            'wall_manager': wall_manager,
+            'world_layer': world_layer,
+            'world_size': world_size,
+            'food_manager': food_manager,
+        }
+
+    def _apply_world(self, world):
+        """
+        在主线程中接管后台准备好的关卡世界
+        :param world: _load_world 返回的关卡世界字典
+        """
+        self.level_config = world['level_config']
+        self.snake = world['snake']
+        self.wall_manager = world['wall_manager']
+        self.food_manager = world['food_manager']
+        # 预渲染的区块在主线程首次绘制时转换为显示格式
+        self.world_layer = world['world_layer']
+        self.world_width, self.world_height = world['world_size']
+        self.camera.set_world_size(self.world_width, self.world_height)
+        self.camera.center_on(self.snake.position)
+        self.pathfinder = None
+
+        # 为蛇实例设置声音管理器
+        self.snake.sound_manager = self.sound_manager
+
+        self._apply_game_settings()
+        self.target_score = self.level_config.get('target_score', 100)
+        self.last_time = pygame.time.get_ticks()
+
+        logger.info("关卡模式初始化完成 - 关卡: %s, 目标分数: %s",
+                    self.level_config.get('name', '未知'), self.target_score)
+
+    def _poll_world_loader(self):
+        """
+        检查后台加载是否完成，完成后接管结果
+        :return: 关卡世界是否已就绪
+        """
+        if not self.world_loader.done():
+            return False
+
+        loader = self.world_loader
+        self.world_loader = None
+        try:
+            world = loader.result()
+        except Exception as e:
+            logger.error("错误: 关卡 %s 加载失败: %s，返回关卡选择", self.level_name, e)
+            self.finished = True
+            self.next = 'level_selection'
+            return False
+
+        self._apply_world(world)
+        return True
 
     def _get_available_levels(self):
         """获取所有可用的关卡"""
-        levels_dir = "./src/configs/level"
-        available_levels = []
-
-        # 检查关卡目录是否存在
-        if os.path.exists(levels_dir):
-            for file in os.listdir(levels_dir):
-                if file.startswith('level_') and file.endswith('.json'):
-                    level_name = file.replace('.json', '')
-                    available_levels.append(level_name)
+        available_levels = self.level_loader.get_available_levels()
 
         # 如果没有找到关卡文件，返回默认关卡列表
         if not available_levels:
             available_levels = ['level_01', 'level_02', 'level_03']
 
-        return sorted(available_levels)
+        return available_levels
 
     def _get_current_level_index(self):
         """获取当前关卡在可用关卡列表中的索引"""
-        # 从level_name中提取关卡名称（处理可能的文件路径）
-        level_name = self.level_name
-        if '/' in level_name:
-            level_name = os.path.basename(level_name).replace('.json', '')
-        
-        for i, level in enumerate(self.available_levels):
-            if level == level_name:
-                return i
-        return 0
+        return max(self.level_loader.get_level_index(self._get_actual_level_name()), 0)
 
     def _get_default_level_config(self):
         """获取默认关卡配置"""
@@ -165,35 +306,67 @@ class LevelMode:
 
     def _apply_level_config(self):
         """应用关卡配置到游戏参数"""
+        self._configure_snake(self.snake, self.level_config)
+        self._apply_game_settings()
+
+    def _configure_snake(self, snake, level_config):
+        """
+        应用关卡配置中的蛇参数
+        :param snake: 蛇实例
+        :param level_config: 关卡配置
+        """
         # 应用蛇的配置
-        snake_config = self.level_config.get('snake', {})
+        snake_config = level_config.get('snake', {})
         speed = snake_config.get('speed', 4)
 
         # 将JSON中的速度值转换为实际的移动速度
         actual_speed = speed * 30  # 假设每个格子30像素
 
-        self.snake.config.move_speed = actual_speed
-        self.snake.normal_speed = actual_speed
-        self.snake.boost_speed = actual_speed * self.snake.config.boost_multiplier
+        snake.config.move_speed = actual_speed
+        snake.normal_speed = actual_speed
+        snake.boost_speed = actual_speed * snake.config.boost_multiplier
 
         # 设置蛇的初始位置
         initial_pos_config = snake_config.get('initial_position', [8, 10])
         initial_pos = GridUtils.align_to_grid(initial_pos_config[0] * 30, initial_pos_config[1] * 30)
-        self.snake.rect.center = initial_pos
-        print(f"蛇初始位置设置为: {initial_pos}")
-        self.snake.reset(initial_pos)
-
-        # 应用游戏设置
+        # 与墙壁重叠时改用地图中的蛇头标记或最近的空地
+        initial_pos = self.difficulty_loader.resolve_spawn_position(level_config, initial_pos,
+                                                                    snake.config.collision_radius)
+        snake.rect.center = initial_pos
+        logger.info("蛇初始位置设置为: %s", initial_pos)
+        snake.reset(initial_pos)
+
+    def _apply_game_settings(self):
+        """应用关卡配置中的游戏设置"""
         game_settings = self.level_config.get('game_settings', {})
         self.score_multiplier = game_settings.get('score_multiplier', 1.0)
         self.walls_kill = game_settings.get('walls_kill', True)
         self.self_collision = game_settings.get('self_collision', True)
 
     def _setup_walls(self):
-        """根据关卡配置设置墙壁"""
+        """根据关卡配置设置墙壁，并重建分块静态图层"""
         # 使用关卡配置加载墙体
         self.wall_manager.load_from_difficulty_config(self.level_config)
-        print(f"从关卡配置加载了墙体: {self.level_config.get('name', '未知')}")
+        self.world_layer = self._create_world_layer(self.wall_manager, self.snake.position)
+        self.world_width, self.world_height = self.wall_manager.get_world_size()
+        self.camera.set_world_size(self.world_width, self.world_height)
+        self.camera.center_on(self.snake.position)
+        self.pathfinder = None
+        logger.info("从关卡配置加载了墙体: %s", self.level_config.get('name', '未知'))
+
+    def _create_world_layer(self, wall_manager, focus):
+        """
+        创建分块静态图层（背景、网格、墙体），并预渲染初始视口覆盖的区块
+        :param wall_manager: 墙管理器
+        :param focus: 初始视口中心（蛇头位置）
+        :return: 分块静态图层
+        """
+        world_size = wall_manager.get_world_size()
+        camera = Camera(self.screen_width, self.screen_height, *world_size)
+        camera.center_on(focus)
+        world_layer = WorldLayer(world_size, wall_manager)
+        world_layer.prewarm(camera.view_rect)
+        return world_layer
 
     def handle_event(self, event):
         """
@@ -226,6 +399,11 @@ class LevelMode:
         :param surface: 绘制表面
         :param keys: 键盘按键状态
         """
+        # 后台加载期间只更新加载界面
+        if self.world_loader is not None and not self._poll_world_loader():
+            self.state_manager.update(surface, keys)
+            return
+
         # 性能监控开始
         self.performance_monitor.start_frame()
         self.performance_monitor.start_update_timing()
@@ -241,7 +419,7 @@ class LevelMode:
             # 游戏胜利，切换到胜利界面（使用暂停界面，但标题改为游戏胜利）
             self.state_manager.set_state(self.state_manager.STATE_LEVEL_COMPLETE)
             self.state_manager.level_pause_menu.set_level_info(self.current_level_index + 1, len(self.available_levels))
-            print(f"关卡完成！得分: {self.score}, 目标分数: {self.target_score}")
+            logger.info("关卡完成！得分: %s, 目标分数: %s", self.score, self.target_score)
 
         # 更新状态管理器
         self.state_manager.update(surface, keys)
@@ -262,28 +440,18 @@ class LevelMode:
             dt = current_time - self.last_time
             self.last_time = current_time
 
-            # 处理蛇的键盘输入
-            self.snake.handle_input(keys)
+            # 处理蛇的键盘输入，自动驾驶时使用模拟按键
+            self.snake.handle_input(self._get_snake_keys(keys))
 
             # 基于时间更新蛇的位置
             self.snake.update(dt)
+            self.camera.center_on(self.snake.position)
 
             # 更新食物并检查食物碰撞
-            snake_head_pos = (self.snake.position[0], self.snake.position[1])
-            snake_body_positions = [(seg[0], seg[1]) for seg in self.snake.body_segments]
-
-            # 添加墙壁位置到避免列表
-            avoid_positions = snake_body_positions.copy()
-            avoid_positions.append(snake_head_pos)
-            avoid_positions.extend(self.wall_manager.get_wall_positions())
-
-            score_gained = self.food_manager.update(dt, snake_head_pos, snake_body_positions, self.snake.rect)
+            snake_head_pos = (self.snake.position[0], self.snake.position[1])  # 蛇头浮点坐标
+            snake_body_positions = self.snake.body_segments  # 身体浮点坐标（只读视图，零拷贝）
 
-            # 如果食物被重新生成，确保避开墙壁
-            for food in self.food_manager.foods:
-                if hasattr(food, '_needs_repositioning') and food._needs_repositioning:
-                    food.randomize_position(avoid_positions)
-                    food._needs_repositioning = False
+            score_gained = self.food_manager.update(dt, snake_head_pos, snake_body_positions, self.snake.rect)  # 获取得分
 
             # 如果吃到食物，蛇增长
             if score_gained > 0:
@@ -293,11 +461,15 @@ class LevelMode:
                 self.score += actual_score
                 # 播放吃食物音效
                 self.sound_manager.play_eat_sound()
-                print(f"得分: {self.score}, 蛇长度: {self.snake.get_length()}")
+                logger.debug("得分: %s, 蛇长度: %s", self.score, self.snake.get_length())
+                self._prefetch_next_level()
 
             # 检查其他碰撞
             self._check_collisions()
 
+            if self.show_hint:
+                self._update_hint()
+
         # 性能监控结束更新阶段
         self.performance_monitor.end_update_timing()
         self.performance_monitor.start_draw_timing()
@@ -308,6 +480,33 @@ class LevelMode:
         # 性能监控结束绘制阶段
         self.performance_monitor.end_draw_timing()
 
+    def _get_pathfinder(self):
+        """获取当前世界的寻路网格（墙体变化后首次使用时重建）"""
+        if self.pathfinder is None:
+            self.pathfinder = GridPathfinder(self.wall_manager, (self.world_width, self.world_height))
+        return self.pathfinder
+
+    def _get_snake_keys(self, keys):
+        """
+        获取控制蛇的按键状态
+        :param keys: 键盘按键状态
+        :return: 自动驾驶启用时为自动驾驶的模拟按键，否则为键盘按键
+        """
+        if self.autopilot is None:
+            return keys
+        return self.autopilot.get_keys(self._get_pathfinder(), self.snake, self.food_manager.get_food_positions())
+
+    def _update_hint(self):
+        """更新提示箭头：在寻路预算内刷新到最近食物的距离场，取蛇头的下一步"""
+        if self.autopilot is not None:
+            # 自动驾驶本帧已经刷新过距离场
+            self.hint_step = self.autopilot.last_step
+            return
+        pathfinder = self._get_pathfinder()
+        head_position = (self.snake.position[0], self.snake.position[1])
+        pathfinder.update(head_position, self.snake.body_segments, self.food_manager.get_food_positions())
+        self.hint_step = pathfinder.next_step(head_position)
+
     def _handle_input(self, keys):
         """处理额外的输入"""
         # 处理功能键防抖
@@ -327,24 +526,38 @@ class LevelMode:
         if keys[pygame.K_F3]:
             if self._can_trigger_key('F3', current_time):
                 self.debug_collision = not self.debug_collision
-                print(f"碰撞区域调试: {'开启' if self.debug_collision else '关闭'}")
+                logger.info("碰撞区域调试: %s", '开启' if self.debug_collision else '关闭')
                 self.key_debounce['F3'] = current_time
         
         # F4 切换碰撞检测调试日志
         if keys[pygame.K_F4]:
             if self._can_trigger_key('F4', current_time):
-                from src.components.food import Food
-                Food.DEBUG_COLLISION = not Food.DEBUG_COLLISION
-                print(f"碰撞检测调试日志: {'开启' if Food.DEBUG_COLLISION else '关闭'}")
+                FoodManager.DEBUG_COLLISION = not FoodManager.DEBUG_COLLISION
+                logger.info("碰撞检测调试日志: %s", '开启' if FoodManager.DEBUG_COLLISION else '关闭')
                 self.key_debounce['F4'] = current_time
         
         # M 键切换UI显示
         if keys[pygame.K_m]:
             if self._can_trigger_key('M', current_time):
                 self.show_ui = not self.show_ui
-                print(f"UI显示: {'开启' if self.show_ui else '关闭'}")
+                logger.info("UI显示: %s", '开启' if self.show_ui else '关闭')
                 self.key_debounce['M'] = current_time
         
+        # H 键切换寻路提示箭头
+        if keys[pygame.K_h]:
+            if self._can_trigger_key('H', current_time):
+                self.show_hint = not self.show_hint
+                self.hint_step = None
+                logger.info("寻路提示: %s", '开启' if self.show_hint else '关闭')
+                self.key_debounce['H'] = current_time
+        
+        # F6 切换自动驾驶
+        if keys[pygame.K_F6]:
+            if self._can_trigger_key('F6', current_time):
+                self.autopilot = None if self.autopilot is not None else Autopilot()
+                logger.info("自动驾驶: %s", '开启' if self.autopilot else '关闭')
+                self.key_debounce['F6'] = current_time
+        
         # 按键释放时清除防抖计时器
         if not keys[pygame.K_F1] and 'F1' in self.key_debounce:
             del self.key_debounce['F1']
@@ -354,6 +567,10 @@ class LevelMode:
             del self.key_debounce['F4']
         if not keys[pygame.K_m] and 'M' in self.key_debounce:
             del self.key_debounce['M']
+        if not keys[pygame.K_h] and 'H' in self.key_debounce:
+            del self.key_debounce['H']
+        if not keys[pygame.K_F6] and 'F6' in self.key_debounce:
+            del self.key_debounce['F6']
     
     def _can_trigger_key(self, key_name, current_time):
         """检查按键是否可以触发（防抖逻辑）"""
@@ -375,7 +592,7 @@ class LevelMode:
             self.state_manager.set_state(self.state_manager.STATE_GAME_OVER)
             self.state_manager.level_game_over.set_level_info(self.current_level_index + 1, len(self.available_levels),
                                                               self.level_completed)
-            print(f"游戏结束：蛇撞到自己了！最终得分: {self.score}")
+            logger.info("游戏结束：蛇撞到自己了！最终得分: %s", self.score)
             return
 
         # 检查是否撞到墙壁
@@ -390,12 +607,12 @@ class LevelMode:
                 self.state_manager.set_state(self.state_manager.STATE_GAME_OVER)
                 self.state_manager.level_game_over.set_level_info(self.current_level_index + 1, len(self.available_levels),
                                                                   self.level_completed)
-                print(f"游戏结束：蛇撞到墙壁了！最终得分: {self.score}")
+                logger.info("游戏结束：蛇撞到墙壁了！最终得分: %s", self.score)
                 return
 
         # 检查是否撞到边界
         if not getattr(self, 'walls_kill', True) or self.wall_manager.get_wall_count() == 0:
-            if self.snake.check_boundary_collision(screen_width=self.screen_width, screen_height=self.screen_height):
+            if self.snake.check_boundary_collision(screen_width=self.world_width, screen_height=self.world_height):
                 self.snake.is_dead = True
                 self.game_over = True
                 # 播放死亡音效
@@ -404,7 +621,7 @@ class LevelMode:
                 self.state_manager.set_state(self.state_manager.STATE_GAME_OVER)
                 self.state_manager.level_game_over.set_level_info(self.current_level_index + 1, len(self.available_levels),
                                                                   self.level_completed)
-                print(f"游戏结束：蛇撞到边界了！最终得分: {self.score}")
+                logger.info("游戏结束：蛇撞到边界了！最终得分: %s", self.score)
                 return
 
     def draw(self, surface):
@@ -414,19 +631,24 @@ class LevelMode:
         """
         # 获取颜色主题
         colors = GameBalance.get_color_scheme('classic')
-        surface.fill(colors['background'])
 
-        # 绘制网格（可选）
-        self._draw_grid(surface, colors['grid'])
+        # 绘制视口覆盖的静态图层区块（背景、网格、墙壁）
+        self.world_layer.draw(surface, self.camera)
+        offset = self.camera.offset
 
-        # 绘制墙壁（带碰撞调试）
-        self.wall_manager.draw(surface, self.debug_collision)
+        # 墙壁碰撞调试
+        if self.debug_collision:
+            self.wall_manager.draw_collision_debug(surface, offset)
 
         # 绘制食物（带碰撞调试）
-        self.food_manager.draw(surface, self.debug_collision)
+        self.food_manager.draw(surface, self.debug_collision, offset)
 
         # 绘制蛇（带碰撞调试）
-        self.snake.draw(surface, self.debug_collision)
+        self.snake.draw(surface, self.debug_collision, offset)
+
+        # 绘制寻路提示箭头
+        if self.show_hint:
+            self.hint_arrow.draw(surface, self.snake.position, self.hint_step, offset)
 
         # 绘制UI
         self._draw_ui(surface, colors['text'])
@@ -437,17 +659,6 @@ class LevelMode:
         # 绘制性能监控
         self.performance_monitor.draw_stats(surface)
 
-    def _draw_grid(self, surface, grid_color):
-        """绘制网格线（调试用）"""
-        show_grid = True
-        if not show_grid:
-            return
-
-        for x in range(0, self.screen_width, GridUtils.GRID_SIZE):
-            pygame.draw.line(surface, grid_color, (x, 0), (x, self.screen_height))
-        for y in range(0, self.screen_height, GridUtils.GRID_SIZE):
-            pygame.draw.line(surface, grid_color, (0, y), (self.screen_width, y))
-
     def _draw_ui(self, surface, text_color):
         """
         绘制用户界面
@@ -497,6 +708,8 @@ class LevelMode:
             "F3: 碰撞",
             "F4: 日志",
             "M: UI切换",
+            "H: 提示",
+            "F6: 自动",
             "方向键: 移动"
         ]
         
@@ -524,31 +737,50 @@ class LevelMode:
         text_rect = progress_text.get_rect(center=(bar_x + bar_width // 2, bar_y + bar_height // 2))
         surface.blit(progress_text, text_rect)
 
+    def _prefetch_next_level(self):
+        """得分达到目标分数的一定比例后，在后台预取下一关"""
+        if self.prefetch_started or self.score < self.target_score * GameBalance.LEVEL_PREFETCH_FRACTION:
+            return
+
+        self.prefetch_started = True
+        next_level = self.level_loader.get_next_level(self._get_actual_level_name())
+        if next_level is None:
+            return
+        LevelPrefetcher.prefetch(next_level, self.config.get_skin_id(), self._load_world, next_level)
+
+    def advance_level(self):
+        """
+        切换到下一关（由主循环通过状态缓存进入下一关）
+        :return: 是否存在下一关，已经是最后一关时不做任何切换并返回False
+        """
+        next_level = self.level_loader.get_next_level(self._get_actual_level_name())
+        if next_level is None:
+            return False
+        self.finished = True
+        self.next = f'level_mode:{next_level}'
+        logger.info("切换到下一关: %s", next_level)
+        return True
+
     def _go_to_next_level(self):
-        """切换到下一关"""
-        if self.current_level_index < len(self.available_levels) - 1:
-            next_level = self.available_levels[self.current_level_index + 1]
-            self.finished = True
-            self.next = f'level_mode:{next_level}'
-            print(f"切换到下一关: {next_level}")
-        else:
+        """切换到下一关，已经是最后一关时返回主菜单"""
+        if not self.advance_level():
             # 已经是最后一关，返回主菜单
             self.finished = True
             self.next = 'main_menu'
-            print("已经是最后一关，返回主菜单")
+            logger.info("已经是最后一关，返回主菜单")
 
     def _go_to_previous_level(self):
         """切换到上一关"""
-        if self.current_level_index > 0:
-            prev_level = self.available_levels[self.current_level_index - 1]
+        prev_level = self.level_loader.get_previous_level(self._get_actual_level_name())
+        if prev_level is not None:
             self.finished = True
             self.next = f'level_mode:{prev_level}'
-            print(f"切换到上一关: {prev_level}")
+            logger.info("切换到上一关: %s", prev_level)
         else:
             # 已经是第一关，返回主菜单
             self.finished = True
             self.next = 'main_menu'
-            print("已经是第一关，返回主菜单")
+            logger.info("已经是第一关，返回主菜单")
 
     def _draw_level_complete(self, surface):
         """绘制关卡完成界面"""
@@ -596,9 +828,9 @@ class LevelMode:
         # 重置食物管理器
         self.food_manager.reset()
 
-        # 重新设置墙壁
-        self.wall_manager.clear_walls()
-        self._setup_walls()
+        # 墙体在一关中不会改变，保留墙体、静态图层和寻路网格，只把摄像机移回蛇头
+        self.camera.center_on(self.snake.position)
+        self.hint_step = None
 
         self.score = 0
         self.level_completed = False
@@ -613,4 +845,4 @@ class LevelMode:
         # 重置状态管理器
         self.state_manager.set_state(self.state_manager.STATE_GAME)
 
-        print(f"关卡重新开始 - {self.level_config.get('name', '未知')}")
+        logger.info("关卡重新开始 - %s", self.level_config.get('name', '未知'))
@@ -4,6 +4,7 @@
 import pygame
 from src.configs.config import Config
 from src.utils.font_manager import get_font_manager
+from src.utils.menu_compositor import MenuCompositor
 
 
 class LevelPauseMenu:
@@ -63,6 +64,9 @@ class LevelPauseMenu:
         self.key_delay = 0
         self.key_delay_time = 150
 
+        # 菜单合成器（冻结游戏画面，缓存合成好的菜单画面）
+        self.compositor = MenuCompositor((self.screen_width, self.screen_height))
+
     def handle_event(self, event):
         """
         处理事件
@@ -148,12 +152,26 @@ class LevelPauseMenu:
         绘制界面 - 采用分散布局避免重叠
         :param surface: 绘制表面
         """
-        # 创建半透明覆盖层
-        overlay = pygame.Surface((self.screen_width, self.screen_height))
-        overlay.set_alpha(self.fade_alpha)
-        overlay.fill((0, 0, 0))
-        surface.blit(overlay, (0, 0))
+        # 第一次绘制时冻结游戏画面，之后只有界面内容或淡入透明度变化时才重新合成
+        if not self.compositor.is_frozen():
+            self.compositor.freeze(surface)
+        self.compositor.draw(surface, self.fade_alpha, self._get_panel_key(), self._draw_panels)
+
+    def _get_panel_key(self):
+        """
+        面板内容的键：暂停/胜利、选中项、关卡信息和统计数值
+        :return: 可哈希的键
+        """
+        snake = getattr(self.game_state, 'snake', None)
+        return ('victory' if self.is_victory else 'pause', self.selected_option,
+                self.current_level, self.total_levels, getattr(self.game_state, 'score', None),
+                snake.get_length() if hasattr(snake, 'get_length') else None)
 
+    def _draw_panels(self, surface):
+        """
+        绘制标题和各个面板
+        :param surface: 绘制表面
+        """
         # 分散布局：标题在左上角
         title = "游戏胜利" if self.is_victory else "游戏暂停"
         title_text = self.font_manager.render_text(title, 'large', (255, 255, 255))
@@ -327,6 +345,10 @@ class LevelPauseMenu:
         """设置关卡选择回调函数"""
         self.level_selection_callback = callback
 
+    def release_background(self):
+        """离开界面时释放冻结的游戏画面，下次显示时重新冻结"""
+        self.compositor.release()
+
     def set_victory_mode(self, is_victory=True):
         """设置是否为胜利模式"""
         self.is_victory = is_victory
@@ -338,3 +360,4 @@ class LevelPauseMenu:
         self.selected_option = 0
         self.fade_alpha = 0
         self.key_delay = 0
+        self.compositor.release()
@@ -0,0 +1,53 @@
+"""
+关卡预取器 - 当前关卡进行中在后台准备下一关，切换关卡时直接接管
+"""
+from typing import Callable, Dict, Optional, Tuple
+from ..utils.async_loader import AsyncLoader
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LevelPrefetcher:
+    """关卡预取器 - 以 (关卡名称, 皮肤ID) 为键保存后台加载任务，最多保留一个"""
+
+    _loaders: Dict[Tuple[str, int], AsyncLoader] = {}
+
+    @classmethod
+    def prefetch(cls, level_name: str, skin_id: int, task: Callable, *args) -> None:
+        """
+        在后台预取关卡（已在预取中则忽略）
+        :param level_name: 关卡名称
+        :param skin_id: 预取时使用的皮肤ID
+        :param task: 关卡加载函数 task(report, *args)
+        :param args: 传给加载函数的参数
+        """
+        key = (level_name, skin_id)
+        if key in cls._loaders:
+            return
+        cls.discard()
+        cls._loaders[key] = AsyncLoader(task, *args, name=f"prefetch:{level_name}")
+        logger.info("开始预取关卡: %s", level_name)
+
+    @classmethod
+    def take(cls, level_name: str, skin_id: int) -> Optional[AsyncLoader]:
+        """
+        取出预取任务（取出后不再保留）
+        :param level_name: 关卡名称
+        :param skin_id: 当前皮肤ID，与预取时不一致则视为失效
+        :return: 后台加载任务，没有可用的预取结果时返回None
+        """
+        loader = cls._loaders.pop((level_name, skin_id), None)
+        cls.discard()
+        if loader is not None and loader.failed():
+            return None
+        if loader is not None:
+            logger.info("使用预取的关卡: %s", level_name)
+        return loader
+
+    @classmethod
+    def discard(cls) -> None:
+        """丢弃所有预取任务（尚未开始的任务会被取消）"""
+        for loader in cls._loaders.values():
+            loader.cancel()
+        cls._loaders.clear()
@@ -2,20 +2,27 @@
 关卡选择界面
 """
 import pygame
-import os
 import math
 from ..configs.config import Config
+from ..configs.level_loader import get_level_loader
 from ..utils.font_manager import get_font_manager
 from ..utils.image_manager import get_image_manager
+from ..components.particles import ParticleSystem
 from .base_state import BaseState
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class LevelSelection(BaseState):
+    PARTICLE_COUNT = 400  # 背景粒子数量
+
     def __init__(self):
         """
         初始化关卡选择界面
         """
-        print("初始化关卡选择界面...")
+        logger.info("初始化关卡选择界面...")
+        super().__init__()
         self.config = Config.get_instance()
         self.finished = False
         self.next = None
@@ -29,7 +36,7 @@ class LevelSelection(BaseState):
 
         # 加载关卡列表
         self.levels = self._load_levels()
-        print(f"加载了 {len(self.levels)} 个关卡")
+        logger.info("加载了 %s 个关卡", len(self.levels))
         self.selected_index = 0  # 当前选中的关卡索引
         
         # 动画相关变量
@@ -43,9 +50,20 @@ class LevelSelection(BaseState):
         self._create_background()
         
         # 粒子效果
-        self.particles = []
         self._init_particles()
 
+    def startup(self, persistent):
+        """
+        从状态缓存中再次进入关卡选择：保留关卡列表、背景和光标位置
+        :param persistent: 持久化数据
+        """
+        super().startup(persistent)
+        self.selected_level = None
+
+    def is_animating(self):
+        """最近有操作或列表滚动未结束时在变化"""
+        return self._has_recent_input() or self.scroll_offset != self.target_scroll_offset
+
     def _create_background(self):
         """创建渐变背景"""
         self.background_surface = pygame.Surface((self.config.SCREEN_W, self.config.SCREEN_H))
@@ -59,78 +77,30 @@ class LevelSelection(BaseState):
             pygame.draw.line(self.background_surface, (r, g, b), (0, y), (self.config.SCREEN_W, y))
             
     def _init_particles(self):
-        """初始化粒子效果"""
-        for _ in range(50):
-            self.particles.append({
-                'x': pygame.time.get_ticks() % self.config.SCREEN_W,
-                'y': pygame.time.get_ticks() % self.config.SCREEN_H,
-                'speed': 0.5 + 0.5 * math.sin(pygame.time.get_ticks() * 0.001),
-                'size': 1 + 2 * math.sin(pygame.time.get_ticks() * 0.002),
-                'color': (255, 255, 255, 50 + int(50 * math.sin(pygame.time.get_ticks() * 0.003)))
-            })
-            
-    def _draw_particles(self, surface):
-        """绘制粒子效果"""
-        for particle in self.particles:
-            # 更新粒子位置
-            particle['x'] += particle['speed'] * math.sin(pygame.time.get_ticks() * 0.001)
-            particle['y'] += particle['speed'] * math.cos(pygame.time.get_ticks() * 0.001)
-            
-            # 边界检查
-            if particle['x'] < 0:
-                particle['x'] = self.config.SCREEN_W
-            if particle['x'] > self.config.SCREEN_W:
-                particle['x'] = 0
-            if particle['y'] < 0:
-                particle['y'] = self.config.SCREEN_H
-            if particle['y'] > self.config.SCREEN_H:
-                particle['y'] = 0
-                
-            # 绘制粒子
-            pygame.draw.circle(surface, particle['color'], 
-                             (int(particle['x']), int(particle['y'])), 
-                             int(particle['size']))
+        """初始化粒子效果（布满屏幕，随时间整体飘动，超出边界从另一侧出现）"""
+        self.particles = ParticleSystem(
+            self.PARTICLE_COUNT, (self.config.SCREEN_W, self.config.SCREEN_H), (255, 255, 255),
+            size_range=(1, 3), speed=0.1, life_range=(200, 400), alpha_range=(50, 100),
+            drift_range=(0.5, 1.0), wrap=True)
 
-    def _load_levels(self):
-        """加载关卡列表"""
-        import os
-
-        level_path = "./src/configs/level"
-
-        print(f"检查路径: {level_path}")
-        if os.path.exists(level_path):
-            levels_dir = level_path
-            print(f"找到关卡目录: {levels_dir}")
-        else:
-            print(f"未找到关卡目录: {level_path}")
+    def _update_particles(self):
+        """更新粒子效果：整体漂移方向随时间旋转"""
+        seconds = pygame.time.get_ticks() * 0.001
+        self.particles.update((math.sin(seconds), math.cos(seconds)))
 
+    def _load_levels(self):
+        """加载关卡列表（来自配置注册表的元数据索引，不重复解析关卡文件）"""
         levels = []
-
-        # 遍历关卡目录下的所有JSON文件
-        for filename in os.listdir(levels_dir):
-            if filename.startswith("level_") and filename.endswith(".json"):
-                level_path = os.path.join(levels_dir, filename)
-                try:
-                    import json
-                    with open(level_path, 'r', encoding='utf-8') as f:
-                        level_data = json.load(f)
-
-                    # 提取关卡信息
-                    level_info = {
-                        'name': level_data.get('name', '未知关卡'),
-                        'description': level_data.get('description', ''),
-                        'target_score': level_data.get('target_score', 100),
-                        'file_path': level_path,
-                        'file_name': filename
-                    }
-                    levels.append(level_info)
-                except Exception as e:
-                    print(f"加载关卡文件失败 {filename}: {e}")
-
-        # 按文件名排序
-        levels.sort(key=lambda x: x['file_name'])
-
-        print(f"加载了 {len(levels)} 个关卡")
+        for info in get_level_loader().get_all_levels_info():
+            # 提取关卡信息
+            levels.append({
+                'name': info.get('name') or '未知关卡',
+                'description': info.get('description') or '',
+                'target_score': info.get('target_score') or 100,
+                'file_path': info['file_path'],
+                'file_name': info['file_name']
+            })
+        logger.info("加载了 %s 个关卡", len(levels))
         return levels
 
     def handle_event(self, event):
@@ -156,7 +126,8 @@ class LevelSelection(BaseState):
 
                     # 保存关卡信息到全局配置
                     self.config.set_selected_level(self.selected_level)
-                    print(f"选择了关卡: {self.selected_level['name']}, 文件: {self.selected_level['file_path']}")
+                    logger.info("选择了关卡: %s, 文件: %s",
+                                self.selected_level['name'], self.selected_level['file_path'])
             elif event.key == pygame.K_LEFT or event.key == pygame.K_a:
                 # 快速切换到上一个关卡
                 self.selected_index = (self.selected_index - 1) % len(self.levels)
@@ -177,7 +148,8 @@ class LevelSelection(BaseState):
             self.scroll_offset += (self.target_scroll_offset - self.scroll_offset) * 0.2
         else:
             self.scroll_offset = self.target_scroll_offset
-            
+
+        self._update_particles()
         self.draw(surface)
 
     def draw(self, surface):
@@ -188,7 +160,7 @@ class LevelSelection(BaseState):
         surface.blit(self.background_surface, (0, 0))
         
         # 添加动态粒子效果
-        self._draw_particles(surface)
+        self.particles.draw(surface)
 
         # 绘制标题（带阴影效果）
         title_color = (255, 215, 0)  # 金色
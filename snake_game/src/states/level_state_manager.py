@@ -39,11 +39,28 @@ class LevelStateManager:
         # 状态切换回调
         self.on_state_change = None
     
+    def set_level(self, current_level, total_levels):
+        """
+        切换到另一关时更新各界面的关卡信息（复用界面实例）
+        :param current_level: 当前关卡（从 1 开始）
+        :param total_levels: 总关卡数
+        """
+        self.level_loading.set_level(current_level, total_levels)
+        self.level_pause_menu.set_level_info(current_level, total_levels)
+        self.level_pause_menu.set_victory_mode(False)
+        self.level_game_over.set_level_info(current_level, total_levels, False)
+
     def set_state(self, new_state):
         """设置新的状态"""
         if new_state != self.current_state:
             old_state = self.current_state
             self.current_state = new_state
+
+            # 离开菜单界面时释放冻结的游戏画面，下次进入时重新冻结
+            if old_state in (self.STATE_PAUSE, self.STATE_LEVEL_COMPLETE):
+                self.level_pause_menu.release_background()
+            elif old_state == self.STATE_GAME_OVER:
+                self.level_game_over.release_background()
             
             # 同步游戏状态
             if new_state == self.STATE_PAUSE:
@@ -77,6 +94,9 @@ class LevelStateManager:
         """更新界面 - 根据当前状态更新对应的界面"""
         if self.current_state == self.STATE_LOADING:
             self.level_loading.update(surface, keys)
+            # 资源加载完成后立即进入游戏
+            if self.level_loading.is_finished():
+                self.set_state(self.STATE_GAME)
         elif self.current_state == self.STATE_PAUSE:
             self.level_pause_menu.update(surface, keys)
         elif self.current_state == self.STATE_GAME_OVER:
@@ -3,19 +3,26 @@
 """
 import pygame
 import math
-import random
 from ..configs.config import Config
 from ..configs.skin_config import get_snake_colors
 from ..configs.game_balance import GameBalance
 from ..utils.font_manager import get_font_manager
 from ..utils.image_manager import get_image_manager
+from ..components.particles import ParticleSystem
+from ..components.title_renderer import TitleRenderer
+from .base_state import BaseState
 
 
-class MainMenu:
+class MainMenu(BaseState):
+    ATTRACT_IDLE_MS = 20000  # 主菜单无操作超过该时间后进入演示模式（毫秒）
+    PARTICLE_COUNT = 600  # 背景粒子数量
+    TITLE_TEXT = "果香蛇踪"
+
     def __init__(self):
         """
         初始化主菜单状态
         """
+        super().__init__()
         self.config = Config.get_instance()
         self.finished = False
         self.next = "difficulty_selection"  # 先进入难度选择界面
@@ -25,6 +32,7 @@ class MainMenu:
 
         # 获取图片管理器
         self.image_manager = get_image_manager()
+        self.warming_up = True  # 是否还有图片需要在空闲帧中加载
 
         # 菜单选项
         self.menu_options = ["无尽模式", "闯关模式", "选择皮肤", "退出"]
@@ -52,38 +60,50 @@ class MainMenu:
         }
         
         # 粒子效果
-        self.particles = []
         self._init_particles()
 
+        # 标题（渐变色字符和发光效果只渲染一次）
+        self.title_renderer = TitleRenderer(self.TITLE_TEXT, self.font_manager.get_font('title'),
+                                            self.colors['title_gradient_start'], self.colors['title_gradient_end'],
+                                            self.config.SCREEN_W)
+
+    def startup(self, persistent):
+        """
+        从状态缓存中再次进入主菜单：保留选项和动画，重置跳转目标（演示模式计时由基类重置）
+        :param persistent: 持久化数据
+        """
+        super().startup(persistent)
+        self.next = "difficulty_selection"
+
+    def is_animating(self):
+        """最近有操作、按钮动画未结束或还有图片要加载时在变化"""
+        if self._has_recent_input() or self.warming_up:
+            return True
+        return any(0.0 < value < 1.0 for value in self.button_hover_animation)
+
+    def idle_update(self):
+        """空闲期间也要检查是否该进入演示模式"""
+        self._check_attract_mode()
+
+    def _check_attract_mode(self):
+        """长时间无操作时进入演示模式"""
+        if pygame.time.get_ticks() - self.last_input_time > self.ATTRACT_IDLE_MS:
+            self.finished = True
+            self.next = "attract_mode"
+
     def _init_particles(self):
-        """初始化粒子效果"""
-        for _ in range(20):
-            self.particles.append({
-                'x': random.uniform(self.config.SCREEN_W * 0.2, self.config.SCREEN_W * 0.8),
-                'y': random.uniform(self.config.SCREEN_H * 0.2, self.config.SCREEN_H * 0.8),
-                'size': random.uniform(1, 4),
-                'speed_x': random.uniform(-0.5, 0.5),
-                'speed_y': random.uniform(-0.5, 0.5),
-                'life': random.uniform(50, 150)
-            })
-
-    def _update_particles(self):
-        """更新粒子效果"""
-        for particle in self.particles:
-            particle['x'] += particle['speed_x']
-            particle['y'] += particle['speed_y']
-            particle['life'] -= 1
-            
-            # 重置死亡的粒子
-            if particle['life'] <= 0 or particle['x'] < 0 or particle['x'] > self.config.SCREEN_W or particle['y'] < 0 or particle['y'] > self.config.SCREEN_H:
-                particle['x'] = random.uniform(self.config.SCREEN_W * 0.2, self.config.SCREEN_W * 0.8)
-                particle['y'] = random.uniform(self.config.SCREEN_H * 0.2, self.config.SCREEN_H * 0.8)
-                particle['life'] = random.uniform(50, 150)
+        """初始化粒子效果（在屏幕中部生成，寿命将尽时淡出）"""
+        screen_w, screen_h = self.config.SCREEN_W, self.config.SCREEN_H
+        self.particles = ParticleSystem(
+            self.PARTICLE_COUNT, (screen_w, screen_h), self.colors['particle_color'][:3],
+            spawn_rect=(screen_w * 0.2, screen_h * 0.2, screen_w * 0.6, screen_h * 0.6),
+            size_range=(1, 4), speed=0.5, life_range=(50, 150), fade_per_life=2.55)
 
     def update_cursor(self, event_key):
         """
         处理菜单导航
         """
+        self.last_input_time = pygame.time.get_ticks()
         if event_key == pygame.K_UP or event_key == pygame.K_w:
             self.selected_option = (self.selected_option - 1) % len(self.menu_options)
         elif event_key == pygame.K_DOWN or event_key == pygame.K_s:
@@ -119,7 +139,14 @@ class MainMenu:
                 self.button_hover_animation[i] = max(self.button_hover_animation[i] - 0.1, 0.0)
                 
         # 更新粒子效果
-        self._update_particles()
+        self.particles.update()
+
+        # 第一帧显示之后，在空闲帧中逐个加载其余图片
+        if self.warming_up and self.animation_time > 1:
+            self.warming_up = self.image_manager.warm_up_next()
+
+        # 长时间无操作时进入演示模式
+        self._check_attract_mode()
         
         self.draw(surface)
 
@@ -131,7 +158,7 @@ class MainMenu:
         self._draw_gradient_background(surface)
         
         # 绘制粒子效果
-        self._draw_particles(surface)
+        self.particles.draw(surface)
         
         # 绘制标题（带渐变效果）
         self._draw_title(surface)
@@ -155,80 +182,15 @@ class MainMenu:
             b = int(self.colors['background_start'][2] * (1 - ratio) + self.colors['background_end'][2] * ratio)
             pygame.draw.line(surface, (r, g, b), (0, y), (self.config.SCREEN_W, y))
 
-    def _draw_particles(self, surface):
-        """绘制粒子效果"""
-        for particle in self.particles:
-            alpha = min(255, int(particle['life'] * 2.55))
-            color = (*self.colors['particle_color'][:3], alpha)
-            pygame.draw.circle(surface, color, (int(particle['x']), int(particle['y'])), int(particle['size']))
-
     def _draw_title(self, surface):
-        """绘制标题（带渐变效果）"""
-        title_text = "果香蛇踪"
-        title_font = self.font_manager.get_font('title')
-        
-        # 创建标题表面
-        title_surface = pygame.Surface((self.config.SCREEN_W, 120), pygame.SRCALPHA)
-        
-        # 计算标题总宽度以实现居中
-        total_width = 0
-        char_surfaces = []
-        for char in title_text:
-            char_surface = title_font.render(char, True, (255, 255, 255))  # 临时颜色计算宽度
-            total_width += char_surface.get_width()
-            char_surfaces.append(char_surface)
-        
-        # 计算起始x坐标以实现居中
-        start_x = (self.config.SCREEN_W - total_width - (len(title_text) - 1) * 15) // 2
-        
-        # 绘制渐变标题 - 使用更明显的颜色对比
-        for i, char in enumerate(title_text):
-            # 计算字符的渐变颜色 - 增强对比度
-            char_ratio = i / (len(title_text) - 1) if len(title_text) > 1 else 0
-            r = int(self.colors['title_gradient_start'][0] * (1 - char_ratio) + self.colors['title_gradient_end'][0] * char_ratio)
-            g = int(self.colors['title_gradient_start'][1] * (1 - char_ratio) + self.colors['title_gradient_end'][1] * char_ratio)
-            b = int(self.colors['title_gradient_start'][2] * (1 - char_ratio) + self.colors['title_gradient_end'][2] * char_ratio)
-            
-            # 添加动画效果 - 字符轻微浮动
-            float_offset = math.sin(self.animation_time * 0.05 + i * 0.5) * 3
-            
-            # 渲染单个字符
-            char_surface = title_font.render(char, True, (r, g, b))
-            char_rect = char_surface.get_rect()
-            char_rect.x = start_x + sum([char_surfaces[j].get_width() for j in range(i)]) + i * 15  # 动态计算位置
-            char_rect.y = 30 + float_offset
-            
-            # 增强发光效果
-            glow_intensity = 150 + int(math.sin(self.animation_time * 0.1 + i) * 50)
-            glow_surface = title_font.render(char, True, (r, g, b, glow_intensity))
-            
-            # 多层发光效果
-            for offset in [(2, 2), (-2, -2), (2, -2), (-2, 2), (0, 3), (0, -3)]:
-                glow_rect = char_rect.copy()
-                glow_rect.x += offset[0]
-                glow_rect.y += offset[1]
-                title_surface.blit(glow_surface, glow_rect)
-            
-            # 添加外发光
-            outer_glow = title_font.render(char, True, (255, 255, 200, 80))
-            for offset in [(3, 3), (-3, -3), (3, -3), (-3, 3)]:
-                glow_rect = char_rect.copy()
-                glow_rect.x += offset[0]
-                glow_rect.y += offset[1]
-                title_surface.blit(outer_glow, glow_rect)
-            
-            title_surface.blit(char_surface, char_rect)
-        
+        """绘制标题（带渐变效果）：字符图片已预先渲染，每帧只计算浮动偏移和光晕大小"""
         # 添加标题背景光晕
         glow_radius = 100 + int(math.sin(self.animation_time * 0.08) * 20)
-        glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surface, (255, 200, 100, 30), (glow_radius, glow_radius), glow_radius)
-        glow_rect = glow_surface.get_rect(center=(self.config.SCREEN_W // 2, 60))
-        surface.blit(glow_surface, glow_rect)
-        
-        # 定位标题
-        title_rect = title_surface.get_rect(center=(self.config.SCREEN_W // 2, 120))
-        surface.blit(title_surface, title_rect)
+        self.title_renderer.draw_halo(surface, glow_radius, (self.config.SCREEN_W // 2, 60))
+
+        # 字符轻微浮动
+        float_offsets = [math.sin(self.animation_time * 0.05 + i * 0.5) * 3 for i in range(len(self.TITLE_TEXT))]
+        self.title_renderer.draw(surface, 90, float_offsets)
 
     def _draw_menu_buttons(self, surface):
         """绘制现代化菜单按钮"""
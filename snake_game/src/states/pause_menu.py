@@ -4,6 +4,7 @@
 import pygame
 from src.configs.config import Config
 from src.utils.font_manager import get_font_manager
+from src.utils.menu_compositor import MenuCompositor
 
 
 class PauseMenu:
@@ -40,6 +41,9 @@ class PauseMenu:
         self.key_delay = 0
         self.key_delay_time = 150  # 毫秒
 
+        # 菜单合成器（冻结游戏画面，缓存合成好的菜单画面）
+        self.compositor = MenuCompositor((self.config.SCREEN_W, self.config.SCREEN_H))
+
     def handle_event(self, event):
         """
         处理事件
@@ -102,18 +106,28 @@ class PauseMenu:
         绘制暂停界面
         :param surface: 绘制表面
         """
-        # 创建半透明覆盖层
-        overlay = pygame.Surface((self.config.SCREEN_W, self.config.SCREEN_H))
-        overlay.set_alpha(self.fade_alpha)
-        overlay.fill((0, 0, 0))
-        surface.blit(overlay, (0, 0))
-
-        # 创建半透明覆盖层
-        overlay = pygame.Surface((self.config.SCREEN_W, self.config.SCREEN_H))
-        overlay.set_alpha(self.fade_alpha)
-        overlay.fill((0, 0, 0))
-        surface.blit(overlay, (0, 0))
+        # 第一次绘制时冻结游戏画面，之后只有选中项、统计或淡入透明度变化时才重新合成
+        if not self.compositor.is_frozen():
+            self.compositor.freeze(surface)
+        self.compositor.draw(surface, self.fade_alpha, self._get_panel_key(), self._draw_panels)
 
+    def _get_panel_key(self):
+        """
+        面板内容的键：选中项和统计数值
+        :return: 可哈希的键
+        """
+        game_state = self.game_state
+        snake = getattr(game_state, 'snake', None)
+        difficulty_config = getattr(game_state, 'difficulty_config', None)
+        return ('pause', self.selected_option, getattr(game_state, 'score', None),
+                snake.get_length() if hasattr(snake, 'get_length') else None,
+                difficulty_config.get('name') if difficulty_config else None)
+
+    def _draw_panels(self, surface):
+        """
+        绘制标题、统计、菜单选项和控制提示（覆盖层之上的全部内容）
+        :param surface: 绘制表面
+        """
         # 绘制暂停标题（左上角）
         title_text = self.font_manager.render_text("游戏暂停", 'large', (255, 255, 255))
         title_rect = title_text.get_rect(topleft=(50, 50))
@@ -246,3 +260,4 @@ class PauseMenu:
         self.selected_option = 0
         self.fade_alpha = 0
         self.key_delay = 0
+        self.compositor.release()
@@ -0,0 +1,72 @@
+"""
+状态注册表 - 状态模块在第一次切换到该状态时才导入；状态缓存保留切换过的状态实例
+启动时只需要导入主菜单，游戏模式及其组件（寻路、关卡加载等）推迟到第一次进入时
+"""
+import importlib
+from typing import Dict, Hashable, Tuple
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 状态名称 -> (模块, 类名)
+STATE_MODULES = {
+    "main_menu": ("main_menu", "MainMenu"),
+    "difficulty_selection": ("difficulty_selection", "DifficultySelection"),
+    "infinite_mode": ("infinite_mode", "InfiniteMode"),
+    "skin_selection": ("skin_selection", "SkinSelection"),
+    "level_selection": ("level_selection", "LevelSelection"),
+    "level_mode": ("level_mode", "LevelMode"),
+}
+
+_state_classes: Dict[str, type] = {}
+
+
+def get_state_class(name: str) -> type:
+    """
+    获取状态类（第一次获取时导入对应模块）
+    :param name: 状态名称（STATE_MODULES 的键）
+    :return: 状态类
+    """
+    state_class = _state_classes.get(name)
+    if state_class is None:
+        module_name, class_name = STATE_MODULES[name]
+        module = importlib.import_module(f".{module_name}", __package__)
+        state_class = getattr(module, class_name)
+        _state_classes[name] = state_class
+        logger.debug("状态模块已导入: %s", module_name)
+    return state_class
+
+
+class StateCache:
+    """
+    热状态缓存 - 每种状态保留一个实例
+    再次切换到该状态且构造参数（变体）相同时，通过 startup(persistent) 复用实例而不是重新创建
+    """
+
+    def __init__(self):
+        self._states: Dict[str, Tuple[Hashable, object]] = {}  # 缓存名称 -> (变体, 状态实例)
+
+    def get(self, name: str, variant: Hashable = None):
+        """
+        获取可复用的状态实例
+        :param name: 缓存名称
+        :param variant: 变体（如难度和皮肤），与缓存实例不同时不复用
+        :return: 状态实例，没有可复用的实例时返回 None
+        """
+        entry = self._states.get(name)
+        if entry is None or entry[0] != variant:
+            return None
+        return entry[1]
+
+    def put(self, name: str, state, variant: Hashable = None) -> None:
+        """
+        缓存状态实例（替换同名的旧实例）
+        :param name: 缓存名称
+        :param state: 状态实例（需要实现 startup / cleanup）
+        :param variant: 变体
+        """
+        self._states[name] = (variant, state)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._states.clear()
@@ -9,14 +9,21 @@ from ..configs.skin_config import get_available_skins, get_skin_by_key, get_snak
 from ..configs.game_balance import GameBalance
 from ..utils.font_manager import get_font_manager
 from ..utils.image_manager import get_image_manager
+from ..utils.logger import get_logger
+from .base_state import BaseState
 
+logger = get_logger(__name__)
+
+
+class SkinSelection(BaseState):
+    CARD_GLOW_PADDING = 5  # 选中卡片外发光边框超出卡片的距离
 
-class SkinSelection:
     def __init__(self, previous_state=None):
         """
         初始化皮肤选择状态 - 卡片式布局
         :param previous_state: 前一个状态，用于判断是从哪个状态进入的
         """
+        super().__init__()
         self.config = Config.get_instance()
         self.finished = False
         self.next = "main_menu"
@@ -46,6 +53,10 @@ class SkinSelection:
         # 获取图片管理器
         self.image_manager = get_image_manager()
 
+        # 卡片图片缓存 (皮肤ID, 是否选中) -> 卡片图片
+        self.card_cache = {}
+        self.background_surface = None
+
         # 按钮位置 - 只保留返回按钮，居中显示
         self.back_button_rect = pygame.Rect(
             self.config.SCREEN_W // 2 - 100,
@@ -53,6 +64,21 @@ class SkinSelection:
             200, 50
         )
 
+    def startup(self, persistent):
+        """
+        从状态缓存中再次进入皮肤选择
+        :param persistent: 持久化数据，previous_state 为前一个状态
+        """
+        super().startup(persistent)
+        self.next = "main_menu"
+        self.previous_state = persistent.get('previous_state')
+
+    def is_animating(self):
+        """最近有操作或卡片悬停动画未结束时在变化"""
+        if self._has_recent_input():
+            return True
+        return any(0 < value < 1.0 for value in self.hover_animation.values())
+
     def _calculate_layout(self):
         """计算卡片布局"""
         total_cards = len(self.skin_options)
@@ -102,7 +128,7 @@ class SkinSelection:
             # 立即保存皮肤ID到全局配置
             skin_id = self._get_skin_id_from_key(self.selected_skin['image_prefix'])
             self.config.set_skin_id(skin_id)
-            print(f"选择了皮肤: {self.selected_skin['name']}, 皮肤ID: {skin_id}")
+            logger.info("选择了皮肤: %s, 皮肤ID: %s", self.selected_skin['name'], skin_id)
         elif event_key == pygame.K_RETURN:
             # 回车键选择皮肤，但不离开当前界面
             self.selected_skin = self.skin_options[self.selected_option]
@@ -110,7 +136,7 @@ class SkinSelection:
             # 立即保存皮肤ID到全局配置
             skin_id = self._get_skin_id_from_key(self.selected_skin['image_prefix'])
             self.config.set_skin_id(skin_id)
-            print(f"选择了皮肤: {self.selected_skin['name']}, 皮肤ID: {skin_id}")
+            logger.info("选择了皮肤: %s, 皮肤ID: %s", self.selected_skin['name'], skin_id)
         elif event_key == pygame.K_ESCAPE:
             # ESC键返回
             self.finished = True
@@ -164,27 +190,48 @@ class SkinSelection:
         self._draw_controls_help(surface)
 
     def _draw_background(self, surface):
-        """绘制背景"""
-        # 深色渐变背景
-        for y in range(self.config.SCREEN_H):
-            ratio = y / self.config.SCREEN_H
-            r = int(20 * (1 - ratio))
-            g = int(15 * (1 - ratio))
-            b = int(30 * (1 - ratio))
-            pygame.draw.line(surface, (r, g, b), (0, y), (self.config.SCREEN_W, y))
+        """绘制背景（渐变只在第一次绘制时生成）"""
+        if self.background_surface is None:
+            self.background_surface = pygame.Surface((self.config.SCREEN_W, self.config.SCREEN_H))
+            # 深色渐变背景
+            for y in range(self.config.SCREEN_H):
+                ratio = y / self.config.SCREEN_H
+                r = int(20 * (1 - ratio))
+                g = int(15 * (1 - ratio))
+                b = int(30 * (1 - ratio))
+                pygame.draw.line(self.background_surface, (r, g, b), (0, y), (self.config.SCREEN_W, y))
+        surface.blit(self.background_surface, (0, 0))
 
     def _draw_skin_card(self, surface, skin, x, y, is_selected, hover_progress):
-        """绘制单个皮肤卡片"""
+        """绘制单个皮肤卡片（卡片图片已缓存，悬停动画只上移卡片）"""
+        card = self._get_card_surface(skin, is_selected)
+        hover_offset = int(hover_progress * 5)
+        surface.blit(card, (x - self.CARD_GLOW_PADDING, y - hover_offset - self.CARD_GLOW_PADDING))
+
+    def _get_card_surface(self, skin, is_selected):
+        """
+        获取卡片图片（第一次获取时绘制并缓存）
+        :param skin: 皮肤配置
+        :param is_selected: 是否选中
+        :return: 四周留出发光边框空间的卡片图片
+        """
+        key = (skin['skin_id'], is_selected)
+        card = self.card_cache.get(key)
+        if card is None:
+            card = self._render_skin_card(skin, is_selected)
+            self.card_cache[key] = card
+        return card
+
+    def _render_skin_card(self, skin, is_selected):
+        """绘制单个皮肤卡片到独立的图片上"""
         # 获取皮肤颜色配置
         skin_id = skin['skin_id']
         colors = get_snake_colors(skin_id, is_selected)  # is_selected作为加速状态
 
-        # 计算卡片区域
-        card_rect = pygame.Rect(x, y, self.card_width, self.card_height)
-
-        # 悬停效果
-        hover_offset = int(hover_progress * 5)
-        card_rect.y -= hover_offset
+        # 卡片区域（四周留出发光边框的空间）
+        padding = self.CARD_GLOW_PADDING
+        card = pygame.Surface((self.card_width + padding * 2, self.card_height + padding * 2), pygame.SRCALPHA)
+        card_rect = pygame.Rect(padding, padding, self.card_width, self.card_height)
 
         # 卡片背景
         if is_selected:
@@ -199,14 +246,14 @@ class SkinSelection:
             border_width = 2
 
         # 绘制卡片背景
-        pygame.draw.rect(surface, bg_color, card_rect, border_radius=12)
-        pygame.draw.rect(surface, border_color, card_rect, border_width, border_radius=12)
+        pygame.draw.rect(card, bg_color, card_rect, border_radius=12)
+        pygame.draw.rect(card, border_color, card_rect, border_width, border_radius=12)
 
         # 绘制发光效果
         if is_selected:
-            glow_rect = card_rect.inflate(10, 10)
+            glow_rect = card_rect.inflate(padding * 2, padding * 2)
             glow_color = tuple(int(c * 0.3) for c in colors['head_fill'])
-            pygame.draw.rect(surface, glow_color, glow_rect, 2, border_radius=16)
+            pygame.draw.rect(card, glow_color, glow_rect, 2, border_radius=16)
 
         # 卡片内容区域
         content_padding = 15
@@ -216,21 +263,22 @@ class SkinSelection:
         name_color = colors['head_fill'] if is_selected else (220, 220, 220)
         name_text = self.font_manager.render_text(skin['name'], 'large', name_color)
         name_rect = name_text.get_rect(centerx=content_rect.centerx, top=content_rect.top + 10)
-        surface.blit(name_text, name_rect)
+        card.blit(name_text, name_rect)
 
         # 绘制皮肤预览
         preview_y = name_rect.bottom + 15
-        self._draw_card_preview(surface, skin, content_rect.centerx, preview_y, is_selected)
+        self._draw_card_preview(card, skin, content_rect.centerx, preview_y, is_selected)
 
         # 绘制描述
         desc_y = preview_y + 50
         desc_text = self.font_manager.render_text(skin['description'], 'small', (180, 180, 180))
         desc_rect = desc_text.get_rect(centerx=content_rect.centerx, top=desc_y)
-        surface.blit(desc_text, desc_rect)
+        card.blit(desc_text, desc_rect)
 
         # 绘制状态指示器
         status_y = desc_rect.bottom + 8
-        self._draw_status_indicator(surface, skin, content_rect.centerx, status_y)
+        self._draw_status_indicator(card, skin, content_rect.centerx, status_y)
+        return card
 
     def _get_skin_id_from_key(self, key):
         """从key中提取皮肤ID"""
@@ -242,55 +290,10 @@ class SkinSelection:
         return 0
 
     def _draw_card_preview(self, surface, skin, center_x, center_y, is_selected):
-        """绘制卡片内的皮肤预览"""
-        key = skin['image_prefix']
-        skin_id = self._get_skin_id_from_key(key)
-
-        # 获取皮肤颜色配置
-        colors = get_snake_colors(skin_id, is_selected)  # is_selected作为加速状态
-
-        # 使用图片管理器获取蛇形象贴图（蛇头一定存在）
-        head_image = self.image_manager.get_snake_image(skin_id, "head")
-        body_image = self.image_manager.get_snake_image(skin_id, "body0")
-
-        # 缩放蛇头图片为合适大小并水平翻转（让蛇头朝向右边）
-        head_size = (GameBalance.SNAKE_HEAD_SIZE, GameBalance.SNAKE_HEAD_SIZE)
-        scaled_head = pygame.transform.scale(head_image, head_size)
-        # 水平翻转图片，让蛇头朝向右边
-        flipped_head = pygame.transform.flip(scaled_head, True, False)
-
-        # 绘制蛇头（蛇头一定存在）
-        head_rect = flipped_head.get_rect(center=(center_x, center_y))
-        surface.blit(flipped_head, head_rect)
-
-        # 如果有蛇身图片，则使用蛇身图片
-        if body_image:
-            # 缩放蛇身图片为合适大小
-            body_size = (GameBalance.SNAKE_BODY_SIZE, GameBalance.SNAKE_BODY_SIZE)
-            scaled_body = pygame.transform.scale(body_image, body_size)
-
-            # 绘制蛇身段（2个身体段）
-            for i in range(2):
-                body_x = center_x - (i + 1) * (GameBalance.SNAKE_BODY_SIZE + 5)
-                body_rect = scaled_body.get_rect(center=(body_x, center_y))
-                surface.blit(scaled_body, body_rect)
-        else:
-            # 没有蛇身图片时使用默认圆点绘制蛇身
-            body_radius = GameBalance.SNAKE_BODY_SIZE // 2 * (1.2 if is_selected else 1.0)
-            for i in range(3):
-                body_x = center_x - (i + 1) * (GameBalance.SNAKE_BODY_SIZE)
-                body_color = colors['highlight'] if is_selected else colors['body_fill']
-                pygame.draw.circle(surface, body_color, (body_x, center_y), body_radius)
-                pygame.draw.circle(surface, colors['body_border'], (body_x, center_y), body_radius, 1)
-
-        # 选中状态添加发光效果
-        if is_selected:
-            glow_radius = 35
-            glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, (*colors['highlight'], 80),
-                               (glow_radius, glow_radius), glow_radius)
-            glow_rect = glow_surface.get_rect(center=(center_x, center_y))
-            surface.blit(glow_surface, glow_rect)
+        """绘制卡片内的皮肤预览（缩略图由图片管理器生成并缓存）"""
+        skin_id = self._get_skin_id_from_key(skin['image_prefix'])
+        thumbnail = self.image_manager.get_skin_thumbnail(skin_id, GameBalance.SNAKE_HEAD_SIZE, is_selected)
+        surface.blit(thumbnail, thumbnail.get_rect(center=(center_x, center_y)))
 
     def _draw_status_indicator(self, surface, skin, center_x, center_y):
         """绘制状态指示器"""
@@ -364,11 +367,11 @@ class SkinSelection:
             if key.startswith('snake'):
                 try:
                     skin_id = int(key[5:])  # 提取snake后面的数字
-                    print(f"皮肤选择返回皮肤ID: {skin_id}")
+                    logger.info("皮肤选择返回皮肤ID: %s", skin_id)
                     return skin_id
                 except ValueError:
                     return 0
-        print("皮肤选择返回默认皮肤ID: 0")
+        logger.info("皮肤选择返回默认皮肤ID: 0")
         return 0  # 默认返回snake0
 
     def handle_mouse_event(self, event):
@@ -385,7 +388,7 @@ class SkinSelection:
                     # 立即保存皮肤ID到全局配置
                     skin_id = self._get_skin_id_from_key(self.selected_skin['image_prefix'])
                     self.config.set_skin_id(skin_id)
-                    print(f"选择了皮肤: {self.selected_skin['name']}, 皮肤ID: {skin_id}")
+                    logger.info("选择了皮肤: %s, 皮肤ID: %s", self.selected_skin['name'], skin_id)
                     return True
 
 
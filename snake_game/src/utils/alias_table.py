@@ -0,0 +1,64 @@
+"""
+别名表（Walker/Vose 别名方法）
+按权重随机选择时每次只需一次均匀随机数查表，不需要每次重建累积权重列表
+"""
+import random
+from typing import Sequence
+import numpy as np
+
+
+class AliasTable:
+    """别名表 - O(1) 的加权随机选择"""
+
+    def __init__(self, weights: Sequence[float]):
+        """
+        根据权重构建别名表
+        :param weights: 各项的权重（非负，至少一项大于0）
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 1:
+            raise ValueError("权重必须是一维序列")
+        count = len(weights)
+        if not np.isfinite(weights).all() or (weights < 0).any():
+            raise ValueError("权重必须是非负的有限数")
+        if count == 0 or weights.sum() <= 0:
+            raise ValueError("权重必须至少有一项大于0")
+
+        scaled = weights * count / weights.sum()
+        prob = np.ones(count, dtype=np.float64)
+        alias = np.arange(count, dtype=np.intp)
+        small = [i for i in range(count) if scaled[i] < 1.0]
+        large = [i for i in range(count) if scaled[i] >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+
+        self.size = count
+        self.prob = prob
+        self.alias = alias
+        # 单次抽样使用 Python 列表，避免 NumPy 标量开销
+        self._prob_list = prob.tolist()
+        self._alias_list = alias.tolist()
+
+    def sample(self) -> int:
+        """
+        抽取一个下标
+        :return: 下标
+        """
+        index = int(random.random() * self.size)
+        return index if random.random() < self._prob_list[index] else self._alias_list[index]
+
+    def sample_many(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        """
+        批量抽取下标
+        :param rng: NumPy 随机数生成器
+        :param count: 数量
+        :return: 下标数组
+        """
+        columns = rng.integers(0, self.size, size=count)
+        accept = rng.random(count) < self.prob[columns]
+        return np.where(accept, columns, self.alias[columns])
@@ -0,0 +1,106 @@
+"""
+后台加载器 - 在工作线程中准备资源，主线程只负责轮询进度和接管结果
+
+版权所有 © 2025 "果香蛇踪"游戏开发团队
+联系方式：3085678256@qq.com
+
+本程序受版权法保护，未经授权禁止复制、修改、分发或用于商业用途。
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+LOADER_WORKERS = 2  # 后台加载线程数量
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_loader_executor() -> ThreadPoolExecutor:
+    """获取全局共享的后台加载线程池"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=LOADER_WORKERS, thread_name_prefix="asset_loader")
+        return _executor
+
+
+class AsyncLoader:
+    """
+    后台加载任务
+
+    任务函数在工作线程中执行，第一个参数为进度回调 report(progress, message)，
+    主线程通过 progress / message 读取进度，通过 done() / result() 获取结果。
+    任务中只能创建和处理离屏 Surface，不能操作显示窗口或渲染字体。
+    """
+
+    def __init__(self, task: Callable[..., Any], *args: Any, name: str = "loader"):
+        """
+        提交后台加载任务
+        :param task: 任务函数 task(report, *args)
+        :param args: 传给任务函数的参数
+        :param name: 任务名称（用于日志）
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._progress = 0.0
+        self._message = ""
+        self._future: Future = get_loader_executor().submit(self._run, task, args)
+
+    def _run(self, task: Callable[..., Any], args: tuple) -> Any:
+        """在工作线程中执行任务"""
+        try:
+            result = task(self.report, *args)
+        except Exception:
+            logger.exception("后台加载任务 %s 失败", self.name)
+            raise
+        self.report(1.0)
+        return result
+
+    def report(self, progress: float, message: Optional[str] = None) -> None:
+        """
+        报告加载进度（由工作线程调用）
+        :param progress: 进度 0.0 ~ 1.0
+        :param message: 当前步骤说明
+        """
+        with self._lock:
+            self._progress = max(self._progress, min(1.0, float(progress)))
+            if message is not None:
+                self._message = message
+
+    @property
+    def progress(self) -> float:
+        """当前进度 0.0 ~ 1.0"""
+        with self._lock:
+            return self._progress
+
+    @property
+    def message(self) -> str:
+        """当前步骤说明"""
+        with self._lock:
+            return self._message
+
+    def done(self) -> bool:
+        """任务是否已结束（成功或失败）"""
+        return self._future.done()
+
+    def failed(self) -> bool:
+        """任务是否以异常结束"""
+        return self._future.done() and self._future.exception() is not None
+
+    def result(self) -> Any:
+        """
+        获取任务结果（任务未结束时会阻塞等待）
+        :return: 任务函数的返回值，任务失败时抛出原异常
+        """
+        return self._future.result()
+
+    def cancel(self) -> bool:
+        """
+        取消尚未开始的任务
+        :return: 是否取消成功
+        """
+        return self._future.cancel()
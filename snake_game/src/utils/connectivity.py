@@ -0,0 +1,177 @@
+"""
+空地连通性
+关卡加载时对墙体之外的空地做一次连通分量标记；运行时维护蛇头所在的连通区域，
+蛇身移动跨过格子边界时增量更新，只在可能把区域切断时才重新洪水填充。
+食物只生成在蛇头所在的区域内，避免出现吃不到的食物。
+"""
+from typing import List, Optional, Tuple
+import numpy as np
+from ..configs.game_balance import GameBalance
+from .pathfinding import OccupancyGrid
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class FreeSpaceComponents(OccupancyGrid):
+    """空地连通分量 - 静态分量标记 + 蛇头所在区域的增量维护"""
+
+    def __init__(self, wall_manager, world_size: Tuple[int, int], grid_size: int = GameBalance.GRID_SIZE):
+        """
+        根据墙体构建占用网格并标记静态连通分量
+        :param wall_manager: 墙管理器
+        :param world_size: 世界大小 (宽, 高)
+        :param grid_size: 网格大小（像素）
+        """
+        super().__init__(wall_manager, world_size, grid_size)
+
+        # 静态连通分量：0 为墙体，1..N 为分量编号
+        self.labels = self._label_static()
+        sizes = np.bincount(self.labels, minlength=2)
+        sizes[0] = 0
+        self.largest_label = int(np.argmax(sizes))
+        self.component_count = len(sizes) - 1
+
+        # 蛇头所在的动态区域（墙体 + 蛇身之外、与蛇头连通的格子）
+        self._region: Optional[np.ndarray] = None
+        self._region_list: List[bool] = []
+        self._head_cell: Optional[int] = None
+        self._dirty = True
+
+        # 统计
+        self.full_fills = 0
+        self.incremental_updates = 0
+        logger.debug("空地连通分量: %s 个，最大分量 %s 格", self.component_count, int(sizes[self.largest_label]))
+
+    def _flood(self, starts: List[int], blocked: List[bool], marks: list, value) -> List[int]:
+        """
+        从若干起点向四周洪水填充未标记的空地
+        :return: 起点和新填充的格子
+        """
+        offsets = self._offsets
+        queue = list(starts)
+        head = 0
+        while head < len(queue):
+            current = queue[head]
+            head += 1
+            for offset in offsets:
+                neighbor = current + offset
+                if not marks[neighbor] and not blocked[neighbor]:
+                    marks[neighbor] = value
+                    queue.append(neighbor)
+        return queue
+
+    def _label_static(self) -> np.ndarray:
+        """对墙体之外的空地做连通分量标记（每个关卡只做一次）"""
+        blocked = self._static_blocked.tolist()
+        labels = [0] * self.size
+        label = 0
+        for index in range(self.size):
+            if blocked[index] or labels[index]:
+                continue
+            label += 1
+            labels[index] = label
+            self._flood([index], blocked, labels, label)
+        return np.array(labels, dtype=np.int32)
+
+    def _refill(self) -> None:
+        """从蛇头重新洪水填充动态区域（蛇头所在格子即使靠墙也作为起点）"""
+        marks = [False] * self.size
+        marks[self._head_cell] = True
+        self._flood([self._head_cell], self._blocked_list, marks, True)
+        self._region_list = marks
+        self._region = np.array(marks, dtype=bool)
+        self._dirty = False
+        self.full_fills += 1
+
+    def _may_split(self, cell: int) -> bool:
+        """
+        格子被占用后区域是否可能被切断：检查它在区域内的上下左右邻居，
+        能通过对角格子绕过它互相连通时不会切断（局部判定，结果偏保守）
+        """
+        region = self._region_list
+        width = self.width
+        # 按顺时针排列：上、右、下、左，以及相邻两者之间的对角格子
+        sides = (cell - width, cell + 1, cell + width, cell - 1)
+        corners = (cell - width + 1, cell + width + 1, cell + width - 1, cell - width - 1)
+        free = [region[side] for side in sides]
+        if sum(free) <= 1:
+            return False
+
+        # 相邻的两个空邻居通过中间的对角格子连通，统计连通组数
+        groups = sum(free)
+        for i in range(4):
+            if free[i] and free[(i + 1) % 4] and region[corners[i]]:
+                groups -= 1
+        if all(free) and all(region[corner] for corner in corners):
+            groups += 1  # 四条边全部连通时多减了一次
+        return groups > 1
+
+    def update(self, body_positions: np.ndarray, head_position: Tuple[float, float]) -> None:
+        """
+        蛇移动后更新动态区域
+        新占用的格子从区域中移除（可能切断区域时标记为需要重新填充），
+        释放的格子与区域相邻时从该格子向外扩展区域
+        :param body_positions: (N, 2) 蛇身位置
+        :param head_position: 蛇头位置
+        """
+        self._head_cell = self.cell_index(head_position)
+        changes = self._update_body_cells(body_positions, head_position)
+        if self._dirty or self._region is None:
+            return
+        if changes is not None and not self._apply_changes(*changes):
+            self._dirty = True
+            return
+        if not self._region_list[self._head_cell]:
+            self._dirty = True  # 蛇头不在区域内（如重新开始后），重新填充
+
+    def _apply_changes(self, added: np.ndarray, removed: np.ndarray) -> bool:
+        """
+        把蛇身格子的变化增量应用到动态区域
+        :param added: 新占用的格子
+        :param removed: 释放的格子
+        :return: 是否成功（False 表示区域可能被切断，需要重新填充）
+        """
+        region_list = self._region_list
+        region = self._region
+        for cell in added.tolist():
+            if not region_list[cell]:
+                continue
+            region_list[cell] = False
+            region[cell] = False
+            if self._may_split(cell):
+                return False
+
+        grown = []
+        for cell in removed.tolist():
+            if region_list[cell] or self._blocked_list[cell]:
+                continue
+            if any(region_list[cell + offset] for offset in self._offsets):
+                region_list[cell] = True
+                grown.append(cell)
+        if grown:
+            region[self._flood(grown, self._blocked_list, region_list, True)] = True
+        self.incremental_updates += 1
+        return True
+
+    def reachable_mask(self, points: np.ndarray) -> np.ndarray:
+        """
+        批量判断位置是否在蛇头所在的区域内（区域需要重新填充时在这里完成）
+        还没有蛇头位置时使用最大的静态分量
+        :param points: (K, 2) 像素坐标
+        :return: (K,) bool 数组
+        """
+        cells = self._cell_indices(points)
+        if self._head_cell is None:
+            return self.labels[cells] == self.largest_label
+        if self._dirty or self._region is None:
+            self._refill()
+        return self._region[cells]
+
+    def reset(self) -> None:
+        """清除蛇身和蛇头状态（重新开始时调用），静态分量保留"""
+        self._update_body_cells(np.zeros((0, 2)), (0.0, 0.0))
+        self._head_cell = None
+        self._region = None
+        self._region_list = []
+        self._dirty = True
@@ -4,6 +4,9 @@
 import os
 import pygame
 from typing import Dict, Optional
+from .logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class FontManager:
@@ -30,7 +33,7 @@ class FontManager:
         """加载所有需要的字体尺寸"""
         # 检查字体文件是否存在
         if not os.path.exists(self.font_path):
-            print(f"警告: 字体文件 {self.font_path} 不存在，使用系统默认字体")
+            logger.warning("警告: 字体文件 %s 不存在，使用系统默认字体", self.font_path)
             self.font_path = None
         
         # 定义常用的字体尺寸
@@ -53,9 +56,9 @@ class FontManager:
                 else:
                     font = pygame.font.Font(None, size)
                 self._fonts[size_name] = font
-                print(f"字体加载成功: {size_name} ({size}px)")
+                logger.info("字体加载成功: %s (%spx)", size_name, size)
             except pygame.error as e:
-                print(f"字体加载失败 {size_name}: {e}")
+                logger.warning("字体加载失败 %s: %s", size_name, e)
                 # 使用系统默认字体作为备用
                 self._fonts[size_name] = pygame.font.Font(None, size)
     
@@ -72,7 +75,7 @@ class FontManager:
         if size_name in self._fonts:
             return self._fonts[size_name]
         else:
-            print(f"警告: 未找到字体尺寸 '{size_name}'，使用默认字体")
+            logger.warning("警告: 未找到字体尺寸 '%s'，使用默认字体", size_name)
             return self._fonts.get('medium', pygame.font.Font(None, 24))
     
     def get_custom_font(self, size: int) -> pygame.font.Font:
@@ -91,7 +94,7 @@ class FontManager:
             else:
                 return pygame.font.Font(None, size)
         except pygame.error as e:
-            print(f"自定义字体加载失败 ({size}px): {e}")
+            logger.warning("自定义字体加载失败 (%spx): %s", size, e)
             return pygame.font.Font(None, size)
     
     def render_text(self, text: str, size_name: str = 'medium', color: tuple = (255, 255, 255), antialias: bool = True) -> pygame.Surface:
@@ -7,20 +7,35 @@
 本程序受版权法保护，未经授权禁止复制、修改、分发或用于商业用途。
 """
 import os
+import threading
 import pygame
 from typing import Dict, Tuple, Optional, Any
 from .tools import process_game_image
 from ..configs.game_balance import GameBalance
+from ..configs.skin_config import get_snake_colors
+from .logger import get_logger
+
+logger = get_logger(__name__)
 
 
 
 class ImageManager:
-    """图片资源管理器类"""
+    """
+    图片资源管理器类
+    图片按需加载：第一次获取某个皮肤或食物图片时才处理对应的图片，
+    启动后由主菜单调用 warm_up_next 在空闲帧中逐个加载其余图片
+    皮肤预览缩略图按 (皮肤ID, 尺寸, 是否选中) 缓存，加载皮肤后在空闲帧中预先生成
+    """
+
+    THUMBNAIL_GLOW_RADIUS = 35  # 选中时缩略图光晕的半径（蛇头为 SNAKE_HEAD_SIZE 时）
+    THUMBNAIL_BODY_GAP = 5  # 缩略图中蛇身段之间的间距
 
     def __init__(self):
         self.snake_images: Dict[Tuple[int, str], pygame.Surface] = {}
         self.food_images: Dict[str, pygame.Surface] = {}
         self.ui_images: Dict[str, pygame.Surface] = {}
+        self.skin_thumbnails: Dict[Tuple[int, int, bool], pygame.Surface] = {}  # (皮肤ID, 尺寸, 是否选中) -> 缩略图
+        self._skin_previews: Dict[Tuple[int, Tuple[int, int]], pygame.Surface] = {}
         
         # 图片目录
         self.assets_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "assets")
@@ -33,20 +48,91 @@ class ImageManager:
         os.makedirs(self.food_dir, exist_ok=True)
         os.makedirs(self.ui_dir, exist_ok=True)
         
-        # 预加载所有图片（使用延迟加载，避免视频模式问题）
-        self._preload_images()
-        
-        print("图片管理器初始化完成")
+        # 按需加载的状态：只扫描目录，不处理图片
+        # 关卡加载和预取的后台线程也会获取图片，加载过程加锁，加载完成后才标记为已加载
+        self._load_lock = threading.Lock()
+        self._skin_paths = self._scan_snake_skins()
+        self._loaded_skins = set()
+        self._food_loaded = False
+        self._ui_loaded = False
+        self._warm_up_queue = [(kind, skin_id) for skin_id in sorted(self._skin_paths) for kind in ('skin', 'thumbnail')]
+        self._warm_up_queue += [('food', None), ('ui', None)]
+
+        logger.info("图片管理器初始化完成（按需加载）")
 
     def _preload_images(self) -> None:
         """预加载所有图片资源"""
-        self._load_snake_images()
-        self._load_food_images()
-        self._load_ui_images()
+        with self._load_lock:
+            self._load_snake_images()
+            self._load_food_images()
+            self._load_ui_images()
+            self._loaded_skins.update(self._skin_paths)
+            self._food_loaded = True
+            self._ui_loaded = True
+        self._warm_up_queue.clear()
+
+    def _scan_snake_skins(self) -> Dict[int, str]:
+        """扫描蛇皮肤目录 {skin_id: 目录路径}"""
+        skin_paths = {}
+        if os.path.exists(self.snake_dir):
+            for item in os.listdir(self.snake_dir):
+                snake_path = os.path.join(self.snake_dir, item)
+                if os.path.isdir(snake_path):
+                    try:
+                        skin_paths[int(item.replace("snake", ""))] = snake_path
+                    except ValueError:
+                        logger.info("跳过无效的蛇皮肤目录: %s", item)
+        return skin_paths
+
+    def _ensure_snake_skin(self, skin_id: int) -> None:
+        """第一次使用某个皮肤时加载它的图片（其他线程正在加载时等待加载完成）"""
+        if skin_id in self._loaded_skins:
+            return
+        with self._load_lock:
+            if skin_id not in self._loaded_skins:
+                if skin_id in self._skin_paths:
+                    self._load_snake_skin(skin_id, self._skin_paths[skin_id])
+                self._loaded_skins.add(skin_id)
+
+    def _ensure_food_images(self) -> None:
+        """第一次使用食物图片时加载所有食物图片"""
+        if self._food_loaded:
+            return
+        with self._load_lock:
+            if not self._food_loaded:
+                self._load_food_images()
+                self._food_loaded = True
+
+    def _ensure_ui_images(self) -> None:
+        """第一次使用UI图片时加载所有UI图片"""
+        if self._ui_loaded:
+            return
+        with self._load_lock:
+            if not self._ui_loaded:
+                self._load_ui_images()
+                self._ui_loaded = True
+
+    def warm_up_next(self) -> bool:
+        """
+        加载下一组还没有用到的图片（在空闲帧中调用，避免第一次进入游戏时集中处理图片）
+        :return: 是否还有没加载的图片
+        """
+        if self._warm_up_queue:
+            kind, skin_id = self._warm_up_queue.pop(0)
+            if kind == 'skin':
+                self._ensure_snake_skin(skin_id)
+            elif kind == 'thumbnail':
+                for selected in (False, True):
+                    self.get_skin_thumbnail(skin_id, GameBalance.SNAKE_HEAD_SIZE, selected)
+            elif kind == 'food':
+                self._ensure_food_images()
+            else:
+                self._ensure_ui_images()
+        return bool(self._warm_up_queue)
 
     def _load_snake_images(self) -> None:
         """加载蛇的图片资源"""
-        print("加载蛇的图片资源...")
+        logger.info("加载蛇的图片资源...")
         
         # 检查snake目录下的所有子目录
         if os.path.exists(self.snake_dir):
@@ -58,11 +144,11 @@ class ImageManager:
                         skin_id = int(item.replace("snake", ""))
                         self._load_snake_skin(skin_id, snake_path)
                     except ValueError:
-                        print(f"跳过无效的蛇皮肤目录: {item}")
+                        logger.info("跳过无效的蛇皮肤目录: %s", item)
 
     def _load_snake_skin(self, skin_id: int, skin_path: str) -> None:
         """加载特定蛇皮肤的图片"""
-        print(f"加载蛇皮肤 {skin_id} 的图片...")
+        logger.info("加载蛇皮肤 %s 的图片...", skin_id)
         
         # 加载头部图片
         head_path = os.path.join(skin_path, f"snake{skin_id}_head.png")
@@ -71,9 +157,9 @@ class ImageManager:
                 # 处理图片： 抠图 + 标准化
                 head_image = process_game_image(image_path=head_path, target_size=GameBalance.SNAKE_HEAD_SIZE)
                 self.snake_images[(skin_id, "head")] = head_image
-                print(f"✓ 加载蛇头图片: snake{skin_id}_head.png")
+                logger.info("✓ 加载蛇头图片: snake%s_head.png", skin_id)
             except Exception as e:
-                print(f"✗ 加载蛇头图片失败: {head_path}, 错误: {e}")
+                logger.error("✗ 加载蛇头图片失败: %s, 错误: %s", head_path, e)
         
         # 加载身体图片
         for i in range(10):  # 最多加载10个身体图片
@@ -83,15 +169,15 @@ class ImageManager:
                     # 处理图片： 抠图 + 标准化
                     body_image = process_game_image(image_path=body_path, target_size=GameBalance.SNAKE_BODY_SIZE)
                     self.snake_images[(skin_id, f"body{i}")] = body_image
-                    print(f"✓ 加载蛇身图片: snake{skin_id}_body{i}.png")
+                    logger.info("✓ 加载蛇身图片: snake%s_body%s.png", skin_id, i)
                 except Exception as e:
-                    print(f"✗ 加载蛇身图片失败: {body_path}, 错误: {e}")
+                    logger.error("✗ 加载蛇身图片失败: %s, 错误: %s", body_path, e)
             else:
                 break  # 没有更多身体图片
 
     def _load_food_images(self) -> None:
         """加载食物图片资源"""
-        print("加载食物图片资源...")
+        logger.info("加载食物图片资源...")
         
         if os.path.exists(self.food_dir):
             for filename in os.listdir(self.food_dir):
@@ -102,13 +188,13 @@ class ImageManager:
                         # 处理图片： 抠图 + 标准化
                         food_image = process_game_image(image_path=food_path, target_size=GameBalance.FOOD_SIZE)
                         self.food_images[food_name] = food_image
-                        print(f"✓ 加载食物图片: {filename}")
+                        logger.info("✓ 加载食物图片: %s", filename)
                     except Exception as e:
-                        print(f"✗ 加载食物图片失败: {food_path}, 错误: {e}")
+                        logger.error("✗ 加载食物图片失败: %s, 错误: %s", food_path, e)
 
     def _load_ui_images(self) -> None:
         """加载UI图片资源"""
-        print("加载UI图片资源...")
+        logger.info("加载UI图片资源...")
         
         if os.path.exists(self.ui_dir):
             for filename in os.listdir(self.ui_dir):
@@ -118,9 +204,9 @@ class ImageManager:
                     try:
                         ui_image = pygame.image.load(ui_path).convert_alpha()
                         self.ui_images[ui_name] = ui_image
-                        print(f"✓ 加载UI图片: {filename}")
+                        logger.info("✓ 加载UI图片: %s", filename)
                     except Exception as e:
-                        print(f"✗ 加载UI图片失败: {ui_path}, 错误: {e}")
+                        logger.error("✗ 加载UI图片失败: %s, 错误: %s", ui_path, e)
 
     def get_snake_image(self, skin_id: int, image_type: str) -> Optional[pygame.Surface]:
         """
@@ -133,22 +219,28 @@ class ImageManager:
         Returns:
             图片Surface，如果不存在返回None
         """
+        self._ensure_snake_skin(skin_id)
         return self.snake_images.get((skin_id, image_type))
 
     def has_snake_images(self, skin_id: int) -> bool:
         """检查指定皮肤是否有图片资源"""
+        self._ensure_snake_skin(skin_id)
         return any(key[0] == skin_id for key in self.snake_images.keys())
 
     def get_food_image(self, food_name: str, size: int = None) -> Optional[pygame.Surface]:
         """获取食物图片"""
+        self._ensure_food_images()
         return self.food_images.get(food_name)
 
     def get_ui_image(self, ui_name: str) -> Optional[pygame.Surface]:
         """获取UI图片"""
+        self._ensure_ui_images()
         return self.ui_images.get(ui_name)
 
     def get_available_snake_skins(self) -> list:
         """获取可用的蛇皮肤ID列表"""
+        for skin_id in self._skin_paths:
+            self._ensure_snake_skin(skin_id)
         skin_ids = set()
         for key in self.snake_images.keys():
             skin_ids.add(key[0])
@@ -156,18 +248,85 @@ class ImageManager:
 
     def get_snake_skin_preview(self, skin_id: int, size: Tuple[int, int] = (100, 100)) -> Optional[pygame.Surface]:
         """获取蛇皮肤的预览图"""
+        key = (skin_id, tuple(size))
+        preview = self._skin_previews.get(key)
+        if preview is None:
+            head_image = self.get_snake_image(skin_id, "head")
+            if head_image is None:
+                return None
+            preview = pygame.transform.scale(head_image, size)
+            self._skin_previews[key] = preview
+        return preview
+
+    def get_skin_thumbnail(self, skin_id: int, size: int = GameBalance.SNAKE_HEAD_SIZE,
+                           selected: bool = False) -> pygame.Surface:
+        """
+        获取皮肤预览缩略图：朝右的蛇头和后面的蛇身段（没有蛇身图片时画圆点），选中时带光晕
+        第一次获取时生成并缓存，之后直接返回缓存
+        :param skin_id: 皮肤ID
+        :param size: 蛇头大小（像素），蛇身和光晕按比例缩放
+        :param selected: 是否选中（使用加速配色并添加光晕）
+        :return: 缩略图，蛇头位于图片中心
+        """
+        key = (skin_id, size, selected)
+        thumbnail = self.skin_thumbnails.get(key)
+        if thumbnail is None:
+            thumbnail = self._create_skin_thumbnail(skin_id, size, selected)
+            self.skin_thumbnails[key] = thumbnail
+        return thumbnail
+
+    def _create_skin_thumbnail(self, skin_id: int, size: int, selected: bool) -> pygame.Surface:
+        """生成皮肤预览缩略图（布局与皮肤选择卡片中的预览一致）"""
+        scale = size / GameBalance.SNAKE_HEAD_SIZE
+        body_size = max(1, int(GameBalance.SNAKE_BODY_SIZE * scale))
+        glow_radius = int(self.THUMBNAIL_GLOW_RADIUS * scale)
+        colors = get_snake_colors(skin_id, selected)  # 选中时使用加速配色
+
         head_image = self.get_snake_image(skin_id, "head")
+        body_image = self.get_snake_image(skin_id, "body0")
+
+        # 蛇头在中心，蛇身向左排列：图片宽度取两侧的最大范围
+        body_step = body_size + int(self.THUMBNAIL_BODY_GAP * scale) if body_image else body_size
+        body_count = 2 if body_image else 3
+        half_width = max(size // 2, glow_radius, body_count * body_step + body_size)
+        half_height = max(size // 2, glow_radius, body_size)
+        thumbnail = pygame.Surface((half_width * 2, half_height * 2), pygame.SRCALPHA)
+        center = (half_width, half_height)
+
+        # 蛇头水平翻转，让蛇头朝向右边
         if head_image:
-            return pygame.transform.scale(head_image, size)
-        return None
+            head = pygame.transform.flip(pygame.transform.scale(head_image, (size, size)), True, False)
+            thumbnail.blit(head, head.get_rect(center=center))
+
+        if body_image:
+            body = pygame.transform.scale(body_image, (body_size, body_size))
+            for i in range(body_count):
+                thumbnail.blit(body, body.get_rect(center=(center[0] - (i + 1) * body_step, center[1])))
+        else:
+            # 没有蛇身图片时使用默认圆点绘制蛇身
+            body_radius = body_size // 2 * (1.2 if selected else 1.0)
+            body_color = colors['highlight'] if selected else colors['body_fill']
+            for i in range(body_count):
+                body_center = (center[0] - (i + 1) * body_step, center[1])
+                pygame.draw.circle(thumbnail, body_color, body_center, body_radius)
+                pygame.draw.circle(thumbnail, colors['body_border'], body_center, body_radius, 1)
+
+        # 选中状态添加发光效果
+        if selected:
+            glow = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(glow, (*colors['highlight'], 80), (glow_radius, glow_radius), glow_radius)
+            thumbnail.blit(glow, glow.get_rect(center=center))
+        return thumbnail
 
     def reload_images(self) -> None:
         """重新加载所有图片"""
         self.snake_images.clear()
         self.food_images.clear()
         self.ui_images.clear()
+        self.skin_thumbnails.clear()
+        self._skin_previews.clear()
         self._preload_images()
-        print("图片资源已重新加载")
+        logger.info("图片资源已重新加载")
 
 
 # 全局图片管理器实例
@@ -0,0 +1,240 @@
+"""
+日志系统 - 分级、缓冲、限流的日志输出
+
+所有模块通过 get_logger(__name__) 获取日志器，日志记录先放入内存队列，
+由后台线程统一写出到标准输出，主线程（游戏循环）不会被慢速的输出管道阻塞。
+
+版权所有 © 2025 "果香蛇踪"游戏开发团队
+联系方式：3085678256@qq.com
+
+本程序受版权法保护，未经授权禁止复制、修改、分发或用于商业用途。
+"""
+import os
+import sys
+import copy
+import time
+import queue
+import atexit
+import threading
+import logging
+import logging.handlers
+from typing import Dict, List, Optional, Tuple
+
+# 所有游戏日志器的根名称
+ROOT_LOGGER_NAME = "snake_game"
+
+# 默认日志级别
+DEFAULT_LEVEL = logging.INFO
+
+# 各模块的日志级别（键为 src 下的模块路径，未列出的模块使用默认级别）
+# 可通过环境变量 SNAKE_LOG_LEVEL 覆盖，例如：
+#   SNAKE_LOG_LEVEL=DEBUG
+#   SNAKE_LOG_LEVEL=WARNING,components.food=DEBUG,utils.sound_manager=INFO
+MODULE_LEVELS: Dict[str, int] = {
+    'components.food': logging.INFO,
+    'utils.sound_manager': logging.INFO,
+}
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+LOG_QUEUE_SIZE = 10000  # 日志队列容量，队列满时直接丢弃，绝不阻塞游戏循环
+RATE_LIMIT_INTERVAL = 1.0  # 同一条日志（格式化后的消息相同）的最小输出间隔（秒）
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional['NonBlockingQueueHandler'] = None
+_exc_formatter = logging.Formatter()  # 在调用线程中把异常堆栈转为文本
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    重复日志限流 - 同一日志器、同一级别、同一条消息（格式化后）在间隔内只输出一次
+    被抑制的次数附加在下一条相同消息之后；间隔内没有再出现时，由 expire 生成一条汇总日志
+    """
+
+    def __init__(self, interval: float = RATE_LIMIT_INTERVAL):
+        super().__init__()
+        self.interval = interval
+        self._lock = threading.Lock()  # 多个线程都会写日志
+        self._last_emit: Dict[Tuple[str, int, str], float] = {}  # 上次输出时间
+        self._suppressed: Dict[Tuple[str, int, str], Tuple[int, logging.LogRecord]] = {}  # 抑制次数和最后一条记录
+        self._next_expire = 0.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        key = (record.name, record.levelno, message)
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_emit.get(key)
+            if last is not None and now - last < self.interval:
+                count = self._suppressed.get(key, (0, None))[0]
+                self._suppressed[key] = (count + 1, record)
+                return False
+
+            self._last_emit[key] = now
+            suppressed = self._suppressed.pop(key, (0, None))[0]
+
+        # 消息已经格式化，记录中直接保存结果，之后不再重复格式化
+        record.msg = f"{message} (已抑制 {suppressed} 条重复日志)" if suppressed else message
+        record.args = None
+        return True
+
+    def expire(self, force: bool = False) -> List[logging.LogRecord]:
+        """
+        清理超过间隔的消息（每个间隔最多执行一次），避免限流表随不同的消息无限增长
+        :param force: 是否立即清理全部消息（退出时使用）
+        :return: 仍有抑制次数未输出的汇总日志
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not force and now < self._next_expire:
+                return []
+            self._next_expire = now + self.interval
+            expired = [key for key, last in self._last_emit.items() if force or now - last >= self.interval]
+            summaries = []
+            for key in expired:
+                del self._last_emit[key]
+                count, record = self._suppressed.pop(key, (0, None))
+                if count:
+                    record.msg = f"{key[2]} (已抑制 {count} 条重复日志)"
+                    record.args = None
+                    summaries.append(record)
+        return summaries
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """非阻塞队列处理器 - 队列满时丢弃日志并计数，消息在调用线程中格式化，输出交给后台线程完成"""
+
+    def __init__(self, log_queue: queue.Queue, rate_limit: Optional[RateLimitFilter] = None):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.rate_limit = rate_limit
+        if rate_limit is not None:
+            self.addFilter(rate_limit)
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        result = super().handle(record)
+        self.flush_suppressed()
+        return result
+
+    def flush_suppressed(self, force: bool = False) -> None:
+        """
+        输出限流期间被抑制、之后没有再出现的日志的汇总
+        :param force: 是否输出全部汇总（退出时使用）
+        """
+        if self.rate_limit is None:
+            return
+        for record in self.rate_limit.expire(force):
+            self.emit(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 在调用线程中完成消息格式化（只对通过级别检查的日志执行）：参数可能是之后会被修改的对象
+        # （如 NumPy 位置视图、列表），留到写出线程再格式化会得到错误的值；异常堆栈同样先转为文本
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _module_key(name: str) -> str:
+    """将模块名 (src.components.food) 转换为日志配置使用的键 (components.food)"""
+    if name.startswith("src."):
+        return name[4:]
+    if name == "__main__":
+        return "main"
+    return name
+
+
+def _parse_level(value: str) -> Optional[int]:
+    """解析日志级别名称"""
+    level = logging.getLevelName(value.strip().upper())
+    return level if isinstance(level, int) else None
+
+
+def _load_level_overrides() -> Tuple[int, Dict[str, int]]:
+    """读取环境变量中的日志级别覆盖配置"""
+    default_level = DEFAULT_LEVEL
+    module_levels = dict(MODULE_LEVELS)
+
+    spec = os.environ.get("SNAKE_LOG_LEVEL", "")
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        if "=" in item:
+            module, value = item.split("=", 1)
+            level = _parse_level(value)
+            if level is not None:
+                module_levels[module.strip()] = level
+        else:
+            level = _parse_level(item)
+            if level is not None:
+                default_level = level
+
+    return default_level, module_levels
+
+
+def setup_logging() -> None:
+    """初始化日志系统（只执行一次）：队列处理器 + 后台写出线程 + 各模块级别"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    default_level, module_levels = _load_level_overrides()
+
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    root.setLevel(default_level)
+    root.propagate = False
+    for module, level in module_levels.items():
+        logging.getLogger(f"{ROOT_LOGGER_NAME}.{module}").setLevel(level)
+
+    # 后台线程负责按 LOG_FORMAT 组装输出行并写出
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt="%H:%M:%S"))
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _queue_handler = NonBlockingQueueHandler(log_queue, RateLimitFilter())
+    root.addHandler(_queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """停止后台写出线程，并输出队列中剩余的日志"""
+    global _listener
+    if _listener is None:
+        return
+    if _queue_handler is not None:
+        _queue_handler.flush_suppressed(force=True)
+    _listener.stop()
+    _listener = None
+    if _queue_handler is not None and _queue_handler.dropped:
+        sys.stdout.write(f"日志队列已满，丢弃了 {_queue_handler.dropped} 条日志\n")
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    获取模块日志器
+    :param name: 模块名，通常传入 __name__
+    :return: 日志器实例
+    """
+    setup_logging()
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{_module_key(name)}")
+
+
+def set_module_level(module: str, level: int) -> None:
+    """
+    运行时调整某个模块的日志级别
+    :param module: 模块路径（如 components.food）
+    :param level: 日志级别
+    """
+    logging.getLogger(f"{ROOT_LOGGER_NAME}.{module}").setLevel(level)
@@ -0,0 +1,94 @@
+"""
+菜单合成器 - 暂停、游戏结束等覆盖在游戏画面上的菜单
+进入菜单时冻结一次当前游戏画面，之后把"冻结画面 + 半透明覆盖层 + 各个面板"合成为一张整屏图片缓存起来，
+只有键（淡入透明度、界面状态、选中项、统计数值）变化时才重新合成，其余帧只需要一次整屏 blit
+"""
+from typing import Callable, Hashable, Optional, Tuple
+import pygame
+
+
+class MenuCompositor:
+    """菜单合成器"""
+
+    def __init__(self, size: Tuple[int, int], overlay_color: Tuple[int, int, int] = (0, 0, 0)):
+        """
+        :param size: 屏幕尺寸 (宽, 高)
+        :param overlay_color: 覆盖层颜色
+        """
+        self.size = size
+        self.overlay_color = overlay_color
+        self.background: Optional[pygame.Surface] = None  # 冻结的游戏画面
+        self._frame: Optional[pygame.Surface] = None  # 合成好的整屏画面
+        self._frame_key: Hashable = None
+        self._overlay: Optional[pygame.Surface] = None
+
+        # 统计
+        self.composites = 0
+        self.hits = 0
+
+    def is_frozen(self) -> bool:
+        """是否已经冻结了游戏画面"""
+        return self.background is not None
+
+    def freeze(self, surface: pygame.Surface) -> None:
+        """
+        冻结当前游戏画面（进入菜单后只调用一次）
+        :param surface: 当前画面（尚未绘制菜单）
+        """
+        if self.background is None or self.background.get_size() != surface.get_size():
+            self.background = surface.copy()
+        else:
+            self.background.blit(surface, (0, 0))
+        self._frame_key = None
+
+    def release(self) -> None:
+        """离开菜单时释放冻结画面（合成画面的内存保留，下次进入时复用）"""
+        self.background = None
+        self._frame_key = None
+
+    def set_overlay_color(self, color: Tuple[int, int, int]) -> None:
+        """
+        设置覆盖层颜色（如关卡完成时为绿色）
+        :param color: 覆盖层颜色
+        """
+        if color != self.overlay_color:
+            self.overlay_color = color
+            self._frame_key = None
+            if self._overlay is not None:
+                self._overlay.fill(color)
+
+    def _get_overlay(self, alpha: int) -> pygame.Surface:
+        """获取整屏覆盖层（只创建一次，透明度每次设置）"""
+        if self._overlay is None:
+            self._overlay = pygame.Surface(self.size)
+            self._overlay.fill(self.overlay_color)
+        self._overlay.set_alpha(alpha)
+        return self._overlay
+
+    def draw(self, surface: pygame.Surface, fade_alpha: int, key: Hashable,
+             draw_panels: Callable[[pygame.Surface], None]) -> None:
+        """
+        绘制菜单画面
+        :param surface: 绘制表面
+        :param fade_alpha: 覆盖层透明度
+        :param key: 面板内容的键（界面状态、选中项、统计数值等），与透明度一起决定是否需要重新合成
+        :param draw_panels: 在给定表面上绘制所有面板的函数
+        """
+        if self.background is None:
+            # 没有冻结画面时直接画在当前画面上
+            surface.blit(self._get_overlay(fade_alpha), (0, 0))
+            draw_panels(surface)
+            return
+
+        frame_key = (fade_alpha, key)
+        if frame_key != self._frame_key:
+            if self._frame is None or self._frame.get_size() != self.background.get_size():
+                self._frame = pygame.Surface(self.background.get_size())
+            self._frame.blit(self.background, (0, 0))
+            self._frame.blit(self._get_overlay(fade_alpha), (0, 0))
+            draw_panels(self._frame)
+            self._frame_key = frame_key
+            self.composites += 1
+        else:
+            self.hits += 1
+        surface.blit(self._frame, (0, 0))
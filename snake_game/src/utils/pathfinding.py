@@ -0,0 +1,363 @@
+"""
+网格寻路
+在墙体 + 蛇身占用网格上提供 A* 寻路（二叉堆）和到目标（食物）的 BFS 距离场。
+距离场按目标格子缓存，蛇身移动时只让受影响的距离场失效，并在每帧的时间预算内重新计算，
+供自动驾驶、提示箭头和食物可达性检查使用。
+"""
+import heapq
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from ..configs.game_balance import GameBalance
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class OccupancyGrid:
+    """占用网格 - 墙体（静态）+ 蛇身（动态）占用的格子，四周加一圈阻挡格"""
+
+    def __init__(self, wall_manager, world_size: Tuple[int, int], grid_size: int = GameBalance.GRID_SIZE,
+                 clearance: float = 0.0):
+        """
+        根据墙体构建占用网格
+        :param wall_manager: 墙管理器（地图墙体和手动添加的墙体都会计入）
+        :param world_size: 世界大小 (宽, 高)
+        :param grid_size: 网格大小（像素）
+        :param clearance: 与墙体保持的额外距离（像素），靠墙太近的格子也视为被占用
+        """
+        self.grid_size = grid_size
+        self.cols = max(int(world_size[0]) // grid_size, 1)
+        self.rows = max(int(world_size[1]) // grid_size, 1)
+
+        # 网格四周加一圈阻挡格，邻居下标为 index±1 / index±width，无需边界检查
+        self.width = self.cols + 2
+        self.size = self.width * (self.rows + 2)
+        self._offsets = (-self.width, self.width, -1, 1)
+
+        # 格子中心与墙块中心的距离小于一个格子（加上额外间隙）时视为被墙占用
+        cols, rows = np.meshgrid(np.arange(self.cols), np.arange(self.rows))
+        centers = np.column_stack((cols.ravel(), rows.ravel())) * float(grid_size) + grid_size / 2
+        static = np.ones((self.rows + 2, self.cols + 2), dtype=bool)
+        static[1:-1, 1:-1] = wall_manager.near_wall_mask(centers, grid_size + clearance).reshape(self.rows, self.cols)
+        self._static_blocked = static.ravel()
+        self._static_blocked.flags.writeable = False
+
+        # 当前阻挡状态（墙体 + 蛇身），列表版本供逐格搜索使用
+        self._blocked = self._static_blocked.copy()
+        self._blocked_list = self._blocked.tolist()
+        self._body_cells = np.zeros(0, dtype=np.intp)
+        logger.debug("%s: %sx%s, 墙体占用 %s 格", type(self).__name__, self.cols, self.rows,
+                     int(static[1:-1, 1:-1].sum()))
+
+    def cell_index(self, position: Tuple[float, float]) -> int:
+        """
+        像素坐标所在格子的平铺下标（超出世界的坐标收缩到边缘格子）
+        :param position: 像素坐标
+        :return: 平铺下标
+        """
+        col = min(max(int(position[0] // self.grid_size), 0), self.cols - 1)
+        row = min(max(int(position[1] // self.grid_size), 0), self.rows - 1)
+        return (row + 1) * self.width + col + 1
+
+    def _cell_indices(self, positions: np.ndarray) -> np.ndarray:
+        """批量计算像素坐标所在格子的平铺下标"""
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        cols = np.clip((positions[:, 0] // self.grid_size).astype(np.intp), 0, self.cols - 1)
+        rows = np.clip((positions[:, 1] // self.grid_size).astype(np.intp), 0, self.rows - 1)
+        return (rows + 1) * self.width + cols + 1
+
+    def cell_center(self, index: int) -> Tuple[float, float]:
+        """
+        格子中心的像素坐标
+        :param index: 平铺下标
+        :return: (x, y)
+        """
+        row, col = divmod(index, self.width)
+        return ((col - 1) * self.grid_size + self.grid_size / 2, (row - 1) * self.grid_size + self.grid_size / 2)
+
+    def is_blocked(self, position: Tuple[float, float]) -> bool:
+        """像素坐标所在格子当前是否被墙体或蛇身占用"""
+        return self._blocked_list[self.cell_index(position)]
+
+    def _update_body_cells(self, body_positions: np.ndarray,
+                           head_position: Tuple[float, float]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        更新蛇身占用的格子
+        :param body_positions: (N, 2) 蛇身位置
+        :param head_position: 蛇头位置（蛇头所在格子不视为障碍）
+        :return: (新占用的格子, 释放的格子)；蛇身没有跨过格子边界时返回None
+        """
+        cells = np.unique(self._cell_indices(body_positions)) if len(body_positions) else self._body_cells[:0]
+        cells = cells[cells != self.cell_index(head_position)]
+        if np.array_equal(cells, self._body_cells):
+            return None
+
+        added = np.setdiff1d(cells, self._body_cells, assume_unique=True)
+        removed = np.setdiff1d(self._body_cells, cells, assume_unique=True)
+        self._body_cells = cells
+
+        blocked_list = self._blocked_list
+        for index in removed.tolist():
+            blocked_list[index] = bool(self._static_blocked[index])
+        for index in added.tolist():
+            blocked_list[index] = True
+        self._blocked[removed] = self._static_blocked[removed]
+        self._blocked[added] = True
+        return added, removed
+
+    def _neighbors(self, cells: np.ndarray) -> np.ndarray:
+        """一组格子的上下左右邻居（平铺下标）"""
+        return (cells[:, None] + np.array(self._offsets)).ravel()
+
+
+class GridPathfinder(OccupancyGrid):
+    """网格寻路 - 墙体 + 蛇身占用网格上的 A* 与缓存的距离场"""
+
+    def __init__(self, wall_manager, world_size: Tuple[int, int], grid_size: int = GameBalance.GRID_SIZE,
+                 frame_budget_ms: float = GameBalance.PATHFINDING_FRAME_BUDGET_MS,
+                 max_fields: int = GameBalance.PATHFINDING_MAX_FIELDS,
+                 clearance: float = GameBalance.PATHFINDING_WALL_CLEARANCE):
+        """
+        根据墙体构建占用网格
+        :param wall_manager: 墙管理器（地图墙体和手动添加的墙体都会计入）
+        :param world_size: 世界大小 (宽, 高)
+        :param grid_size: 寻路网格大小（像素）
+        :param frame_budget_ms: 每帧重新计算距离场的时间预算（毫秒）
+        :param max_fields: 最多缓存的距离场数量
+        :param clearance: 路径与墙体保持的额外距离（像素）
+        """
+        super().__init__(wall_manager, world_size, grid_size, clearance)
+        self.frame_budget = frame_budget_ms / 1000.0
+        self.max_fields = max_fields
+
+        # 目标格子 -> 距离场（平铺数组，-1 表示不可达），过期的距离场仍可作为近似使用
+        self._fields: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._stale: Set[int] = set()
+        self._targets: List[int] = []
+        self._deadline = float('inf')
+
+        # 统计
+        self.fields_computed = 0
+        self.fields_invalidated = 0
+
+    # ------------------------------------------------------------------
+    # 动态障碍（蛇身）
+    # ------------------------------------------------------------------
+    def set_obstacles(self, body_positions: np.ndarray, head_position: Tuple[float, float]) -> None:
+        """
+        更新蛇身占用的格子，只让受影响的距离场失效
+        蛇身没有跨过格子边界时（大多数帧）直接返回
+        :param body_positions: (N, 2) 蛇身位置
+        :param head_position: 蛇头位置（蛇头所在格子不视为障碍）
+        """
+        changes = self._update_body_cells(body_positions, head_position)
+        if changes is None:
+            return
+        added, removed = changes
+
+        # 新占用的格子原本可达，或释放的格子旁边可达时，距离场才可能变化
+        neighbors = self._neighbors(removed)
+        for target, field in self._fields.items():
+            if target in self._stale:
+                continue
+            if (len(added) and (field[added] >= 0).any()) or (len(neighbors) and (field[neighbors] >= 0).any()):
+                self._stale.add(target)
+                self.fields_invalidated += 1
+
+    # ------------------------------------------------------------------
+    # 距离场
+    # ------------------------------------------------------------------
+    def _compute_field(self, target: int) -> np.ndarray:
+        """从目标格子出发做 BFS，得到每个格子到目标的步数（-1 表示不可达）"""
+        blocked = self._blocked_list
+        offsets = self._offsets
+        distances = [-1] * self.size
+        distances[target] = 0
+        queue = [target]
+        head = 0
+        while head < len(queue):
+            current = queue[head]
+            head += 1
+            step = distances[current] + 1
+            for offset in offsets:
+                neighbor = current + offset
+                if distances[neighbor] < 0 and not blocked[neighbor]:
+                    distances[neighbor] = step
+                    queue.append(neighbor)
+        self.fields_computed += 1
+        return np.array(distances, dtype=np.int32)
+
+    def _store_field(self, target: int, field: np.ndarray) -> None:
+        """缓存距离场，超出数量上限时淘汰最久未使用的"""
+        self._fields[target] = field
+        self._fields.move_to_end(target)
+        self._stale.discard(target)
+        while len(self._fields) > self.max_fields:
+            evicted, _ = self._fields.popitem(last=False)
+            self._stale.discard(evicted)
+
+    def _within_budget(self) -> bool:
+        """本帧的寻路时间预算是否还有剩余"""
+        return time.perf_counter() < self._deadline
+
+    def distance_field(self, target_position: Tuple[float, float],
+                       allow_stale: bool = True) -> Optional[np.ndarray]:
+        """
+        获取到目标位置的距离场
+        没有缓存且本帧预算已用完时返回None；过期的距离场在 allow_stale 为True时直接返回
+        :param target_position: 目标像素坐标
+        :param allow_stale: 是否接受过期的距离场
+        :return: 平铺的 int32 距离数组（-1 表示不可达），或None
+        """
+        target = self.cell_index(target_position)
+        field = self._fields.get(target)
+        if field is not None and (allow_stale or target not in self._stale):
+            self._fields.move_to_end(target)
+            return field
+        if not self._within_budget():
+            return field if allow_stale else None
+        field = self._compute_field(target)
+        self._store_field(target, field)
+        return field
+
+    def update(self, head_position: Tuple[float, float], body_positions: np.ndarray,
+               targets: Iterable[Tuple[float, float]]) -> None:
+        """
+        每帧调用：更新蛇身障碍，并在时间预算内计算最近几个目标的距离场
+        :param head_position: 蛇头位置
+        :param body_positions: (N, 2) 蛇身位置
+        :param targets: 目标位置（通常为食物位置）
+        """
+        self._deadline = time.perf_counter() + self.frame_budget
+        self.set_obstacles(body_positions, head_position)
+
+        # 只为离蛇头最近的几个目标维护距离场
+        targets = np.asarray(list(targets), dtype=np.float64).reshape(-1, 2)
+        if len(targets) > self.max_fields:
+            dx = targets[:, 0] - head_position[0]
+            dy = targets[:, 1] - head_position[1]
+            targets = targets[np.argsort(dx * dx + dy * dy)[:self.max_fields]]
+        self._targets = list(dict.fromkeys(self._cell_indices(targets).tolist()))
+
+        # 缺失的距离场优先，其次是过期的，预算用完后留到下一帧
+        pending = ([target for target in self._targets if target not in self._fields] +
+                   [target for target in self._targets if target in self._stale])
+        for target in pending:
+            if not self._within_budget():
+                break
+            self._store_field(target, self._compute_field(target))
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    def next_step(self, head_position: Tuple[float, float]) -> Optional[Tuple[float, float]]:
+        """
+        沿距离场走向最近目标的下一个格子
+        蛇头所在格子被占用（如靠墙）时同样可用：直接比较四个相邻格子到各目标的距离
+        :param head_position: 蛇头位置
+        :return: 下一个格子中心的像素坐标；没有可达目标或已在目标格子时返回None
+        """
+        head = self.cell_index(head_position)
+        blocked = self._blocked_list
+        best_neighbor = None
+        best_distance = -1
+        for target in self._targets:
+            field = self._fields.get(target)
+            if field is None:
+                continue
+            if field[head] == 0:
+                return None
+            for offset in self._offsets:
+                neighbor = head + offset
+                distance = int(field[neighbor])
+                if distance < 0 or (distance > 0 and blocked[neighbor]):
+                    continue  # 过期的距离场中可能已被蛇身占用
+                if best_neighbor is None or distance < best_distance:
+                    best_neighbor, best_distance = neighbor, distance
+        return None if best_neighbor is None else self.cell_center(best_neighbor)
+
+    def find_path(self, start_position: Tuple[float, float], goal_position: Tuple[float, float],
+                  max_expansions: Optional[int] = None) -> Optional[List[Tuple[float, float]]]:
+        """
+        A* 寻路（曼哈顿距离启发，二叉堆开放列表）
+        :param start_position: 起点像素坐标
+        :param goal_position: 终点像素坐标
+        :param max_expansions: 最多展开的格子数，超过后放弃（None 表示不限制）
+        :return: 从起点之后到终点的格子中心坐标列表；不可达或超出展开上限时返回None
+        """
+        start = self.cell_index(start_position)
+        goal = self.cell_index(goal_position)
+        if start == goal:
+            return []
+        blocked = self._blocked_list
+        if blocked[goal]:
+            return None
+
+        width = self.width
+        goal_row, goal_col = divmod(goal, width)
+        costs: Dict[int, int] = {start: 0}
+        came_from: Dict[int, int] = {}
+        start_row, start_col = divmod(start, width)
+        start_h = abs(start_row - goal_row) + abs(start_col - goal_col)
+        open_heap = [(start_h, start_h, start)]
+        expansions = 0
+
+        while open_heap:
+            f, h, current = heapq.heappop(open_heap)
+            if current == goal:
+                path = []
+                while current != start:
+                    path.append(self.cell_center(current))
+                    current = came_from[current]
+                path.reverse()
+                return path
+            cost = f - h
+            if cost > costs[current]:
+                continue  # 堆中已过期的条目
+
+            expansions += 1
+            if max_expansions is not None and expansions > max_expansions:
+                return None
+
+            cost += 1
+            for offset in self._offsets:
+                neighbor = current + offset
+                if blocked[neighbor] or cost >= costs.get(neighbor, cost + 1):
+                    continue
+                costs[neighbor] = cost
+                came_from[neighbor] = current
+                row, col = divmod(neighbor, width)
+                h = abs(row - goal_row) + abs(col - goal_col)
+                heapq.heappush(open_heap, (cost + h, h, neighbor))
+        return None
+
+    def is_reachable(self, start_position: Tuple[float, float], goal_position: Tuple[float, float]) -> bool:
+        """
+        起点能否到达终点（优先使用未过期的距离场，否则做一次 A*）
+        :param start_position: 起点像素坐标
+        :param goal_position: 终点像素坐标
+        :return: 是否可达
+        """
+        goal = self.cell_index(goal_position)
+        field = self._fields.get(goal)
+        if field is None or goal in self._stale:
+            return self.find_path(start_position, goal_position) is not None
+
+        start = self.cell_index(start_position)
+        if field[start] >= 0:
+            return True
+        if not self._blocked_list[start]:
+            return False
+        # 起点格子被占用（如靠墙）时距离场中没有它的距离，与 next_step 一样检查四个相邻格子
+        return any(field[start + offset] >= 0 for offset in self._offsets)
+
+    def get_stats(self) -> Dict[str, int]:
+        """寻路统计信息"""
+        return {
+            'cached_fields': len(self._fields),
+            'stale_fields': len(self._stale),
+            'fields_computed': self.fields_computed,
+            'fields_invalidated': self.fields_invalidated,
+        }
@@ -8,7 +8,7 @@
 """
 import time
 import pygame
-from typing import Dict, List
+from typing import Callable, Dict, List
 from collections import deque
 from .font_manager import get_font_manager
 
@@ -36,6 +36,9 @@ class PerformanceMonitor:
         }
         
         self.show_stats = False
+
+        # 其他模块的计数器 {名称: 返回计数器字典的函数}，随性能报告一起输出
+        self.counter_sources: Dict[str, Callable[[], Dict]] = {}
         
     def start_frame(self):
         """开始新帧的计时"""
@@ -84,6 +87,14 @@ class PerformanceMonitor:
         if len(self.draw_times) > 0:
             self.stats['avg_draw_time'] = (sum(self.draw_times) / len(self.draw_times)) * 1000
     
+    def register_counters(self, name: str, source: Callable[[], Dict]):
+        """
+        注册计数器来源
+        :param name: 名称（性能报告中的键）
+        :param source: 返回计数器字典的函数
+        """
+        self.counter_sources[name] = source
+
     def toggle_display(self):
         """切换性能显示"""
         self.show_stats = not self.show_stats
@@ -107,6 +118,10 @@ class PerformanceMonitor:
             f"Min FPS: {self.stats['min_fps']:.1f}",
             f"Max FPS: {self.stats['max_fps']:.1f}"
         ]
+        audio_source = self.counter_sources.get('audio')
+        if audio_source is not None:
+            audio = audio_source()
+            stats_text.append(f"SFX: {audio['active_voices']} / Drop: {audio['dropped']}")
         
         # 绘制半透明背景
         bg_rect = pygame.Rect(5, 5, 200, len(stats_text) * line_height + 10)
@@ -129,7 +144,10 @@ class PerformanceMonitor:
     def get_performance_report(self) -> Dict:
         """获取性能报告"""
         self.update_stats()
-        return self.stats.copy()
+        report = self.stats.copy()
+        for name, source in self.counter_sources.items():
+            report[name] = source()
+        return report
     
     def reset_stats(self):
         """重置统计数据"""
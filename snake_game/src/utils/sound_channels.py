@@ -0,0 +1,137 @@
+"""
+音效通道池
+固定数量的混音通道：一部分保留给特定的循环音效（如加速音效），其余通道供普通音效使用。
+每种音效有最大同时发声数、优先级和最小触发间隔：超过发声数时重新触发最早的一个，
+没有空闲通道时抢占优先级不高于自己的最早的声音，抢占不到则丢弃。
+"""
+from typing import Dict, List, Optional
+import pygame
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SoundChannelPool:
+    """音效通道池 - 发声数限制、优先级抢占和触发频率限制"""
+
+    NUM_CHANNELS = 16
+    RESERVED = ("high_speed",)  # 保留通道（按顺序占用 0..N-1 号通道，普通音效不会使用）
+    DEFAULT_LIMIT = {'max_voices': 2, 'priority': 1, 'min_interval_ms': 0}
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, int]]] = None, num_channels: int = NUM_CHANNELS):
+        """
+        :param limits: 每种音效的限制 {sound_name: {'max_voices', 'priority', 'min_interval_ms'}}
+        :param num_channels: 混音通道总数（包括保留通道）
+        """
+        self.limits = limits or {}
+        pygame.mixer.set_num_channels(num_channels)
+        pygame.mixer.set_reserved(len(self.RESERVED))
+        self._reserved = {name: pygame.mixer.Channel(index) for index, name in enumerate(self.RESERVED)}
+        self._channels = [pygame.mixer.Channel(index) for index in range(len(self.RESERVED), num_channels)]
+
+        # 每个普通通道上正在播放的声音：[音效名称, 优先级, 开始时间]，空闲为 None
+        self._voices: List[Optional[list]] = [None] * len(self._channels)
+        self._last_play: Dict[str, int] = {}
+
+        # 统计
+        self.counters = {
+            'played': 0,
+            'retriggered': 0,  # 达到最大发声数时重新触发最早的声音
+            'stolen': 0,  # 抢占其他音效的通道
+            'dropped': 0,  # 没有可用通道而丢弃
+            'rate_limited': 0,  # 触发过于频繁而丢弃
+        }
+
+    def _get_limit(self, sound_name: str) -> Dict[str, int]:
+        """获取音效的限制（未配置时使用默认值）"""
+        return self.limits.get(sound_name, self.DEFAULT_LIMIT)
+
+    def _refresh_voices(self) -> None:
+        """清除已经播放结束的通道记录"""
+        for index, voice in enumerate(self._voices):
+            if voice is not None and not self._channels[index].get_busy():
+                self._voices[index] = None
+
+    def _choose_channel(self, sound_name: str, priority: int, max_voices: int) -> Optional[int]:
+        """
+        为新的声音选择通道
+        :return: 通道序号，None 表示丢弃
+        """
+        self._refresh_voices()
+        same = [index for index, voice in enumerate(self._voices) if voice is not None and voice[0] == sound_name]
+        if len(same) >= max_voices:
+            self.counters['retriggered'] += 1
+            return min(same, key=lambda index: self._voices[index][2])
+
+        for index, voice in enumerate(self._voices):
+            if voice is None:
+                return index
+
+        # 没有空闲通道：抢占优先级不高于自己的最早的声音
+        victims = [index for index, voice in enumerate(self._voices) if voice[1] <= priority]
+        if not victims:
+            self.counters['dropped'] += 1
+            return None
+        self.counters['stolen'] += 1
+        return min(victims, key=lambda index: (self._voices[index][1], self._voices[index][2]))
+
+    def play(self, sound_name: str, sound: pygame.mixer.Sound, volume: float, loops: int = 0) -> Optional[pygame.mixer.Channel]:
+        """
+        播放音效
+        :param sound_name: 音效名称（用于查找限制）
+        :param sound: 解码后的音效
+        :param volume: 音量 0.0 ~ 1.0
+        :param loops: 额外循环次数（-1 为无限循环）
+        :return: 播放所用的通道，丢弃时返回 None
+        """
+        limit = self._get_limit(sound_name)
+        now = pygame.time.get_ticks()
+        last = self._last_play.get(sound_name)
+        if last is not None and now - last < limit['min_interval_ms']:
+            self.counters['rate_limited'] += 1
+            return None
+
+        index = self._choose_channel(sound_name, limit['priority'], limit['max_voices'])
+        if index is None:
+            logger.debug("没有可用通道，丢弃音效: %s", sound_name)
+            return None
+        channel = self._channels[index]
+        channel.play(sound, loops=loops)
+        channel.set_volume(volume)
+        self._voices[index] = [sound_name, limit['priority'], now]
+        self._last_play[sound_name] = now
+        self.counters['played'] += 1
+        return channel
+
+    def play_reserved(self, name: str, sound: pygame.mixer.Sound, volume: float, loops: int = -1) -> pygame.mixer.Channel:
+        """
+        在保留通道上播放（同一保留通道上原来的声音被替换）
+        :param name: 保留通道名称（RESERVED 之一）
+        :param sound: 解码后的音效
+        :param volume: 音量 0.0 ~ 1.0
+        :param loops: 额外循环次数（-1 为无限循环）
+        :return: 保留通道
+        """
+        channel = self._reserved[name]
+        channel.play(sound, loops=loops)
+        channel.set_volume(volume)
+        return channel
+
+    def stop_reserved(self, name: str) -> None:
+        """停止保留通道上的声音"""
+        self._reserved[name].stop()
+
+    def stop_all(self) -> None:
+        """停止所有通道（包括保留通道）"""
+        pygame.mixer.stop()
+        self._voices = [None] * len(self._channels)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        获取统计数据
+        :return: 各计数器和当前发声数
+        """
+        self._refresh_voices()
+        stats = dict(self.counters)
+        stats['active_voices'] = sum(voice is not None for voice in self._voices)
+        return stats
@@ -6,13 +6,44 @@
 
 本程序受版权法保护，未经授权禁止复制、修改、分发或用于商业用途。
 """
-import pygame
+import io
 import os
+import pygame
+from .async_loader import get_loader_executor
+from .logger import get_logger
+from .sound_channels import SoundChannelPool
+
+logger = get_logger(__name__)
 
 
 class SoundManager:
+    """
+    声音管理器
+    背景音乐通过 pygame.mixer.music 流式解码播放，只在内存中保留压缩后的文件数据作为预读，
+    切换曲目时先淡出当前曲目再淡入新曲目；短音效完整解码后缓存为 Sound 对象。
+    预读和解码都在后台加载线程中完成，每个资源对应一个 Future，主线程在资源就绪前不会等待
+    """
     _instance = None
 
+    MUSIC_TRACKS = {
+        "main": "assets/sound/main.mp3",
+        "game": "assets/sound/run_background.mp3",
+    }
+    MUSIC_PREROLL_MAX_BYTES = 2 * 1024 * 1024  # 超过该大小的音乐文件不预读，播放时直接从磁盘流式读取
+    CROSSFADE_MS = 600  # 切换曲目的总时长（前一半淡出，后一半淡入）
+    SOUND_EFFECTS = {
+        "eat": "assets/sound/eat.mp3",
+        "high_speed": "assets/sound/high_speed.mp3",
+        "game_over": "assets/sound/game_over.mp3",
+    }
+    # 音效的最大同时发声数、优先级（越大越重要）和最小触发间隔
+    SOUND_LIMITS = {
+        "eat": {'max_voices': 4, 'priority': 1, 'min_interval_ms': 30},
+        "high_speed": {'max_voices': 1, 'priority': 2, 'min_interval_ms': 100},
+        "game_over": {'max_voices': 1, 'priority': 10, 'min_interval_ms': 500},
+    }
+    SOUND_QUEUE_MS = 300  # 音效未就绪时排队等待的最长时间，超时后丢弃（避免很久之后才响）
+
     def __init__(self):
         """初始化声音管理器"""
         if not pygame.mixer.get_init():
@@ -24,14 +55,25 @@ class SoundManager:
         self.is_music_playing = False
         self.music_end_event = pygame.USEREVENT + 1
         pygame.mixer.music.set_endevent(self.music_end_event)
-        
-        # 预加载的音乐缓存
+
+        # 音乐缓存：只保存路径和压缩后的文件数据（预读），不解码成 PCM
         self.music_cache = {}  # {music_type: music_path}
-        self.preloaded_music = {}  # {music_type: loaded_music_object}
-        
+        self.music_data = {}  # {music_type: 压缩的文件数据}
+        self._music_futures = {}  # {music_type: 后台预读的 Future}
+
+        # 曲目切换（淡出当前曲目后再开始的曲目）
+        self._pending_music_type = None
+        self._pending_loops = -1
+        self._fade_deadline = 0
+
         # 音效相关属性
-        self.sound_effects = {}  # 音效缓存 {sound_name: sound_object}
+        self.sound_effects = {}  # 音效缓存 {sound_name: sound_object}（只包含已解码完成的音效）
+        self._sound_futures = {}  # {sound_name: 后台解码的 Future}
+        self._queued_sounds = {}  # 等待解码完成的音效 {sound_name: 截止时间}
+        self._high_speed_requested = False  # 加速音效解码完成前是否已请求播放
+        self._preloading_started = False
         self.sound_volume = 0.7  # 音效默认音量
+        self.channel_pool = SoundChannelPool(self.SOUND_LIMITS)  # 音效通道池（加速音效使用保留通道）
         self.high_speed_channel = None  # 加速音效播放通道
         self.is_high_speed_playing = False  # 加速音效是否正在播放
 
@@ -49,152 +91,164 @@ class SoundManager:
             if self.background_music != music_path or self.current_music_type != music_type:
                 self.background_music = music_path
                 self.current_music_type = music_type
-                print(f"背景音乐已加载: {music_path} (类型: {music_type})")
+                logger.info("背景音乐已加载: %s (类型: %s)", music_path, music_type)
             return True
         else:
-            print(f"音乐文件不存在: {music_path}")
+            logger.warning("音乐文件不存在: %s", music_path)
             return False
 
     def preload_music(self, music_path, music_type):
-        """预加载音乐到缓存"""
-        if os.path.exists(music_path):
-            self.music_cache[music_type] = music_path
-            # 提前加载音乐文件到内存
-            try:
-                # 使用pygame.mixer.Sound预加载音乐
-                sound = pygame.mixer.Sound(music_path)
-                self.preloaded_music[music_type] = sound
-                print(f"音乐已预加载到内存: {music_path} (类型: {music_type})")
-            except Exception as e:
-                print(f"预加载音乐到内存失败: {e}")
-                # 仍然缓存路径，但使用传统加载方式
-                print(f"音乐已预加载到缓存: {music_path} (类型: {music_type})")
-            return True
-        else:
-            print(f"预加载音乐文件不存在: {music_path}")
+        """
+        预读音乐文件：把压缩后的文件数据读入内存，播放时由 pygame.mixer.music 边解码边播放
+        :param music_path: 音乐文件路径
+        :param music_type: 音乐类型
+        :return: 文件是否存在
+        """
+        if not os.path.exists(music_path):
+            logger.warning("预加载音乐文件不存在: %s", music_path)
             return False
 
+        self.music_cache[music_type] = music_path
+        if music_type not in self._music_futures:
+            self._music_futures[music_type] = get_loader_executor().submit(self._read_music, music_path, music_type)
+        return True
+
+    def _read_music(self, music_path, music_type):
+        """
+        读取音乐文件的压缩数据（在后台加载线程中执行）
+        :return: 文件数据，文件过大或读取失败时返回 None（播放时从磁盘流式读取）
+        """
+        try:
+            if os.path.getsize(music_path) > self.MUSIC_PREROLL_MAX_BYTES:
+                logger.info("音乐文件较大，播放时从磁盘流式读取: %s (类型: %s)", music_path, music_type)
+                return None
+            with open(music_path, 'rb') as music_file:
+                data = music_file.read()
+            logger.info("音乐已预读到内存: %s (类型: %s, %d KB)", music_path, music_type, len(data) // 1024)
+            return data
+        except OSError as e:
+            logger.warning("预读音乐失败，播放时从磁盘读取: %s", e)
+            return None
+
     def get_preloaded_music(self, music_type):
         """获取预加载的音乐路径"""
         return self.music_cache.get(music_type)
 
-    def play_background_music(self, loops=-1):
+    def _load_music_stream(self, music_type, music_path):
+        """把音乐交给 pygame.mixer.music（预读完成时使用内存中的数据，否则直接从磁盘读取）"""
+        if music_type not in self.music_data:
+            future = self._music_futures.get(music_type)
+            if future is not None and future.done():
+                self.music_data[music_type] = future.result()
+        data = self.music_data.get(music_type)
+        if data is not None:
+            namehint = os.path.splitext(music_path)[1].lstrip('.')
+            pygame.mixer.music.load(io.BytesIO(data), namehint)
+        else:
+            pygame.mixer.music.load(music_path)
+
+    def play_background_music(self, loops=-1, fade_ms=0):
         """播放背景音乐"""
         if self.background_music and not self.is_music_playing:
             try:
-                # 如果音乐已经在预加载缓存中，直接播放
-                if self.current_music_type in self.preloaded_music:
-                    pygame.mixer.music.load(self.background_music)
+                self._load_music_stream(self.current_music_type, self.background_music)
                 pygame.mixer.music.set_volume(self.music_volume)
-                pygame.mixer.music.play(loops)
+                pygame.mixer.music.play(loops, fade_ms=fade_ms)
                 self.is_music_playing = True
-                print("背景音乐开始播放")
+                logger.info("背景音乐开始播放: %s", self.current_music_type)
                 return True
             except Exception as e:
-                print(f"播放背景音乐失败: {e}")
+                logger.warning("播放背景音乐失败: %s", e)
                 return False
         return False
 
     def play_preloaded_music(self, music_type, loops=-1):
-        """播放预加载的音乐"""
-        if music_type in self.preloaded_music:
-            # 使用预加载到内存的音乐
-            try:
-                sound = self.preloaded_music[music_type]
-                # 立即停止当前音乐
-                if self.is_music_playing:
-                    self.stop_background_music()
-                
-                # 设置音乐类型
-                self.current_music_type = music_type
-                self.background_music = self.music_cache[music_type]
-                # 播放预加载的音乐
-                channel = sound.play(loops=loops)
-                if channel:
-                    self.is_music_playing = True
-                    print(f"播放预加载音乐: {music_type}")
-                    return True
-                else:
-                    # 播放失败，确保状态正确
-                    self.is_music_playing = False
-                    print(f"播放预加载音乐失败: 无法获取播放通道")
-                    return False
-            except Exception as e:
-                print(f"播放预加载音乐失败: {e}")
-                self.is_music_playing = False
+        """
+        切换到预加载的音乐：当前有音乐在播放时先淡出，淡出结束后在 handle_music_events 中淡入新曲目
+        :param music_type: 音乐类型
+        :param loops: 循环次数（-1 为无限循环）
+        :return: 是否开始切换
+        """
+        if music_type not in self.music_cache:
+            path = self.MUSIC_TRACKS.get(music_type)
+            if path is None or not self.preload_music(path, music_type):
                 return False
-        
-        # 回退到传统方式
-        if music_type in self.music_cache:
-            music_path = self.music_cache[music_type]
-            if self.load_background_music(music_path, music_type):
-                return self.play_background_music(loops)
+
+        # 已经在播放（或正在切换到）同一首音乐时不重新开始
+        if self._pending_music_type is None:
+            if self.is_music_playing and self.current_music_type == music_type:
+                return True
+        elif self._pending_music_type == music_type:
+            return True
+
+        if pygame.mixer.music.get_busy():
+            fade_out_ms = self.CROSSFADE_MS // 2
+            if self._pending_music_type is None:
+                pygame.mixer.music.fadeout(fade_out_ms)
+                self._fade_deadline = pygame.time.get_ticks() + fade_out_ms
+            self._pending_music_type = music_type
+            self._pending_loops = loops
+            logger.debug("淡出当前音乐，准备切换到: %s", music_type)
+            return True
+        return self._start_music(music_type, loops, fade_ms=0)
+
+    def _start_music(self, music_type, loops, fade_ms):
+        """立即开始播放某首音乐"""
+        self._pending_music_type = None
+        self.is_music_playing = False
+        if self.load_background_music(self.music_cache[music_type], music_type):
+            return self.play_background_music(loops, fade_ms)
         return False
 
     def handle_music_events(self):
-        """处理音乐事件，用于无缝循环"""
-        for event in pygame.event.get(self.music_end_event):
-            if event.type == self.music_end_event:
-                # 音乐播放结束，重新开始播放实现无缝循环
-                if self.is_music_playing:
-                    try:
-                        # 如果是预加载的音乐，使用Sound对象循环
-                        if self.current_music_type in self.preloaded_music:
-                            sound = self.preloaded_music[self.current_music_type]
-                            channel = sound.play(loops=-1)
-                            if channel:
-                                print("预加载音乐无缝循环播放")
-                        else:
-                            # 传统方式循环
-                            pygame.mixer.music.play()
-                            print("音乐无缝循环播放")
-                    except Exception as e:
-                        print(f"音乐循环播放失败: {e}")
+        """
+        每帧调用：播放解码完成的排队音效，淡出结束后淡入待切换的曲目
+        （音乐循环由 pygame.mixer.music 自己完成）
+        """
+        pygame.event.clear(self.music_end_event)
+        if self._queued_sounds or self._high_speed_requested:
+            self._update_queued_sounds()
+        if self._pending_music_type is None:
+            return
+        if pygame.mixer.music.get_busy() and pygame.time.get_ticks() < self._fade_deadline:
+            return
+        self._start_music(self._pending_music_type, self._pending_loops, fade_ms=self.CROSSFADE_MS // 2)
 
     def force_stop_all_music(self):
-        """强制停止所有音乐播放，包括预加载音乐和传统音乐"""
-        # 使用pygame的底层方法停止所有声音
+        """强制停止所有音乐播放，包括背景音乐和所有音效"""
         try:
             # 停止所有正在播放的频道
-            pygame.mixer.stop()
+            self.channel_pool.stop_all()
             # 停止背景音乐
             pygame.mixer.music.stop()
-            # 重置所有频道
-            pygame.mixer.find_channel(True)
         except Exception as e:
-            print(f"强制停止所有音乐失败: {e}")
-        
+            logger.warning("强制停止所有音乐失败: %s", e)
+
         # 重置状态
+        self._pending_music_type = None
         self.is_music_playing = False
-        print("所有音乐已强制停止")
+        self.is_high_speed_playing = False
+        logger.info("所有音乐已强制停止")
 
     def stop_background_music(self):
         """停止背景音乐"""
+        self._pending_music_type = None
         if self.is_music_playing:
-            # 如果是预加载的音乐，停止对应的Sound播放
-            if self.current_music_type in self.preloaded_music:
-                try:
-                    sound = self.preloaded_music[self.current_music_type]
-                    sound.stop()
-                except Exception as e:
-                    print(f"停止预加载音乐失败: {e}")
-            else:
-                # 传统方式停止
-                pygame.mixer.music.stop()
+            pygame.mixer.music.stop()
             self.is_music_playing = False
-            print("背景音乐已停止")
+            logger.info("背景音乐已停止")
 
     def pause_background_music(self):
         """暂停背景音乐"""
         if self.is_music_playing:
             pygame.mixer.music.pause()
-            print("背景音乐已暂停")
+            logger.info("背景音乐已暂停")
 
     def unpause_background_music(self):
         """恢复背景音乐"""
         if self.is_music_playing:
             pygame.mixer.music.unpause()
-            print("背景音乐已恢复")
+            logger.info("背景音乐已恢复")
 
     def set_music_volume(self, volume):
         """设置音乐音量 (0.0 到 1.0)"""
@@ -210,36 +264,14 @@ class SoundManager:
         return self.music_volume
 
     def switch_to_main_music(self):
-        """切换到主界面音乐"""
-        # 确保游戏运行时背景音乐被正确关闭
-        if self.current_music_type == "game":
-            # 如果是游戏运行时音乐，先停止所有音乐
-            self.force_stop_all_music()
-        else:
-            # 对于其他音乐类型，也停止当前音乐
-            self.stop_background_music()
-        
-        # 重置音乐状态
-        self.is_music_playing = False
-        self.current_music_type = None
-        
-        # 加载并播放主界面音乐
-        if self.load_background_music("assets/sound/main.mp3", "main"):
-            return self.play_background_music()
-        return False
+        """切换到主界面音乐（淡出当前音乐后淡入）"""
+        # 离开游戏时加速音效的循环不会再被蛇停止
+        self.stop_high_speed_sound()
+        return self.play_preloaded_music("main")
 
     def switch_to_game_music(self):
-        """切换到游戏运行时音乐"""
-        # 强制停止所有音乐播放，确保主界面音乐被关闭
-        self.force_stop_all_music()
-        
-        # 使用预加载的音乐，避免重新加载文件
-        if self.play_preloaded_music("game"):
-            return True
-        # 如果预加载失败，尝试直接加载
-        elif self.load_background_music("assets/sound/run_background.mp3", "game"):
-            return self.play_background_music()
-        return False
+        """切换到游戏运行时音乐（淡出当前音乐后淡入）"""
+        return self.play_preloaded_music("game")
 
     def is_music_loaded(self):
         """检查是否有音乐已加载"""
@@ -250,50 +282,113 @@ class SoundManager:
         return self.current_music_type
 
     def initialize_preloading(self):
-        """初始化预加载所有游戏音乐和音效"""
-        # 预加载主界面音乐
-        self.preload_music("assets/sound/main.mp3", "main")
-        # 预加载游戏音乐
-        self.preload_music("assets/sound/run_background.mp3", "game")
-        
-        # 预加载音效
-        self.preload_sound_effect("assets/sound/eat.mp3", "eat")
-        self.preload_sound_effect("assets/sound/high_speed.mp3", "high_speed")
-        self.preload_sound_effect("assets/sound/game_over.mp3", "game_over")
-        
-        print("游戏音乐和音效预加载完成")
+        """
+        在后台加载线程中预读所有游戏音乐、解码所有音效，立即返回
+        重复调用不会重复提交任务
+        """
+        if self._preloading_started:
+            return
+        self._preloading_started = True
+
+        # 预读背景音乐（只读入压缩数据，不解码）
+        for music_type, music_path in self.MUSIC_TRACKS.items():
+            self.preload_music(music_path, music_type)
+
+        # 预加载音效（完整解码）
+        for sound_name, sound_path in self.SOUND_EFFECTS.items():
+            self.preload_sound_effect(sound_path, sound_name)
+
+        logger.info("游戏音乐和音效已开始后台预加载")
+
+    def is_preloading_done(self):
+        """所有预加载任务是否都已完成"""
+        futures = list(self._music_futures.values()) + list(self._sound_futures.values())
+        return self._preloading_started and all(future.done() for future in futures)
 
     def preload_sound_effect(self, sound_path, sound_name):
-        """预加载音效到缓存"""
-        if os.path.exists(sound_path):
-            try:
-                sound = pygame.mixer.Sound(sound_path)
-                self.sound_effects[sound_name] = sound
-                print(f"音效已预加载: {sound_path} (名称: {sound_name})")
-                return True
-            except Exception as e:
-                print(f"预加载音效失败: {e}")
-                return False
-        else:
-            print(f"音效文件不存在: {sound_path}")
+        """
+        提交音效的后台解码任务
+        :param sound_path: 音效文件路径
+        :param sound_name: 音效名称
+        :return: 文件是否存在
+        """
+        if not os.path.exists(sound_path):
+            logger.warning("音效文件不存在: %s", sound_path)
             return False
+        if sound_name not in self._sound_futures:
+            self._sound_futures[sound_name] = get_loader_executor().submit(self._decode_sound, sound_path, sound_name)
+        return True
+
+    @staticmethod
+    def _decode_sound(sound_path, sound_name):
+        """
+        完整解码音效（在后台加载线程中执行）
+        :return: Sound 对象，失败时返回 None
+        """
+        try:
+            sound = pygame.mixer.Sound(sound_path)
+            logger.info("音效已预加载: %s (名称: %s)", sound_path, sound_name)
+            return sound
+        except Exception as e:
+            logger.warning("预加载音效失败: %s", e)
+            return None
+
+    def _get_sound(self, sound_name):
+        """
+        获取解码完成的音效，解码完成后移入音效缓存
+        :return: Sound 对象，尚未就绪或解码失败时返回 None
+        """
+        sound = self.sound_effects.get(sound_name)
+        if sound is None:
+            future = self._sound_futures.get(sound_name)
+            if future is not None and future.done():
+                sound = future.result()
+                if sound is not None:
+                    self.sound_effects[sound_name] = sound
+                del self._sound_futures[sound_name]
+        return sound
+
+    def _is_sound_pending(self, sound_name):
+        """音效是否还在后台解码"""
+        return sound_name in self._sound_futures and sound_name not in self.sound_effects
+
+    def _update_queued_sounds(self):
+        """播放解码完成的排队音效，丢弃超时的音效"""
+        now = pygame.time.get_ticks()
+        for sound_name, deadline in list(self._queued_sounds.items()):
+            if self._get_sound(sound_name) is not None:
+                del self._queued_sounds[sound_name]
+                self.play_sound_effect(sound_name)
+            elif now > deadline or not self._is_sound_pending(sound_name):
+                del self._queued_sounds[sound_name]
+        if self._high_speed_requested and self._get_sound("high_speed") is not None:
+            self._high_speed_requested = False
+            self.start_high_speed_sound()
 
     def play_sound_effect(self, sound_name):
-        """播放音效"""
-        if sound_name in self.sound_effects:
+        """播放音效（音效还在后台解码时排队，解码完成后播放）"""
+        sound = self._get_sound(sound_name)
+        if sound is None and self._is_sound_pending(sound_name):
+            self._queued_sounds[sound_name] = pygame.time.get_ticks() + self.SOUND_QUEUE_MS
+            logger.debug("音效尚未解码完成，排队等待: %s", sound_name)
+            return False
+        if sound is not None:
             try:
-                sound = self.sound_effects[sound_name]
-                sound.set_volume(self.sound_volume)
-                sound.play()
-                print(f"播放音效: {sound_name}")
+                if self.channel_pool.play(sound_name, sound, self.sound_volume) is None:
+                    return False
+                logger.debug("播放音效: %s", sound_name)
                 return True
             except Exception as e:
-                print(f"播放音效失败: {e}")
+                logger.warning("播放音效失败: %s", e)
                 return False
         else:
-            print(f"音效未找到: {sound_name}")
+            logger.warning("音效未找到: %s", sound_name)
             return False
 
+    def get_channel_stats(self):
+        """获取音效通道池的统计数据（播放、重新触发、抢占、丢弃、限频次数和当前发声数）"""
+        return self.channel_pool.get_stats()
+
     def set_sound_volume(self, volume):
         """设置音效音量 (0.0 到 1.0)"""
         if 0.0 <= volume <= 1.0:
@@ -310,32 +405,35 @@ class SoundManager:
         return self.play_sound_effect("eat")
 
     def start_high_speed_sound(self):
-        """开始循环播放加速音效"""
-        if not self.is_high_speed_playing and "high_speed" in self.sound_effects:
-            try:
-                sound = self.sound_effects["high_speed"]
-                sound.set_volume(self.sound_volume)
-                # 循环播放加速音效
-                self.high_speed_channel = sound.play(loops=-1)
-                self.is_high_speed_playing = True
-                print("开始循环播放加速音效")
-                return True
-            except Exception as e:
-                print(f"开始播放加速音效失败: {e}")
-                return False
-        return False
+        """开始循环播放加速音效（音效还在后台解码时，解码完成后若仍在加速再开始播放）"""
+        if self.is_high_speed_playing:
+            return False
+        sound = self._get_sound("high_speed")
+        if sound is None:
+            self._high_speed_requested = self._is_sound_pending("high_speed")
+            return False
+        try:
+            # 在保留通道上循环播放加速音效，不会被其他音效抢占
+            self.high_speed_channel = self.channel_pool.play_reserved("high_speed", sound, self.sound_volume)
+            self.is_high_speed_playing = True
+            logger.debug("开始循环播放加速音效")
+            return True
+        except Exception as e:
+            logger.warning("开始播放加速音效失败: %s", e)
+            return False
 
     def stop_high_speed_sound(self):
         """停止加速音效"""
+        self._high_speed_requested = False
         if self.is_high_speed_playing:
             try:
                 if self.high_speed_channel:
                     self.high_speed_channel.stop()
                 self.is_high_speed_playing = False
-                print("停止加速音效")
+                logger.debug("停止加速音效")
                 return True
             except Exception as e:
-                print(f"停止加速音效失败: {e}")
+                logger.warning("停止加速音效失败: %s", e)
                 return False
         return False
 
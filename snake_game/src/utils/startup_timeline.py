@@ -0,0 +1,75 @@
+"""
+启动时间线 - 记录从进程启动到第一帧显示的各个阶段耗时
+阶段：模块导入、SDL 初始化（窗口）、音频预加载提交、初始资源加载（主菜单）、第一帧
+"""
+import time
+from typing import List, Optional, Tuple
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+FIRST_FRAME_TARGET_MS = 300.0  # 第一帧的目标时间（毫秒）
+
+
+class StartupTimeline:
+    """启动时间线"""
+
+    def __init__(self):
+        self.start_time: Optional[float] = None
+        self.marks: List[Tuple[str, float]] = []
+        self.reported = False
+
+    def begin(self, start_time: Optional[float] = None) -> None:
+        """
+        设置时间线起点（应在导入游戏模块之前调用）
+        :param start_time: time.perf_counter() 时间，None 为当前时间
+        """
+        self.start_time = time.perf_counter() if start_time is None else start_time
+        self.marks.clear()
+        self.reported = False
+
+    def mark(self, phase: str) -> None:
+        """
+        记录一个阶段结束（未设置起点时以第一次记录为起点）
+        :param phase: 阶段名称
+        """
+        now = time.perf_counter()
+        if self.start_time is None:
+            self.start_time = now
+        self.marks.append((phase, now))
+
+    def get_report(self) -> List[Tuple[str, float, float]]:
+        """
+        获取各阶段耗时
+        :return: [(阶段, 阶段耗时毫秒, 累计耗时毫秒)]
+        """
+        report = []
+        previous = self.start_time
+        for phase, timestamp in self.marks:
+            report.append((phase, (timestamp - previous) * 1000, (timestamp - self.start_time) * 1000))
+            previous = timestamp
+        return report
+
+    def report(self) -> None:
+        """输出启动时间线（只输出一次），第一帧超过目标时间时给出警告"""
+        if self.reported or not self.marks:
+            return
+        self.reported = True
+        report = self.get_report()
+        # 合并为一条日志（同一模板的日志会被限流）
+        phases = ", ".join(f"{phase} {duration:.1f}ms" for phase, duration, _ in report)
+        total = report[-1][2]
+        logger.info("启动时间线: %s (共 %.1fms)", phases, total)
+        if total > FIRST_FRAME_TARGET_MS:
+            logger.warning("启动到第一帧用时 %.1fms，超过目标 %.0fms", total, FIRST_FRAME_TARGET_MS)
+
+
+_timeline: Optional[StartupTimeline] = None
+
+
+def get_startup_timeline() -> StartupTimeline:
+    """获取全局启动时间线"""
+    global _timeline
+    if _timeline is None:
+        _timeline = StartupTimeline()
+    return _timeline
@@ -8,6 +8,9 @@
 """
 import os
 import pygame
+from .logger import get_logger
+
+logger = get_logger(__name__)
 
 
 def get_content_bounds(image, alpha_threshold=5):
@@ -151,7 +154,7 @@ def extract_main_subject(image_path, colorkey=(255, 255, 255), white_threshold=2
         
         return result_image
     except (pygame.error, FileNotFoundError) as e:
-        print(f"无法加载图片 {image_path}: {e}")
+        logger.warning("无法加载图片 %s: %s", image_path, e)
         return None
 
 
@@ -219,7 +222,7 @@ def standardize_image_processing(image_path, target_size=32, colorkey=(255, 255,
         return final_image 
         
     except Exception as e:
-        print(f"图片处理失败 {image_path}: {e}")
+        logger.warning("图片处理失败 %s: %s", image_path, e)
         return create_default_image(target_size)
 
 
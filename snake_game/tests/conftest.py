@@ -0,0 +1,26 @@
+"""
+测试配置 - 把 snake_game 目录加入导入路径（测试中可以直接 from src... 导入），以及网格测试共用的墙体辅助
+"""
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+GRID = 10  # 测试网格大小（像素）
+
+
+class CellWalls:
+    """按格子给出墙体的简易墙管理器（只实现占用网格需要的 near_wall_mask）"""
+
+    def __init__(self, cells):
+        self.cells = set(cells)
+
+    def near_wall_mask(self, points, distance):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return np.array([(int(x // GRID), int(y // GRID)) in self.cells for x, y in points.tolist()], dtype=bool)
+
+
+def cell_center(col, row):
+    """格子中心的像素坐标"""
+    return (col * GRID + GRID / 2, row * GRID + GRID / 2)
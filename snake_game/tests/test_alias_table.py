@@ -0,0 +1,56 @@
+"""
+别名表测试：抽样分布与权重一致
+"""
+import random
+import numpy as np
+import pytest
+from src.utils.alias_table import AliasTable
+
+SAMPLES = 200000
+
+
+def assert_matches_weights(counts, weights):
+    """各项的抽样次数与期望值相差不超过 5 个标准差，权重为 0 的项从不被抽中"""
+    weights = np.asarray(weights, dtype=np.float64)
+    expected_p = weights / weights.sum()
+    expected = expected_p * SAMPLES
+    sigma = np.sqrt(SAMPLES * expected_p * (1 - expected_p))
+    assert (np.abs(counts - expected) <= 5 * sigma + 1e-9).all(), (counts, expected)
+    assert (counts[weights == 0] == 0).all()
+
+
+@pytest.mark.parametrize('weights', [
+    [1],
+    [1, 1, 1, 1],
+    [70, 20, 10],
+    [0.5, 0, 3, 0.01, 7],
+    [1] * 9 + [100],
+])
+def test_sample_many_distribution(weights):
+    table = AliasTable(weights)
+    rng = np.random.default_rng(42)
+    counts = np.bincount(table.sample_many(rng, SAMPLES), minlength=len(weights))
+    assert_matches_weights(counts, weights)
+
+
+def test_sample_distribution():
+    weights = [5, 0, 1, 4]
+    table = AliasTable(weights)
+    random.seed(42)
+    counts = np.bincount([table.sample() for _ in range(SAMPLES)], minlength=len(weights))
+    assert_matches_weights(counts, weights)
+
+
+def test_table_probabilities_are_exact():
+    """每一列的接受概率加上作为别名得到的概率，恰好等于该项的归一化权重"""
+    weights = np.array([0.5, 0, 3, 0.01, 7])
+    table = AliasTable(weights)
+    probabilities = table.prob.copy()
+    np.add.at(probabilities, table.alias, 1 - table.prob)
+    assert np.allclose(probabilities / table.size, weights / weights.sum())
+
+
+@pytest.mark.parametrize('weights', [[], [0, 0], [3, -1, 2], [1, float('nan')], [1, float('inf')], [[1, 2]]])
+def test_invalid_weights(weights):
+    with pytest.raises(ValueError):
+        AliasTable(weights)
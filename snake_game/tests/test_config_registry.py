@@ -0,0 +1,29 @@
+"""
+配置注册表测试：返回的配置与缓存互不影响
+"""
+from src.configs.config_registry import ConfigRegistry
+
+
+def test_get_config_returns_isolated_copy():
+    """调用方修改返回的配置后，再次获取仍是原始配置，地图对象共享"""
+    registry = ConfigRegistry()
+    name = registry.get_names('level')[0]
+    config = registry.get_config('level', name)
+    original_name = config['name']
+    map_data = config['map']
+
+    config['name'] = '已修改'
+    del config['map']
+
+    again = registry.get_config('level', name)
+    assert again['name'] == original_name
+    assert again['map'] is map_data
+
+
+def test_get_metadata_returns_isolated_copy():
+    registry = ConfigRegistry()
+    name = registry.get_names('level')[0]
+    metadata = registry.get_metadata('level', name)
+    metadata['name'] = '已修改'
+    assert registry.get_metadata('level', name)['name'] != '已修改'
+    assert registry.get_all_metadata('level')[0]['name'] != '已修改'
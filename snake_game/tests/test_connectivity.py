@@ -0,0 +1,77 @@
+"""
+空地连通性测试：随机游走的蛇，每一步都与重新洪水填充的结果比较
+"""
+from collections import deque
+import numpy as np
+import pytest
+from conftest import GRID, CellWalls, cell_center
+from src.utils.connectivity import FreeSpaceComponents
+
+COLS, ROWS = 16, 12
+
+# 带缺口的隔墙，蛇身容易把区域切断又重新连通
+WALLS = ([(8, row) for row in range(ROWS) if row not in (3, 8)] +
+         [(col, 6) for col in range(3, 8)])
+
+
+def fresh_region(blocked, head):
+    """从蛇头格子重新洪水填充（蛇头格子即使被占用也作为起点）"""
+    region = np.zeros((COLS, ROWS), dtype=bool)
+    region[head] = True
+    queue = [head]
+    while queue:
+        col, row = queue.pop()
+        for neighbor in ((col + 1, row), (col - 1, row), (col, row + 1), (col, row - 1)):
+            if (0 <= neighbor[0] < COLS and 0 <= neighbor[1] < ROWS
+                    and not region[neighbor] and neighbor not in blocked):
+                region[neighbor] = True
+                queue.append(neighbor)
+    return region
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_walk_matches_flood_fill(seed):
+    """蛇随机游走（偶尔变长），增量维护的可达区域始终等于重新填充的结果"""
+    rng = np.random.default_rng(seed)
+    walls = set(WALLS)
+    components = FreeSpaceComponents(CellWalls(walls), (COLS * GRID, ROWS * GRID), grid_size=GRID)
+    all_cells = [(col, row) for col in range(COLS) for row in range(ROWS)]
+    centers = np.array([cell_center(col, row) for col, row in all_cells])
+
+    snake = deque([(2, 2)])  # 蛇头在左端
+    length = 6
+    for _ in range(1500):
+        col, row = snake[0]
+        moves = [(col + dc, row + dr) for dc, dr in ((1, 0), (-1, 0), (0, 1), (0, -1))]
+        moves = [cell for cell in moves if 0 <= cell[0] < COLS and 0 <= cell[1] < ROWS
+                 and cell not in walls and cell not in snake]
+        if not moves:
+            snake = deque([snake[0]])  # 被困住时只保留蛇头重新开始
+            continue
+        snake.appendleft(moves[rng.integers(len(moves))])
+        if rng.random() < 0.02:
+            length += 1
+        while len(snake) > length:
+            snake.pop()
+
+        body = list(snake)[1:]
+        body_positions = np.array([cell_center(*cell) for cell in body]).reshape(-1, 2)
+        components.update(body_positions, cell_center(*snake[0]))
+
+        expected = fresh_region(walls | set(body), snake[0])
+        actual = components.reachable_mask(centers)
+        assert np.array_equal(actual, expected[tuple(np.array(all_cells).T)])
+
+    # 大部分步骤应该走增量更新，而不是每次都重新填充
+    assert components.incremental_updates > components.full_fills
+
+
+def test_static_labels():
+    """静态分量：隔墙把空地分成两个分量，墙体格子的编号为0"""
+    walls = [(8, row) for row in range(ROWS)]
+    components = FreeSpaceComponents(CellWalls(walls), (COLS * GRID, ROWS * GRID), grid_size=GRID)
+    assert components.component_count == 2
+    left = components.reachable_mask(np.array([cell_center(1, 1)]))
+    assert left[0]  # 还没有蛇头位置时使用最大的静态分量（左侧 8 列）
+    assert not components.reachable_mask(np.array([cell_center(12, 1)]))[0]
+    assert components.labels[components.cell_index(cell_center(8, 0))] == 0
@@ -0,0 +1,101 @@
+"""
+关卡编译器测试：游程编码、编译文件与墙体坐标的往返
+"""
+import json
+import numpy as np
+import pytest
+from src.configs.level_compiler import (MAX_RUN_LENGTH, CompiledLevel, RUN_DTYPE, compile_config, compile_file,
+                                        encode_runs, get_compiled_path, load_compiled)
+
+
+def decode_runs(runs):
+    return np.repeat(runs['value'], runs['length'].astype(np.intp))
+
+
+def write_compiled(tmp_path, config):
+    path = tmp_path / 'level.lvlb'
+    path.write_bytes(compile_config(config))
+    return str(path)
+
+
+@pytest.mark.parametrize('shape', [(1, 1), (3, 7), (30, 40), (1, 200)])
+def test_encode_runs_round_trip(shape):
+    """随机地图编码后解码得到原始数据，相邻游程的值不同"""
+    rng = np.random.default_rng(shape[0] * 1000 + shape[1])
+    grid = (rng.random(shape) < 0.3).astype(np.uint8) * rng.integers(1, 4, shape).astype(np.uint8)
+    runs = encode_runs(grid)
+    assert runs.dtype == RUN_DTYPE
+    assert np.array_equal(decode_runs(runs), grid.ravel())
+    assert (runs['value'][1:] != runs['value'][:-1]).all()
+
+
+def test_encode_runs_splits_long_runs():
+    """超过 uint16 上限的游程拆分为多段，解码结果不变"""
+    grid = np.zeros((3, MAX_RUN_LENGTH), dtype=np.uint8)
+    grid[2, -1] = 1
+    runs = encode_runs(grid)
+    assert runs['length'].max() <= MAX_RUN_LENGTH
+    assert np.array_equal(decode_runs(runs), grid.ravel())
+
+
+def test_encode_runs_empty():
+    assert len(encode_runs(np.zeros((0, 0), dtype=np.uint8))) == 0
+
+
+def test_compiled_level_round_trip(tmp_path):
+    """编译文件的配置头和地图与原始配置一致"""
+    grid = np.zeros((12, 16), dtype=np.uint8)
+    grid[0, :] = grid[-1, :] = grid[:, 0] = grid[:, -1] = 1
+    grid[5, 3:9] = 1
+    grid[7, 10] = 2
+    config = {'name': '测试关卡', 'target_score': 50, 'snake': {'initial_pos': [100, 100]}, 'map': grid.tolist()}
+    with CompiledLevel(write_compiled(tmp_path, config)) as level:
+        assert level.shape == grid.shape
+        assert np.array_equal(level.grid(), grid)
+        assert np.array_equal(level.occupancy(), grid == 1)
+        restored = level.to_config()
+    assert {key: value for key, value in restored.items() if key != 'map'} == \
+           {key: value for key, value in config.items() if key != 'map'}
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_wall_cells_match_grid(tmp_path, seed):
+    """直接从游程计算的墙体坐标与展开地图后查找的结果一致（(列, 行)，行优先顺序）"""
+    rng = np.random.default_rng(seed)
+    grid = (rng.random((20, 25)) < 0.25).astype(np.uint8)
+    grid[rng.random(grid.shape) < 0.05] = 2  # 非墙体的其他格子值
+    with CompiledLevel(write_compiled(tmp_path, {'map': grid})) as level:
+        cells = level.wall_cells()
+        positions = level.wall_positions(30)
+    expected = np.argwhere(grid == 1)[:, ::-1]
+    assert np.array_equal(cells, expected)
+    assert np.array_equal(positions, expected * 30.0 + 15)
+
+
+def test_wall_cells_without_walls(tmp_path):
+    with CompiledLevel(write_compiled(tmp_path, {'map': np.zeros((4, 5), dtype=np.uint8)})) as level:
+        assert level.wall_cells().shape == (0, 2)
+
+
+def test_compile_config_rejects_invalid_maps():
+    with pytest.raises(ValueError):
+        compile_config({'map': [1, 0, 1]})
+    with pytest.raises(ValueError):
+        compile_config({'map': [[0, 300]]})
+
+
+def test_compiled_file_tracks_source(tmp_path):
+    """编译文件记录源 JSON 的指纹，内容变化后不再使用"""
+    json_path = tmp_path / 'level_01.json'
+    config = {'name': '第一关', 'map': [[1, 1, 1], [1, 0, 1], [1, 1, 1]]}
+    json_path.write_text(json.dumps(config), encoding='utf-8')
+    compiled_path = compile_file(str(json_path))
+    assert compiled_path == get_compiled_path(str(json_path))
+
+    with CompiledLevel(compiled_path) as level:
+        source = level.source
+    assert source.size == json_path.stat().st_size
+    assert load_compiled(compiled_path, source) is not None
+    assert load_compiled(compiled_path, source._replace(mtime_ns=source.mtime_ns + 1)) is not None
+    assert load_compiled(compiled_path, source._replace(digest=bytes(len(source.digest)))) is None
+    assert load_compiled(compiled_path, source._replace(size=source.size + 1)) is None
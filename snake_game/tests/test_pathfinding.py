@@ -0,0 +1,48 @@
+"""
+网格寻路测试
+"""
+import numpy as np
+from conftest import GRID, CellWalls, cell_center as center
+from src.utils.pathfinding import GridPathfinder
+
+
+def make_pathfinder(walls):
+    return GridPathfinder(CellWalls(walls), (10 * GRID, 10 * GRID), grid_size=GRID, clearance=0.0)
+
+
+def test_is_reachable_from_blocked_start_uses_neighbors():
+    """起点格子被墙占用时，缓存的距离场与 A* 给出相同结论"""
+    pathfinder = make_pathfinder([(2, 2)])
+    start, goal = center(2, 2), center(7, 7)
+    assert pathfinder.is_blocked(start)
+    assert pathfinder.is_reachable(start, goal)  # 没有距离场，走 A*
+
+    pathfinder.distance_field(goal, allow_stale=False)
+    assert pathfinder.is_reachable(start, goal)
+    assert pathfinder.find_path(start, goal) is not None
+
+
+def test_is_reachable_from_enclosed_blocked_start():
+    """起点被墙占用且四周都是墙时不可达"""
+    walls = [(2, 2), (1, 2), (3, 2), (2, 1), (2, 3)]
+    pathfinder = make_pathfinder(walls)
+    start, goal = center(2, 2), center(7, 7)
+    pathfinder.distance_field(goal, allow_stale=False)
+    assert not pathfinder.is_reachable(start, goal)
+    assert pathfinder.find_path(start, goal) is None
+
+
+def test_is_reachable_matches_find_path():
+    """随机墙体下，距离场与 A* 对每个起点的可达性判断一致"""
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        walls = {(int(c), int(r)) for c, r in rng.integers(0, 10, (30, 2))}
+        walls.discard((5, 5))
+        pathfinder = make_pathfinder(walls)
+        goal = center(5, 5)
+        pathfinder.distance_field(goal, allow_stale=False)
+        for col in range(10):
+            for row in range(10):
+                start = center(col, row)
+                expected = pathfinder.find_path(start, goal) is not None
+                assert pathfinder.is_reachable(start, goal) == expected, (col, row)